@@ -0,0 +1,150 @@
+"""
+Headless command line for the altman database: ``python -m altman <command>``.
+
+Runs on the stdlib sqlite3 layer (database.sqlite_data_manager) and never imports
+PyQt6, so it starts in a few tens of milliseconds and works from cron or over ssh.
+
+    python -m altman add --sleep 3 --cheer 1
+    python -m altman import ratings.csv
+    python -m altman export history.jsonl --from 2024-01-01
+    python -m altman stats --granularity week --last 8
+    python -m altman vacuum
+"""
+import argparse
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS
+from database.sqlite_data_manager import SqliteDataManager, target_db_path
+
+
+def _add(manager: SqliteDataManager, args: argparse.Namespace) -> int:
+    from database.altman_import import validate_record
+    now = datetime.now()
+    record = {'altman_date': args.date or now.strftime('%Y-%m-%d'),
+              'altman_time': args.time or now.strftime('%H:%M:%S')}
+    record.update({column: getattr(args, column.replace('altmans_', '')) for column in ALTMAN_ITEM_COLUMNS})
+    try:
+        row = validate_record(record)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    row_id = manager.insert_into_altman_table(*row)
+    if row_id is None:
+        print("error: the entry could not be written, see the log", file=sys.stderr)
+        return 1
+    print(f"added entry {row_id}: {row[0]} {row[1]} summary {row[-1]}")
+    return 0
+
+
+def _import(manager: SqliteDataManager, args: argparse.Namespace) -> int:
+    try:
+        imported, rejected = manager.import_altman_file(args.file, args.rejects, args.format,
+                                                       upsert=not args.no_replace)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"imported {imported} entries, rejected {rejected}")
+    if rejected:
+        print(f"rejects written to {args.rejects or args.file + '.rejects.jsonl'}", file=sys.stderr)
+    return 0
+
+
+def _export(manager: SqliteDataManager, args: argparse.Namespace) -> int:
+    try:
+        written = manager.export_altman_table(args.file, args.format, args.date_from, args.date_to)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"exported {written} entries to {args.file}")
+    return 0
+
+
+def _format_day(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def _stats(manager: SqliteDataManager, args: argparse.Namespace) -> int:
+    bounds = manager.altman_timestamp_bounds()
+    print(f"entries: {manager.altman_row_count()}")
+    if bounds is None:
+        return 0
+    print(f"first:   {datetime.fromtimestamp(bounds[0], tz=timezone.utc):%Y-%m-%d %H:%M:%S}")
+    print(f"last:    {datetime.fromtimestamp(bounds[1], tz=timezone.utc):%Y-%m-%d %H:%M:%S}")
+    buckets = manager.query_altman_aggregates(args.granularity)[-args.last:]
+    metrics = ['summary'] + [column.replace('altmans_', '') for column in ALTMAN_ITEM_COLUMNS]
+    print()
+    print(f"{args.granularity:<12}{'n':>6}" + ''.join(f"{metric:>12}" for metric in metrics))
+    for bucket in buckets:
+        cells = ''.join(f"{bucket[f'mean_{metric}']:>7.2f}/{bucket[f'max_{metric}']:<4}" for metric in metrics)
+        print(f"{_format_day(bucket['bucket_start']):<12}{bucket['entry_count']:>6}{cells}")
+    return 0
+
+
+def _vacuum(manager: SqliteDataManager, args: argparse.Namespace) -> int:
+    before, after = manager.vacuum()
+    print(f"vacuumed {manager.db_name}: {before} -> {after} bytes")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m altman', description="Altman mania ratings, headless.")
+    parser.add_argument('--db', default=target_db_path, help="database file (default: %(default)s)")
+    parser.add_argument('--profile', choices=sorted(tkc.DB_PERFORMANCE_PROFILES),
+                        help="database performance profile (default: tracker_config.DB_PERFORMANCE_PROFILE)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="add one entry; the summary is computed")
+    add.add_argument('--date', help="yyyy-mm-dd (default: today)")
+    add.add_argument('--time', help="hh:mm[:ss] (default: now)")
+    for column in ALTMAN_ITEM_COLUMNS:
+        add.add_argument(f"--{column.replace('altmans_', '')}", type=int, default=0, metavar='0-5')
+    add.set_defaults(handler=_add)
+
+    import_ = commands.add_parser('import', help="import a CSV or JSON Lines file, all or nothing")
+    import_.add_argument('file')
+    import_.add_argument('--format', choices=('csv', 'jsonl'), help="default: from the extension")
+    import_.add_argument('--rejects', help="reject file (default: <file>.rejects.jsonl)")
+    import_.add_argument('--no-replace', action='store_true',
+                         help="fail on entries already stored instead of replacing them")
+    import_.set_defaults(handler=_import)
+
+    export = commands.add_parser('export', help="export to CSV, JSON Lines, Parquet or Arrow")
+    export.add_argument('file')
+    export.add_argument('--format', choices=('csv', 'jsonl', 'parquet', 'arrow'), help="default: from the extension")
+    export.add_argument('--from', dest='date_from', help="first day, yyyy-mm-dd")
+    export.add_argument('--to', dest='date_to', help="last day, yyyy-mm-dd")
+    export.set_defaults(handler=_export)
+
+    stats = commands.add_parser('stats', help="entry count, date range and recent means/maxima")
+    stats.add_argument('--granularity', choices=('day', 'week', 'month'), default='week')
+    stats.add_argument('--last', type=int, default=8, help="buckets to show (default: %(default)s)")
+    stats.set_defaults(handler=_stats)
+
+    vacuum = commands.add_parser('vacuum', help="compact the database file and refresh statistics")
+    vacuum.set_defaults(handler=_vacuum)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        manager = SqliteDataManager(args.db, args.profile)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    try:
+        return args.handler(manager, args)
+    except Exception as e:
+        logger.error("altman %s failed: %s", args.command, e, exc_info=True)
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close_database()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
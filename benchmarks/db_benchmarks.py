@@ -0,0 +1,335 @@
+"""
+Database-layer benchmarks for DataManager, with a regression check against a baseline.
+
+Each size gets a fresh temporary database, seeded with synthetic entries five
+minutes apart, on which the operations the app performs are timed:
+
+    bulk_insert       seeding the table with one insert_many_into_altman_table call
+    bulk_reimport     feeding the same rows again as an upsert, which changes nothing
+    setup_tables      the CREATE/migration pass every launch runs on an existing file
+    single_insert     one insert_into_altman_table (its own transaction), each at a new moment
+    range_query       query_altman_range over a window holding ~1% of the rows
+    model_select      KeysetTableModel.select() plus reading the first page
+    sort              sorting the model by summary, descending, plus the first page
+    sort_jump         the same sort plus a jump to the middle row (the OFFSET fallback)
+    bulk_delete       delete_altman_ids on 10% of the rows in 100 separate runs
+
+    python -m benchmarks.db_benchmarks run --sizes 1000 100000 1000000 --output current.json
+    python -m benchmarks.db_benchmarks compare baseline.json current.json --threshold 10
+
+compare exits with status 1 when any benchmark's median is more than the threshold
+percentage slower than in the baseline (tkc.BENCHMARK_REGRESSION_PCT by default).
+Both commands also exit with status 1 when bulk_insert falls below
+tkc.BENCHMARK_MIN_INSERT_ROWS_PER_S at FLOOR_MIN_SIZE rows or more
+(--min-insert-rate, 0 disables it).
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import tracker_config as tkc
+
+DEFAULT_SIZES: Tuple[int, ...] = (1000, 100000, 1000000)
+SEED_START = datetime(2015, 1, 1)
+SEED_INTERVAL = timedelta(minutes=5)
+# the bulk insert floor applies from this size up; smaller runs are dominated by fixed costs
+FLOOR_MIN_SIZE = 100000
+# repetitions per benchmark; the destructive and seeding ones run once
+REPEATS: Dict[str, int] = {
+    'setup_tables': 10,
+    'single_insert': 50,
+    'range_query': 20,
+    'model_select': 10,
+    'sort': 10,
+    'sort_jump': 10,
+}
+
+
+def seed_rows(size: int, seed: int = 0) -> List[Tuple[Any, ...]]:
+    """
+    Builds ``size`` reproducible altman_table rows, oldest first.
+    """
+    generator = random.Random(seed)
+    rows: List[Tuple[Any, ...]] = []
+    for index in range(size):
+        moment = SEED_START + SEED_INTERVAL * index
+        items = [generator.randint(0, 5) for _ in range(5)]
+        rows.append((moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M:%S'), *items, sum(items)))
+    return rows
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, Any]:
+    """
+    Reduces timings in seconds to the statistics stored in the results file.
+
+    Percentiles are nearest-rank, so each one is a timing that was actually observed.
+    """
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> float:
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    return {
+        'repeat': len(ordered),
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'max': ordered[-1],
+        'mean': statistics.fmean(ordered),
+    }
+
+
+def measure(operation: Callable[[], Any], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Times ``operation`` ``repeat`` times, after one untimed warm-up run when repeating.
+    """
+    if repeat > 1:
+        operation()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def _first_page(model) -> None:
+    if model.rowCount():
+        model.data(model.index(0, 0))
+
+
+def run_size(size: int, directory: str, profile_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs every benchmark against a fresh database of ``size`` rows in ``directory``.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Timing statistics in seconds, keyed by benchmark.
+    """
+    from PyQt6.QtCore import Qt
+    from database.database_manager import DataManager
+    from database.database_utility.keyset_table_model import KeysetTableModel
+
+    db_path = os.path.join(directory, f"benchmark_{size}.db")
+    connection_name = f"benchmark_{size}"
+    manager = DataManager(db_path, profile_name, connection_name)
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        rows = seed_rows(size)
+        results['bulk_insert'] = measure(lambda: manager.insert_many_into_altman_table(rows))
+        results['bulk_insert']['rows_per_second'] = size / results['bulk_insert']['median']
+        results['bulk_reimport'] = measure(lambda: manager.insert_many_into_altman_table(rows, upsert=True))
+        results['setup_tables'] = measure(manager.setup_tables, REPEATS['setup_tables'])
+
+        # altman_timestamp is unique, so every insert takes the next free moment
+        moments = (SEED_START + SEED_INTERVAL * index for index in itertools.count(size))
+
+        def single_insert() -> None:
+            moment = next(moments)
+            manager.insert_into_altman_table(moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M:%S'), 1, 1, 1, 1, 1, 5)
+
+        results['single_insert'] = measure(single_insert,
+                                           REPEATS['single_insert'])
+
+        first, last = manager.altman_timestamp_bounds()
+        middle = (first + last) // 2
+        half_window = max(1, (last - first) // 200)
+        results['range_query'] = measure(lambda: manager.query_altman_range(middle - half_window,
+                                                                            middle + half_window),
+                                         REPEATS['range_query'])
+
+        model = KeysetTableModel('altman_table', manager.db)
+
+        def select() -> None:
+            model.select()
+            _first_page(model)
+
+        def sort(row: int = 0) -> Callable[[], None]:
+            def operation() -> None:
+                model.sort(model.fieldIndex('altmans_summary'), Qt.SortOrder.DescendingOrder)
+                model.data(model.index(row, 0))
+            return operation
+
+        results['model_select'] = measure(select, REPEATS['model_select'])
+        results['sort'] = measure(sort(), REPEATS['sort'])
+        results['sort_jump'] = measure(sort(model.rowCount() // 2), REPEATS['sort_jump'])
+        del model
+
+        # 100 evenly spaced runs of ids, 10% of the table in all
+        run_length = max(1, size // 1000)
+        stride = max(run_length, size // 100)
+        doomed = [row_id for start in range(1, size + 1, stride)
+                  for row_id in range(start, min(start + run_length, size + 1))]
+        results['bulk_delete'] = measure(lambda: manager.delete_altman_ids(doomed))
+        results['bulk_delete']['rows'] = len(doomed)
+    finally:
+        manager.close_database()
+        del manager
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describes the machine and code the results came from.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(terse=True),
+        'processor': platform.processor() or platform.machine(),
+        'commit': commit,
+    }
+
+
+def run(sizes: Sequence[int], output: Optional[str], profile_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Benchmarks every size and writes the results as JSON.
+
+    Args:
+        sizes (Sequence[int]): Row counts to benchmark.
+        output (Optional[str]): The results file; printed to stdout when None.
+        profile_name (Optional[str]): The performance profile; defaults to tkc.DB_PERFORMANCE_PROFILE.
+
+    Returns:
+        Dict[str, Any]: The results document.
+    """
+    from database.altman_storage import ensure_qt_application
+    ensure_qt_application()
+    document: Dict[str, Any] = {'environment': environment(),
+                                'profile': profile_name or tkc.DB_PERFORMANCE_PROFILE,
+                                'results': {}}
+    with tempfile.TemporaryDirectory(prefix='altman_benchmarks_') as directory:
+        for size in sizes:
+            print(f"{size} rows ...", file=sys.stderr)
+            document['results'][str(size)] = results = run_size(size, directory, profile_name)
+            for name, stats in results.items():
+                print(f"  {name:<16}{stats['median'] * 1000:>12.3f} ms median", file=sys.stderr)
+    content = json.dumps(document, indent=1)
+    if output:
+        with open(output, 'w', encoding='utf-8') as handle:
+            handle.write(content + '\n')
+    else:
+        print(content)
+    return document
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float) -> List[Tuple[str, str, float, float, float]]:
+    """
+    Finds the benchmarks whose median grew by more than ``threshold`` percent.
+
+    Only sizes and benchmarks present in both documents are compared.
+
+    Returns:
+        List[Tuple[str, str, float, float, float]]: (size, benchmark, baseline median,
+        current median, change in percent) for each regression.
+    """
+    regressions: List[Tuple[str, str, float, float, float]] = []
+    for size, benchmarks in current['results'].items():
+        previous = baseline['results'].get(size, {})
+        for name, stats in benchmarks.items():
+            if name not in previous:
+                continue
+            before, after = previous[name]['median'], stats['median']
+            change = (after - before) / before * 100 if before else 0.0
+            flag = 'REGRESSION' if change > threshold else ''
+            print(f"{size:>9} {name:<16}{before * 1000:>12.3f}{after * 1000:>12.3f} ms{change:>+9.1f}%  {flag}")
+            if flag:
+                regressions.append((size, name, before, after, change))
+    return regressions
+
+
+def check_insert_floor(document: Dict[str, Any], floor: float) -> List[Tuple[str, float]]:
+    """
+    Finds the sizes of at least FLOOR_MIN_SIZE rows whose bulk_insert fell below ``floor`` rows/s.
+
+    Returns:
+        List[Tuple[str, float]]: (size, rows per second) for each size below the floor;
+        empty when ``floor`` is 0.
+    """
+    below: List[Tuple[str, float]] = []
+    if floor <= 0:
+        return below
+    for size, benchmarks in document['results'].items():
+        stats = benchmarks.get('bulk_insert')
+        if int(size) < FLOOR_MIN_SIZE or stats is None:
+            continue
+        rate = stats.get('rows_per_second', int(size) / stats['median'])
+        if rate < floor:
+            print(f"{size:>9} bulk_insert {rate:>12.0f} rows/s, below the {floor:.0f} rows/s floor",
+                  file=sys.stderr)
+            below.append((size, rate))
+    return below
+
+
+def compare_files(baseline_path: str, current_path: str, threshold: float,
+                  insert_floor: float = tkc.BENCHMARK_MIN_INSERT_ROWS_PER_S) -> int:
+    """
+    Compares two results files and reports the regressions.
+
+    Returns:
+        int: The exit status, 1 if anything regressed or the current bulk insert is
+        below ``insert_floor`` rows/s, and 0 otherwise.
+    """
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    with open(current_path, encoding='utf-8') as handle:
+        current = json.load(handle)
+    regressions = compare(baseline, current, threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed by more than {threshold}%", file=sys.stderr)
+    below = check_insert_floor(current, insert_floor)
+    return 1 if regressions or below else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.db_benchmarks',
+                                     description="DataManager benchmarks and regression check.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_ = commands.add_parser('run', help="benchmark fresh temporary databases")
+    run_.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                      help="row counts (default: %(default)s)")
+    run_.add_argument('--output', help="results file (default: stdout)")
+    run_.add_argument('--profile', choices=sorted(tkc.DB_PERFORMANCE_PROFILES),
+                      help="database performance profile (default: tracker_config.DB_PERFORMANCE_PROFILE)")
+    run_.add_argument('--min-insert-rate', type=float, default=tkc.BENCHMARK_MIN_INSERT_ROWS_PER_S,
+                      help="bulk insert floor in rows/s, 0 to disable (default: %(default)s)")
+
+    compare_ = commands.add_parser('compare', help="flag regressions against a baseline results file")
+    compare_.add_argument('baseline')
+    compare_.add_argument('current')
+    compare_.add_argument('--threshold', type=float, default=tkc.BENCHMARK_REGRESSION_PCT,
+                          help="allowed slowdown in percent (default: %(default)s)")
+    compare_.add_argument('--min-insert-rate', type=float, default=tkc.BENCHMARK_MIN_INSERT_ROWS_PER_S,
+                          help="bulk insert floor in rows/s, 0 to disable (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        document = run(args.sizes, args.output, args.profile)
+        return 1 if check_insert_floor(document, args.min_insert_rate) else 0
+    return compare_files(args.baseline, args.current, args.threshold, args.min_insert_rate)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
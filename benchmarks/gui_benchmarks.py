@@ -0,0 +1,194 @@
+"""
+Frame-time benchmarks for MainWindow, rendered offscreen.
+
+The window runs under the ``offscreen`` QPA platform against a throwaway home
+directory (database, settings and log), seeded with --rows synthetic entries. Each
+frame applies one input and then processes events and repaints synchronously, so
+a frame time is what the user would wait between that input and the next picture:
+
+    scroll_wheel      the data view scrolled three rows at a time from the top
+    scroll_drag       the data view's scrollbar dragged from top to bottom in even jumps
+    resize_storm      the window resized to a new size every frame (FramelessWindow's mask rebuild)
+    slider_drag       the input sliders swept end to end (valueChanged -> update_altmans_summary)
+
+    python -m benchmarks.gui_benchmarks run --rows 100000 --output gui.json
+    python -m benchmarks.gui_benchmarks compare baseline.json gui.json
+
+Results use the layout of benchmarks.db_benchmarks (p50/p95/p99 per benchmark, in
+seconds), plus the app's own instrumentation histograms recorded during the run,
+and compare the same way.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import tracker_config as tkc
+from benchmarks.db_benchmarks import compare_files, environment, seed_rows, summarize
+
+DEFAULT_ROWS = 100000
+DEFAULT_FRAMES = 300
+RESIZE_SIZES = ((1000, 450), (1280, 720), (800, 600), (1440, 900), (640, 480))
+
+
+def frame_times(app, widget, inputs: Sequence[Callable[[], Any]]) -> List[float]:
+    """
+    Times each input through to a finished repaint of ``widget``.
+
+    Returns:
+        List[float]: One frame time in seconds per input.
+    """
+    samples: List[float] = []
+    for apply_input in inputs:
+        started = time.perf_counter()
+        apply_input()
+        app.processEvents()
+        widget.repaint()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _quiet_offscreen_warnings(message_type, context, message: str) -> None:
+    # the offscreen platform warns on every FramelessWindow mask; anything else still goes to stderr
+    if not message.startswith('This plugin does not support'):
+        print(message, file=sys.stderr)
+
+
+def _setter(target: Callable[[int], Any], value: int) -> Callable[[], Any]:
+    return lambda: target(value)
+
+
+def _resizer(window, width: int, height: int) -> Callable[[], Any]:
+    return lambda: window.resize(width, height)
+
+
+def run_window(rows: int, frames: int) -> Dict[str, Any]:
+    """
+    Seeds the database, opens MainWindow offscreen and runs every benchmark.
+
+    HOME must already point at a scratch directory: the app's modules resolve the
+    database, settings and log paths from it when first imported.
+
+    Returns:
+        Dict[str, Any]: Frame statistics keyed by benchmark, and the instrumentation histograms.
+    """
+    from PyQt6.QtCore import qInstallMessageHandler
+    from PyQt6.QtWidgets import QApplication
+    from database.sqlite_data_manager import SqliteDataManager
+    from utility.instrumentation import metrics
+
+    seeder = SqliteDataManager()
+    seeder.insert_many_into_altman_table(seed_rows(rows))
+    seeder.close_database()
+
+    qInstallMessageHandler(_quiet_offscreen_warnings)
+    app = QApplication.instance() or QApplication([])
+    from ui.main_window import MainWindow
+    window = MainWindow()
+    window.show()
+    app.processEvents()
+    metrics.reset()
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        window.actionDataview.trigger()
+        app.processEvents()
+        table = window.altmans_manic_rating_table
+        bar = table.verticalScrollBar()
+        step = 3 * bar.singleStep()
+        results['scroll_wheel'] = summarize(frame_times(
+            app, table.viewport(), [_setter(bar.setValue, step * (i + 1)) for i in range(frames)]))
+        results['scroll_drag'] = summarize(frame_times(
+            app, table.viewport(), [_setter(bar.setValue, bar.maximum() * (i + 1) // frames) for i in range(frames)]))
+
+        results['resize_storm'] = summarize(frame_times(
+            app, window, [_resizer(window, *RESIZE_SIZES[i % len(RESIZE_SIZES)]) for i in range(frames)]))
+
+        window.actionInput_View.trigger()
+        app.processEvents()
+        sliders = [window.altmans_sleep, window.altmans_speech, window.altmans_activity,
+                   window.altmans_cheer, window.altmans_confidence]
+        inputs: List[Callable[[], Any]] = []
+        for i in range(frames):
+            slider = sliders[(i // 10) % len(sliders)]
+            # there and back across the slider's range, ten frames per slider
+            span = slider.maximum() - slider.minimum()
+            offset = i % (2 * span) if span else 0
+            inputs.append(_setter(slider.setValue, slider.minimum() + (offset if offset <= span else 2 * span - offset)))
+        results['slider_drag'] = summarize(frame_times(app, window, inputs))
+    finally:
+        window.close()
+        app.processEvents()
+    for stats in results.values():
+        stats['frames'] = stats['repeat']
+    return {'results': results, 'instrumentation': metrics.snapshot()['histograms']}
+
+
+def run(rows: int, frames: int, output: Optional[str]) -> Dict[str, Any]:
+    """
+    Benchmarks MainWindow in a scratch home directory and writes the results as JSON.
+
+    Args:
+        rows (int): Entries in the data view.
+        frames (int): Frames per benchmark.
+        output (Optional[str]): The results file; printed to stdout when None.
+
+    Returns:
+        Dict[str, Any]: The results document.
+    """
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+    real_home = os.environ.get('HOME')
+    with tempfile.TemporaryDirectory(prefix='altman_gui_benchmarks_') as home:
+        os.environ['HOME'] = home
+        try:
+            measured = run_window(rows, frames)
+        finally:
+            if real_home is None:
+                del os.environ['HOME']
+            else:
+                os.environ['HOME'] = real_home
+    document: Dict[str, Any] = {'environment': environment(), 'rows': rows,
+                                'results': {str(rows): measured['results']},
+                                'instrumentation': measured['instrumentation']}
+    for name, stats in measured['results'].items():
+        print(f"  {name:<14}" + ''.join(f"{label} {stats[label] * 1000:>8.3f} ms  " for label in ('p50', 'p95', 'p99')),
+              file=sys.stderr)
+    content = json.dumps(document, indent=1)
+    if output:
+        with open(output, 'w', encoding='utf-8') as handle:
+            handle.write(content + '\n')
+    else:
+        print(content)
+    return document
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.gui_benchmarks',
+                                     description="Offscreen MainWindow frame-time benchmarks.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_ = commands.add_parser('run', help="benchmark MainWindow against a seeded scratch database")
+    run_.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="entries in the data view (default: %(default)s)")
+    run_.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help="frames per benchmark (default: %(default)s)")
+    run_.add_argument('--output', help="results file (default: stdout)")
+
+    compare_ = commands.add_parser('compare', help="flag regressions against a baseline results file")
+    compare_.add_argument('baseline')
+    compare_.add_argument('current')
+    compare_.add_argument('--threshold', type=float, default=tkc.BENCHMARK_REGRESSION_PCT,
+                          help="allowed slowdown in percent (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        run(args.rows, args.frames, args.output)
+        return 0
+    return compare_files(args.baseline, args.current, args.threshold)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""
+Synthetic altman histories and a replay harness, for sizing deployments.
+
+generate writes one database per user, the way the app is deployed (one file in
+each user's home directory), through the storage backends' bulk insert path. Each
+user gets their own habits: how often they check in, how often they skip a day or
+lapse for weeks, their resting scores, and how often and how hard manic episodes
+hit, which ramp up and back down over days to weeks.
+
+replay drives a weighted mix of operations against one database, either as fast as
+it can or open-loop at a fixed rate, and reports throughput and latency percentiles:
+
+    insert      one new entry after the latest, as the input view commits it
+    query       query_altman_range over a random 30-day window, as the data view filters
+    aggregate   weekly query_altman_aggregates over a random 90-day window, as the chart reads
+    delete      delete_altman_ids on one entry seen in a random window
+
+    python -m benchmarks.workload generate --users 20 --years 5 --directory /tmp/altman_fleet
+    python -m benchmarks.workload replay /tmp/altman_fleet/user_001.db --mix insert=60,query=30,delete=10 --rate 50
+
+At a fixed rate the response latency counts from when each operation was due, so
+time spent queued behind a slow operation is reported rather than hidden. Replay
+results use the layout of benchmarks.db_benchmarks and compare the same way.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import tracker_config as tkc
+from benchmarks.db_benchmarks import compare_files, environment, summarize
+from database.altman_storage import STORAGE_BACKENDS, AltmanStorage, open_altman_storage
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS, altman_summary
+
+OPERATIONS: Tuple[str, ...] = ('insert', 'query', 'aggregate', 'delete')
+DEFAULT_MIX = 'insert=60,query=30,aggregate=5,delete=5'
+QUERY_WINDOW = 30 * 86400
+AGGREGATE_WINDOW = 90 * 86400
+DELETE_SAMPLE_ATTEMPTS = 8
+
+
+def _clamp_score(value: float) -> int:
+    return max(0, min(5, int(round(value))))
+
+
+def user_history(years: float, start: date, seed: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    Yields one user's synthetic altman_table rows, oldest first.
+
+    Args:
+        years (float): How long the history runs.
+        start (date): The first day.
+        seed (int): Seeds the user's habits and every score, so histories are reproducible.
+
+    Yields:
+        Tuple[Any, ...]: Rows in ALTMAN_COLUMNS order.
+    """
+    generator = random.Random(seed)
+    check_ins = generator.choice((1, 1, 2, 2, 3))  # entries on a typical logged day
+    skip_rate = generator.uniform(0.05, 0.35)  # days missed here and there
+    lapse_rate = generator.uniform(0.5, 3.0) / 365  # chance a day starts a lapse of weeks
+    episode_rate = generator.uniform(0.5, 3.0) / 365  # chance a day starts a manic episode
+    resting = [generator.uniform(0.0, 0.8) for _ in ALTMAN_ITEM_COLUMNS]
+    sensitivity = [generator.uniform(0.6, 1.0) for _ in ALTMAN_ITEM_COLUMNS]
+    episode_length = episode_day = lapse_left = 0
+    peak = 0.0
+    for day in range(int(years * 365)):
+        if episode_length == 0 and generator.random() < episode_rate:
+            episode_length, episode_day, peak = generator.randint(5, 35), 0, generator.uniform(2.0, 4.5)
+        intensity = 0.0
+        if episode_length:
+            intensity = peak * math.sin(math.pi * (episode_day + 0.5) / episode_length)
+            episode_day += 1
+            if episode_day == episode_length:
+                episode_length = 0
+        if lapse_left:
+            lapse_left -= 1
+            continue
+        if generator.random() < lapse_rate:
+            lapse_left = generator.randint(3, 21)
+            continue
+        if generator.random() < skip_rate:
+            continue
+        today = (start + timedelta(days=day)).isoformat()
+        entries = max(1, check_ins + generator.choice((-1, 0, 0, 1)) + (1 if intensity > 2.0 else 0))
+        for minute in sorted(generator.sample(range(7 * 60, 23 * 60 + 30), entries)):
+            items = [_clamp_score(generator.gauss(resting[i] + intensity * sensitivity[i], 0.6))
+                     for i in range(len(ALTMAN_ITEM_COLUMNS))]
+            yield (today, f"{minute // 60:02d}:{minute % 60:02d}:{generator.randrange(60):02d}",
+                   *items, altman_summary(items))
+
+
+def generate(users: int, years: float, directory: str, backend: str,
+             start: Optional[date] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Writes ``users`` synthetic histories, one database file each, through the bulk insert path.
+
+    Args:
+        users (int): The number of users.
+        years (float): The length of each history.
+        directory (str): Where the user_NNN.db files go; created if missing.
+        backend (str): 'qt' or 'sqlite'.
+        start (Optional[date]): The first day; defaults to ``years`` before today.
+        seed (int): The base seed; user n is seeded with seed + n.
+
+    Returns:
+        Dict[str, Any]: Rows written per file, the total and the elapsed seconds.
+    """
+    start = start or date.today() - timedelta(days=int(years * 365))
+    os.makedirs(directory, exist_ok=True)
+    written: Dict[str, int] = {}
+    started = time.perf_counter()
+    for user in range(1, users + 1):
+        path = os.path.join(directory, f"user_{user:03d}.db")
+        storage = open_altman_storage(backend, path)
+        written[path], failed = storage.insert_many_into_altman_table(user_history(years, start, seed + user))
+        storage.close_database()
+        del storage
+        print(f"{path}: {written[path]} entries" + (f", {len(failed)} failed" if failed else ''), file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(f"{total} entries for {users} users in {elapsed:.1f} s ({total / elapsed:.0f} rows/s)", file=sys.stderr)
+    return {'files': written, 'total': total, 'seconds': elapsed}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parses 'insert=60,query=30,delete=10' into relative operation weights.
+
+    Raises:
+        ValueError: If an operation is unknown or a weight is not a positive number.
+    """
+    mix: Dict[str, float] = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Weight for {name} is not a number: {weight!r}") from None
+        if mix[name] <= 0:
+            raise ValueError(f"Weight for {name} must be positive")
+    return mix
+
+
+class Replay:
+    """
+    Issues the replay operations against one open storage backend.
+
+    Args:
+        storage (AltmanStorage): The open backend, already holding a history.
+        seed (int): Seeds the choice of windows, entries and scores.
+
+    Raises:
+        ValueError: If the database holds no entries to query around.
+    """
+
+    def __init__(self, storage: AltmanStorage, seed: int = 0) -> None:
+        bounds = storage.altman_timestamp_bounds()
+        if bounds is None:
+            raise ValueError("The database is empty; generate a history first")
+        self.storage: AltmanStorage = storage
+        self.generator = random.Random(seed)
+        self.first, self.last = bounds
+        self.deletable: List[int] = []
+
+    def _window_start(self, width: int) -> int:
+        return self.generator.randint(self.first, max(self.first, self.last - width))
+
+    def prepare(self, operation: str) -> bool:
+        """
+        Does the untimed groundwork for ``operation``: deletes need an id that exists.
+
+        Ids are sampled from a few random windows, then from the oldest entries
+        of the whole history, which only comes back empty once every entry is gone.
+
+        Returns:
+            bool: False if there is nothing to delete, so the operation is skipped.
+        """
+        if operation != 'delete':
+            return True
+        for _ in range(DELETE_SAMPLE_ATTEMPTS):
+            if self.deletable:
+                return True
+            start = self._window_start(QUERY_WINDOW)
+            self.deletable = [row[0] for row in self.storage.query_altman_range(start, start + QUERY_WINDOW, 50)]
+            self.generator.shuffle(self.deletable)
+        if not self.deletable:
+            self.deletable = [row[0] for row in self.storage.query_altman_range(self.first, self.last + 1, 50)]
+        return bool(self.deletable)
+
+    def insert(self) -> Any:
+        self.last += self.generator.randint(3600, 12 * 3600)
+        moment = datetime.fromtimestamp(self.last, tz=timezone.utc)
+        items = [self.generator.randint(0, 2) for _ in ALTMAN_ITEM_COLUMNS]
+        return self.storage.insert_into_altman_table(moment.strftime('%Y-%m-%d'), moment.strftime('%H:%M:%S'),
+                                                     *items, altman_summary(items))
+
+    def query(self) -> Any:
+        start = self._window_start(QUERY_WINDOW)
+        return self.storage.query_altman_range(start, start + QUERY_WINDOW)
+
+    def aggregate(self) -> Any:
+        start = self._window_start(AGGREGATE_WINDOW)
+        return self.storage.query_altman_aggregates('week', start, start + AGGREGATE_WINDOW)
+
+    def delete(self) -> Any:
+        return self.storage.delete_altman_ids([self.deletable.pop()])
+
+
+def replay(storage: AltmanStorage, mix: Dict[str, float], rate: float = 0.0, duration: float = 30.0,
+           operation_limit: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Runs a weighted mix of operations and measures each one.
+
+    Args:
+        storage (AltmanStorage): The open backend.
+        mix (Dict[str, float]): Relative weights by operation, see parse_mix.
+        rate (float): Operations per second, issued open-loop on a fixed schedule;
+            0 runs them back to back.
+        duration (float): Seconds to run for.
+        operation_limit (Optional[int]): Stop after this many operations instead.
+        seed (int): Seeds the operation sequence.
+
+    Returns:
+        Dict[str, Any]: Per-operation service (and, at a fixed rate, response) latency
+        statistics in seconds, operation counts, deletes skipped for want of an entry
+        and the achieved throughput.
+    """
+    harness = Replay(storage, seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    service: Dict[str, List[float]] = {name: [] for name in names}
+    response: Dict[str, List[float]] = {name: [] for name in names}
+    started = time.perf_counter()
+    issued = 0
+    skipped: Dict[str, int] = {name: 0 for name in names}
+    while (operation_limit is None or issued < operation_limit) and time.perf_counter() - started < duration:
+        name = harness.generator.choices(names, weights)[0]
+        if not harness.prepare(name):
+            skipped[name] += 1
+            continue
+        due = started + issued / rate if rate > 0 else None
+        if due is not None and due > time.perf_counter():
+            time.sleep(due - time.perf_counter())
+        began = time.perf_counter()
+        getattr(harness, name)()
+        finished = time.perf_counter()
+        service[name].append(finished - began)
+        if due is not None:
+            response[name].append(finished - due)
+        issued += 1
+    elapsed = time.perf_counter() - started
+    report: Dict[str, Any] = {
+        'operations': {name: len(samples) for name, samples in service.items()},
+        'skipped': {name: number for name, number in skipped.items() if number},
+        'seconds': elapsed,
+        'throughput': issued / elapsed if elapsed else 0.0,
+        'results': {'service': {name: summarize(samples) for name, samples in service.items() if samples}},
+    }
+    if rate > 0:
+        report['results']['response'] = {name: summarize(samples) for name, samples in response.items() if samples}
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"{sum(report['operations'].values())} operations in {report['seconds']:.1f} s: "
+          f"{report['throughput']:.1f} ops/s", file=sys.stderr)
+    for name, number in report['skipped'].items():
+        print(f"  skipped  {name:<10}{number:>8}  nothing left to delete", file=sys.stderr)
+    for kind, statistics_by_name in report['results'].items():
+        for name, stats in statistics_by_name.items():
+            print(f"  {kind:<9}{name:<10}{stats['repeat']:>8}" +
+                  ''.join(f"  {label} {stats[label] * 1000:>9.3f} ms" for label in ('p50', 'p95', 'p99')),
+                  file=sys.stderr)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.workload',
+                                     description="Synthetic altman histories and a replay harness.")
+    parser.add_argument('--backend', choices=sorted(name for name in STORAGE_BACKENDS if name != 'memory'),
+                        default='qt', help="storage backend (default: %(default)s, DataManager)")
+    parser.add_argument('--seed', type=int, default=0, help="base random seed (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_ = commands.add_parser('generate', help="write one synthetic history per user")
+    generate_.add_argument('--users', type=int, default=1, help="default: %(default)s")
+    generate_.add_argument('--years', type=float, default=3.0, help="default: %(default)s")
+    generate_.add_argument('--start', type=date.fromisoformat, help="first day, yyyy-mm-dd (default: --years ago)")
+    generate_.add_argument('--directory', required=True, help="where the user_NNN.db files go")
+
+    replay_ = commands.add_parser('replay', help="run an operation mix against one database")
+    replay_.add_argument('db')
+    replay_.add_argument('--mix', default=DEFAULT_MIX, help="operation weights (default: %(default)s)")
+    replay_.add_argument('--rate', type=float, default=0.0,
+                         help="operations per second, open-loop; 0 runs back to back (default)")
+    replay_.add_argument('--duration', type=float, default=30.0, help="seconds (default: %(default)s)")
+    replay_.add_argument('--operations', type=int, help="stop after this many operations instead")
+    replay_.add_argument('--profile', choices=sorted(tkc.DB_PERFORMANCE_PROFILES),
+                         help="database performance profile (default: tracker_config.DB_PERFORMANCE_PROFILE)")
+    replay_.add_argument('--output', help="results file (default: stdout)")
+
+    compare_ = commands.add_parser('compare', help="flag regressions against a baseline replay")
+    compare_.add_argument('baseline')
+    compare_.add_argument('current')
+    compare_.add_argument('--threshold', type=float, default=tkc.BENCHMARK_REGRESSION_PCT,
+                          help="allowed slowdown in percent (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'generate':
+        generate(args.users, args.years, args.directory, args.backend, args.start, args.seed)
+        return 0
+    if args.command == 'compare':
+        return compare_files(args.baseline, args.current, args.threshold)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.db):
+        print(f"error: {args.db} does not exist", file=sys.stderr)
+        return 1
+    storage = open_altman_storage(args.backend, args.db, args.profile)
+    try:
+        report = replay(storage, mix, args.rate, args.duration, args.operations, args.seed)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        storage.close_database()
+        del storage
+    document = {'environment': environment(), 'database': os.path.abspath(args.db), 'backend': args.backend,
+                'mix': mix, 'rate': args.rate, **report}
+    _print_report(report)
+    content = json.dumps(document, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(content + '\n')
+    else:
+        print(content)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,24 @@
 from PyQt6.QtCore import QDate, QTime
 import tracker_config as tkc
 from logger_setup import logger
+from utility.instrumentation import timed
 
 
+@timed('add_altmans_data_seconds')
 def add_altmans_data(main_window_instance, widget_names, db_insert_method):
     """
     Add mental solo data to the database.
 
+    The form is reset only once the entry is saved: db_insert_method gets an ``on_done``
+    callback that resets it, and a failed save never calls it, so the values stay in
+    the form for another try.
+
     Args:
         main_window_instance (object): The instance of the main window.
         widget_names (dict): A dictionary containing the names of the widgets.
-        db_insert_method (function): The method used to insert data into the database.
+        db_insert_method (function): The method used to insert data into the database. It may
+            queue the insert elsewhere (e.g. on the database worker) and return immediately,
+            and must call its ``on_done`` keyword argument once the row is written.
 
     Returns:
         None
@@ -35,13 +43,13 @@ def add_altmans_data(main_window_instance, widget_names, db_insert_method):
                 value = value.toString(format_type)
             data_to_insert.append(value)
         except Exception as e:
-            logger.error(f"Error getting value from widget {widget_name}: {e}")
+            logger.error("Error getting value from widget %s: %s", widget_name, e)
 
     try:
-        db_insert_method(*data_to_insert)
-        reset_altman_scribes(main_window_instance, widget_names)
+        db_insert_method(*data_to_insert,
+                         on_done=lambda: reset_altman_scribes(main_window_instance, widget_names))
     except Exception as e:
-        logger.error(f"Error inserting data into the database: {e}")
+        logger.error("Error inserting data into the database: %s", e)
 
 
 def reset_altman_scribes(main_window_instance, widget_names):
@@ -67,6 +75,5 @@ def reset_altman_scribes(main_window_instance, widget_names):
         getattr(main_window_instance, widget_names['altmans_cheer']).setValue(0)
         getattr(main_window_instance, widget_names['altmans_confidence']).setValue(0)
         getattr(main_window_instance, widget_names['altmans_summary']).setValue(0)
-        getattr(main_window_instance, widget_names['model']).select()
     except Exception as e:
-        logger.error(f"Error resetting pain levels form: {e}")
+        logger.error("Error resetting pain levels form: %s", e)
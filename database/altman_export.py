@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.altman_filter import build_altman_filter
+from database.database_utility.altman_schema import ALTMAN_ROW_COLUMNS
+from database.database_utility.sql_executor import SqlExecutor
+from utility.instrumentation import count
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional: only the columnar formats need it
+    pyarrow = None
+
+# Exported columns, in file order.
+EXPORT_COLUMNS: Tuple[str, ...] = ALTMAN_ROW_COLUMNS
+# Format name -> file extensions it is inferred from.
+EXPORT_FORMATS = {
+    'csv': ('.csv',),
+    'jsonl': ('.jsonl', '.ndjson'),
+    'parquet': ('.parquet',),
+    'arrow': ('.arrow', '.feather', '.ipc'),
+}
+# Progress callback: (rows written so far, rows to write).
+ProgressCallback = Callable[[int, int], None]
+
+
+def export_format_for(path: str) -> str:
+    """
+    Infers the export format from a file name.
+
+    Raises:
+        ValueError: If the extension is not one of EXPORT_FORMATS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for export_format, extensions in EXPORT_FORMATS.items():
+        if extension in extensions:
+            return export_format
+    raise ValueError(f"Cannot infer an export format from {path!r}")
+
+
+def iter_altman_chunks(executor: SqlExecutor, where: str = '', params: Sequence[Any] = (),
+                       chunk_size: int = tkc.EXPORT_CHUNK_SIZE) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Yields altman_table rows in id order, ``chunk_size`` rows at a time.
+
+    Each chunk is a keyset query (``id > last id ... ORDER BY id LIMIT n``) on the
+    primary key, so every chunk costs the same however deep into the table it is,
+    and only one chunk is ever held in memory.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+        where (str): An optional condition on altman_table.
+        params (Sequence[Any]): The condition's bind values.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        List[Tuple[Any, ...]]: Rows as tuples in EXPORT_COLUMNS order; SQL NULL becomes None.
+    """
+    sql = (f"SELECT {', '.join(EXPORT_COLUMNS)} FROM altman_table WHERE id > ?"
+           f"{f' AND ({where})' if where else ''} ORDER BY id LIMIT ?")
+    last_id = -1
+    while True:
+        chunk = executor.fetch_all(sql, (last_id, *params, chunk_size))
+        if not chunk:
+            return
+        count('db_rows_read_total', len(chunk))
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1][0]
+
+
+def _count_rows(executor: SqlExecutor, where: str, params: Sequence[Any]) -> int:
+    return executor.scalar(f"SELECT COUNT(*) FROM altman_table{f' WHERE {where}' if where else ''}",
+                           params, default=0)
+
+
+def _write_csv(path: str, chunks: Iterator[List[Tuple[Any, ...]]], report: Callable[[int], None]) -> None:
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            report(len(chunk))
+
+
+def _write_jsonl(path: str, chunks: Iterator[List[Tuple[Any, ...]]], report: Callable[[int], None]) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        for chunk in chunks:
+            handle.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in chunk)
+            report(len(chunk))
+
+
+def _arrow_schema():
+    return pyarrow.schema([(column, pyarrow.string() if column in ('altman_date', 'altman_time') else pyarrow.int64())
+                           for column in EXPORT_COLUMNS])
+
+
+def _arrow_batch(schema, chunk: List[Tuple[Any, ...]]):
+    columns = list(zip(*chunk))
+    return pyarrow.record_batch([pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                                schema=schema)
+
+
+def _write_parquet(path: str, chunks: Iterator[List[Tuple[Any, ...]]], report: Callable[[int], None]) -> None:
+    schema = _arrow_schema()
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(_arrow_batch(schema, chunk))  # one row group per chunk
+            report(len(chunk))
+
+
+def _write_arrow(path: str, chunks: Iterator[List[Tuple[Any, ...]]], report: Callable[[int], None]) -> None:
+    schema = _arrow_schema()
+    with pyarrow.OSFile(path, 'wb') as sink, pyarrow.ipc.new_file(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(_arrow_batch(schema, chunk))
+            report(len(chunk))
+
+
+WRITERS = {
+    'csv': _write_csv,
+    'jsonl': _write_jsonl,
+    'parquet': _write_parquet,
+    'arrow': _write_arrow,
+}
+
+
+def export_altman_table(executor: SqlExecutor,
+                        path: str,
+                        export_format: Optional[str] = None,
+                        date_from: Optional[str] = None,
+                        date_to: Optional[str] = None,
+                        chunk_size: int = tkc.EXPORT_CHUNK_SIZE,
+                        progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Streams altman_table, optionally limited to a date range, into a file.
+
+    Rows are read in keyset chunks and written as they arrive, so memory stays at
+    one chunk whatever the table size. The file is written under a ``.part`` name
+    and moved into place only once complete, so a failed export never leaves a
+    truncated file behind the real name.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+        path (str): The destination file.
+        export_format (Optional[str]): 'csv', 'jsonl', 'parquet' or 'arrow'; inferred
+            from the extension when omitted. The columnar formats need pyarrow.
+        date_from (Optional[str]): First day to include, 'yyyy-MM-dd'.
+        date_to (Optional[str]): Last day to include, 'yyyy-MM-dd'.
+        chunk_size (int): Rows read and written per step.
+        progress (Optional[ProgressCallback]): Called with (rows written, rows to write)
+            after every chunk.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred.
+        RuntimeError: If a columnar format is requested without pyarrow installed.
+    """
+    export_format = export_format or export_format_for(path)
+    if export_format not in WRITERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format in ('parquet', 'arrow') and pyarrow is None:
+        raise RuntimeError(f"Exporting {export_format} requires pyarrow")
+
+    where, params = build_altman_filter(date_from=date_from, date_to=date_to)
+    total = _count_rows(executor, where, params)
+    written = 0
+
+    def report(rows: int) -> None:
+        nonlocal written
+        written += rows
+        if progress is not None:
+            progress(written, total)
+
+    part_path = f"{path}.part"
+    try:
+        WRITERS[export_format](part_path, iter_altman_chunks(executor, where, params, chunk_size), report)
+        os.replace(part_path, path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    logger.info("Exported %s rows of altman_table to %s (%s)", written, path, export_format)
+    return written
@@ -0,0 +1,231 @@
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS, altman_summary, normalized_altman_value
+
+# Format name -> file extensions it is inferred from.
+IMPORT_FORMATS = {
+    'csv': ('.csv',),
+    'jsonl': ('.jsonl', '.ndjson'),
+}
+# The range altman_table_commit puts on the item sliders.
+ITEM_MIN: int = 0
+ITEM_MAX: int = 5
+# Progress callback: (bytes read, file size).
+ProgressCallback = Callable[[int, int], None]
+# (1-based line number, parsed record, raw line); the record is None when the line did not
+# parse, and only then is the raw line kept.
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def import_format_for(path: str) -> str:
+    """
+    Infers the import format from a file name.
+
+    Raises:
+        ValueError: If the extension is not one of IMPORT_FORMATS.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for import_format, extensions in IMPORT_FORMATS.items():
+        if extension in extensions:
+            return import_format
+    raise ValueError(f"Cannot infer an import format from {path!r}")
+
+
+def _counted_lines(handle: TextIO, report: Callable[[int], None]) -> Iterator[str]:
+    """
+    Yields the lines of ``handle``, reporting how many characters have been read.
+    """
+    read = 0
+    for line in handle:
+        read += len(line)
+        yield line
+        report(read)
+
+
+def iter_csv_records(lines: Iterator[str]) -> Iterator[Record]:
+    """
+    Yields (line number, record, None) from CSV lines with a header row.
+    """
+    reader = csv.DictReader(lines)
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def iter_jsonl_records(lines: Iterator[str]) -> Iterator[Record]:
+    """
+    Yields (line number, record, raw line) from JSON Lines; blank lines are skipped.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, line
+            continue
+        if isinstance(record, dict):
+            yield line_number, record, None
+        else:
+            yield line_number, None, line
+
+
+READERS = {
+    'csv': iter_csv_records,
+    'jsonl': iter_jsonl_records,
+}
+
+
+def _item_score(record: Dict[str, Any], column: str) -> int:
+    value = record.get(column, record.get(column.replace('altmans_', '')))
+    if value is None or value == '':
+        raise ValueError(f"{column} is missing")
+    try:
+        score = int(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{column} {value!r} is not a whole number") from None
+    if not ITEM_MIN <= score <= ITEM_MAX:
+        raise ValueError(f"{column} {score} is outside {ITEM_MIN}-{ITEM_MAX}")
+    return score
+
+
+def validate_record(record: Dict[str, Any]) -> List[Union[str, int]]:
+    """
+    Turns one imported record into an altman_table row, or explains why it cannot be one.
+
+    Dates must be 'yyyy-MM-dd' and times 'hh:mm' or 'hh:mm:ss'. Items may be named by
+    column ('altmans_sleep') or short name ('sleep') and must be whole numbers within
+    the sliders' 0-5 range. Any summary in the file is ignored and recomputed with
+    altman_summary, exactly as the input view does.
+
+    Args:
+        record (Dict[str, Any]): The parsed record.
+
+    Returns:
+        List[Union[str, int]]: The row in ALTMAN_COLUMNS order.
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    altman_date = normalized_altman_value('altman_date', record.get('altman_date', record.get('date')) or '')
+    altman_time = normalized_altman_value('altman_time', record.get('altman_time', record.get('time')) or '')
+    items = [_item_score(record, column) for column in ALTMAN_ITEM_COLUMNS]
+    return [altman_date, altman_time, *items, altman_summary(items)]
+
+
+class _RejectWriter:
+    """
+    Appends rejected records to a JSON Lines file, created on the first reject.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._handle: Optional[TextIO] = None
+
+    def write(self, line_number: Optional[int], error: str, raw: Any) -> None:
+        if self._handle is None:
+            self._handle = open(self.path, 'w', encoding='utf-8')
+        self._handle.write(json.dumps({'line': line_number, 'error': error, 'record': raw}) + '\n')
+        self.count += 1
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+
+
+def import_altman_file(data_manager,
+                       path: str,
+                       reject_path: Optional[str] = None,
+                       import_format: Optional[str] = None,
+                       chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                       progress: Optional[ProgressCallback] = None,
+                       upsert: bool = True) -> Tuple[int, int]:
+    """
+    Imports a CSV or JSON Lines file of ratings into altman_table.
+
+    The file is read line by line and every record is validated as it streams past,
+    straight into DataManager.insert_many_into_altman_table, so memory stays at one
+    insert chunk regardless of the file's size. Invalid records go to the reject
+    file with their line number and reason; the valid ones are written atomically,
+    in one transaction that is rolled back entirely if the database refuses any row.
+    By default they are upserted: a record whose date and time are already stored
+    replaces that entry, so importing the same file twice leaves one copy.
+
+    Args:
+        data_manager: The DataManager (or SqliteDataManager) whose connection receives the rows.
+        path (str): The file to import.
+        reject_path (Optional[str]): Where rejected records are written as JSON Lines;
+            defaults to ``<path>.rejects.jsonl``. Only created when something is rejected.
+        import_format (Optional[str]): 'csv' or 'jsonl'; inferred from the extension when omitted.
+        chunk_size (int): Rows per batched insert.
+        progress (Optional[ProgressCallback]): Called with (characters read, file size)
+            as the file is consumed.
+        upsert (bool): Replace stored entries at the same date and time; without it such
+            a record is refused and the import rolled back.
+
+    Returns:
+        Tuple[int, int]: The number of rows imported and the number rejected.
+
+    Raises:
+        ValueError: If the format is unknown.
+        RuntimeError: If the database refused the rows; nothing was imported.
+    """
+    import_format = import_format or import_format_for(path)
+    if import_format not in READERS:
+        raise ValueError(f"Unknown import format: {import_format}")
+    reject_path = reject_path or f"{path}.rejects.jsonl"
+    if os.path.exists(reject_path):
+        os.remove(reject_path)
+    size = os.path.getsize(path)
+    rejects = _RejectWriter(reject_path)
+    reported = 0
+    supplied = 0
+
+    def report(read: int) -> None:
+        # every half percent is plenty for a progress bar and keeps signals off the hot loop
+        nonlocal reported
+        if progress is not None and (read - reported >= size // 200 or read >= size):
+            reported = read
+            progress(min(read, size), size)
+
+    def valid_rows(records: Iterator[Record]) -> Iterator[List[Union[str, int]]]:
+        nonlocal supplied
+        for line_number, record, raw in records:
+            if record is None:
+                rejects.write(line_number, "not a record", raw)
+                continue
+            try:
+                row = validate_record(record)
+            except ValueError as e:
+                rejects.write(line_number, str(e), record)
+                continue
+            supplied += 1
+            yield row
+
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            records = READERS[import_format](_counted_lines(handle, report))
+            try:
+                written, failed = data_manager.insert_many_into_altman_table(
+                    valid_rows(records), chunk_size=chunk_size, atomic=True, upsert=upsert)
+            except RuntimeError as e:
+                raise RuntimeError(f"Import of {path} failed, nothing was imported: {e}") from e
+        for _, row, error in failed:
+            rejects.write(None, error, list(row))
+    finally:
+        rejects.close()
+    if failed:
+        raise RuntimeError(f"Import of {path} rolled back: {len(failed)} rows were refused, see {reject_path}")
+    if supplied and not written:
+        # an upsert counts rows already stored as written, so nothing written means nothing landed
+        raise RuntimeError(f"Import of {path} failed: {supplied} valid rows were supplied but none was written")
+    if rejects.count:
+        logger.error("Import of %s: %s records rejected, see %s", path, rejects.count, reject_path)
+    logger.info("Imported %s rows into altman_table from %s", written, path)
+    return written, rejects.count
@@ -0,0 +1,270 @@
+"""
+The storage interface for altman_table and the backends that implement it.
+
+    qt      DataManager (database_manager.py): QSqlDatabase, announces writes on the change bus.
+    sqlite  SqliteDataManager (sqlite_data_manager.py): stdlib sqlite3, no Qt.
+    memory  MemoryDataManager (memory_data_manager.py): plain Python containers, for tests.
+
+open_altman_storage() builds the one named by tkc.STORAGE_BACKEND. Backend modules
+are imported on demand, so choosing sqlite or memory never loads PyQt6. The SQL the
+qt and sqlite backends share is written once here, against SqlExecutor.
+"""
+import importlib
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, Union
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility import aggregates
+from database.database_utility.altman_schema import (
+    ALTMAN_COLUMNS, ALTMAN_ROW_COLUMNS, INSERT_ALTMAN_ROW, UPSERT_ALTMAN_ROW, normalized_altman_row, widen_span)
+from database.database_utility.sql_executor import SqlExecutor
+from utility.instrumentation import count
+
+# A row a bulk insert refused: (row index, row, error message).
+FailedRow = Tuple[int, Sequence[Union[str, int]], str]
+
+# Backend name -> (module, class).
+STORAGE_BACKENDS: Dict[str, Tuple[str, str]] = {
+    'qt': ('database.database_manager', 'DataManager'),
+    'sqlite': ('database.sqlite_data_manager', 'SqliteDataManager'),
+    'memory': ('database.memory_data_manager', 'MemoryDataManager'),
+}
+
+
+class AltmanStorage(Protocol):
+    """
+    What every altman_table backend provides.
+
+    Rows are written as ALTMAN_COLUMNS values; altman_timestamp is derived from the
+    date and time and is unique: a plain insert at a stored timestamp fails, an
+    ``upsert`` replaces the stored row. Rows are read back as ALTMAN_ROW_COLUMNS
+    tuples. Aggregates follow database_utility.aggregates: one dictionary per
+    non-empty bucket. A bulk insert reports the rows it refused; it and
+    a delete raise RuntimeError when the write itself fails.
+    """
+
+    def insert_into_altman_table(self, altman_date: str, altman_time: str, altmans_sleep: int,
+                                 altmans_speech: int, altmans_activity: int, altmans_cheer: int,
+                                 altmans_confidence: int, altmans_summary: int,
+                                 upsert: bool = False) -> Optional[int]: ...
+
+    def insert_many_into_altman_table(self, rows: Iterable[Sequence[Union[str, int]]],
+                                      chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                                      atomic: bool = False,
+                                      upsert: bool = False
+                                      ) -> Tuple[int, List[Tuple[int, Sequence[Union[str, int]], str]]]: ...
+
+    def query_altman_range(self, start_ts: int, end_ts: int,
+                           limit: Optional[int] = None) -> List[Tuple[Any, ...]]: ...
+
+    def delete_altman_ids(self, ids: Iterable[int]) -> int: ...
+
+    def query_altman_aggregates(self, granularity: str, start_ts: Optional[int] = None,
+                                end_ts: Optional[int] = None) -> List[Dict[str, Any]]: ...
+
+    def altman_timestamp_bounds(self) -> Optional[Tuple[int, int]]: ...
+
+    def close_database(self) -> None: ...
+
+
+def query_altman_range(executor: SqlExecutor, start_ts: int, end_ts: int,
+                       limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+    """
+    Reads the altman_table rows with start_ts <= altman_timestamp < end_ts, oldest first.
+
+    The shared SQL behind the qt and sqlite backends' query_altman_range: an index
+    range on altman_timestamp, whose entries are already ordered by (timestamp, id).
+
+    Args:
+        executor (SqlExecutor): The open connection.
+        start_ts (int): The first epoch second, inclusive.
+        end_ts (int): The last epoch second, exclusive.
+        limit (Optional[int]): At most this many rows.
+
+    Returns:
+        List[Tuple[Any, ...]]: Rows in ALTMAN_ROW_COLUMNS order.
+    """
+    sql = (f"SELECT {', '.join(ALTMAN_ROW_COLUMNS)} FROM altman_table "
+           f"WHERE altman_timestamp >= ? AND altman_timestamp < ? ORDER BY altman_timestamp, id")
+    params: List[int] = [int(start_ts), int(end_ts)]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    rows = executor.fetch_all(sql, params)
+    count('db_rows_read_total', len(rows))
+    return rows
+
+
+def _insert_altman_chunk(executor: SqlExecutor, sql: str,
+                         chunk: List[Tuple[int, Sequence[Union[str, int]], int]], failed: List[FailedRow]) -> int:
+    """
+    Writes one chunk of (row index, row, altman_timestamp) under a savepoint, falling back to
+    row-by-row inserts on error.
+
+    Returns:
+        int: The number of rows written from this chunk.
+    """
+    executor.execute("SAVEPOINT altman_chunk")
+    try:
+        executor.execute_many(sql, [(*row, ts) for _, row, ts in chunk])
+        executor.execute("RELEASE SAVEPOINT altman_chunk")
+        return len(chunk)
+    except RuntimeError as e:
+        logger.error("Batch failed: altman_table - %s, retrying row by row", e)
+        executor.execute("ROLLBACK TO SAVEPOINT altman_chunk")
+    written: int = 0
+    for index, row, ts in chunk:
+        try:
+            executor.execute(sql, (*row, ts))
+            written += 1
+        except RuntimeError as e:
+            failed.append((index, row, str(e)))
+    executor.execute("RELEASE SAVEPOINT altman_chunk")
+    return written
+
+
+def insert_altman_rows(executor: SqlExecutor,
+                       rows: Iterable[Sequence[Union[str, int]]],
+                       chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                       atomic: bool = False,
+                       upsert: bool = False) -> Tuple[int, List[FailedRow], int, int, int]:
+    """
+    Inserts many rows into altman_table inside a single transaction.
+
+    The shared bulk insert behind the qt and sqlite backends' insert_many_into_altman_table.
+    Rows are consumed lazily from ``rows`` (a list, iterator or generator) and
+    written in chunks of ``chunk_size`` with one executor.execute_many each
+    (execBatch on Qt, executemany on sqlite3), so the statement is prepared once and
+    the database is committed once. Each row's date and time are stored in canonical
+    form (normalized_altman_row) and altman_timestamp is derived from them; a row
+    whose date or time cannot be read fails. A chunk that fails is rolled back to its savepoint and retried row by
+    row, which keeps the good rows and isolates the failing ones. The written rows
+    are folded into altman_aggregates once, before the commit.
+    With ``atomic`` any failed row rolls the whole call back instead, so either
+    every row lands or none does; the failed rows are still reported.
+    With ``upsert`` a row whose date and time are already stored replaces that
+    row (UPSERT_ALTMAN_ROW) instead of failing on the unique timestamp, so
+    feeding the same rows twice leaves the table as the first call did. The
+    buckets are then folded in only if every changed row is new, and otherwise
+    rebuilt over the batch's time span.
+
+    Args:
+        executor (SqlExecutor): The open connection, outside any transaction.
+        rows (Iterable[Sequence[Union[str, int]]]): Rows whose values follow ALTMAN_COLUMNS order.
+        chunk_size (int): The number of rows per execute_many call.
+        atomic (bool): Roll everything back if any row fails.
+        upsert (bool): Replace stored rows at the same date and time.
+
+    Returns:
+        Tuple[int, List[FailedRow], int, int, int]: The number of rows written (for an
+        upsert, including rows already stored as given), the failed rows, the lowest
+        id a new row can have, the number of rows inserted and the number of stored
+        rows replaced. Plain inserts get consecutive ids from that lowest id on.
+
+    Raises:
+        RuntimeError: If the transaction could not begin or commit, or the call failed
+            for any reason other than refused rows; nothing was written.
+    """
+    sql: str = UPSERT_ALTMAN_ROW if upsert else INSERT_ALTMAN_ROW
+    column_count: int = len(ALTMAN_COLUMNS)
+    written: int = 0
+    failed: List[FailedRow] = []
+    span: Optional[Tuple[int, int]] = None
+    try:
+        executor.begin()
+    except RuntimeError as e:
+        logger.error("Error starting transaction: altman_table - %s", e)
+        raise RuntimeError(f"Bulk insertion into altman_table could not begin: {e}") from e
+    try:
+        first_id: int = executor.scalar("SELECT IFNULL(MAX(id), 0) + 1 FROM altman_table")
+        if upsert:
+            changes: int = executor.scalar("SELECT total_changes()")
+        chunk: List[Tuple[int, Sequence[Union[str, int]], int]] = []
+        for index, row in enumerate(rows):
+            if len(row) != column_count:
+                failed.append((index, row, f"Expected {column_count} values, got {len(row)}"))
+                continue
+            try:
+                stored, ts = normalized_altman_row(row)
+            except ValueError as e:
+                failed.append((index, row, str(e)))
+                continue
+            chunk.append((index, stored, ts))
+            if upsert:
+                span = widen_span(span, ts)
+            if len(chunk) >= chunk_size:
+                written += _insert_altman_chunk(executor, sql, chunk, failed)
+                chunk = []
+        if chunk:
+            written += _insert_altman_chunk(executor, sql, chunk, failed)
+        if atomic and failed:
+            executor.rollback()
+            logger.error("Bulk insertion: altman_table rolled back, %s rows failed", len(failed))
+            return 0, failed, first_id, 0, 0
+        inserted: int = written
+        replaced: int = 0
+        if upsert:
+            changed: int = executor.scalar("SELECT total_changes()") - changes
+            inserted = aggregates.fold_upserted_rows(executor, first_id, changed, span)
+            replaced = max(0, changed - inserted)
+        elif written:
+            # one writer inside one transaction: AUTOINCREMENT hands out a contiguous block
+            last_id: int = executor.last_insert_id()
+            first_id = last_id - written + 1
+            aggregates.add_inserted_rows(executor, first_id, last_id)
+        executor.commit()
+    except Exception as e:
+        executor.rollback()
+        logger.error("Error during bulk insertion: altman_table %s", e, exc_info=True)
+        raise RuntimeError(f"Bulk insertion into altman_table failed: {e}") from e
+    count('db_rows_written_total', written)
+    if failed:
+        logger.error("Bulk insertion: altman_table skipped %s failed rows", len(failed))
+    return written, failed, first_id, inserted, replaced
+
+
+_qt_application = None
+
+
+def ensure_qt_application() -> None:
+    """
+    Creates a QCoreApplication unless one exists; QSqlDatabase needs one.
+
+    open_altman_storage calls this for the qt backend, so only headless code that
+    opens a DataManager directly has to.
+    """
+    global _qt_application
+    from PyQt6.QtCore import QCoreApplication
+    if QCoreApplication.instance() is None:
+        _qt_application = QCoreApplication([])
+
+
+def open_altman_storage(backend: Optional[str] = None, db_name: Optional[str] = None,
+                        profile_name: Optional[str] = None) -> AltmanStorage:
+    """
+    Opens the configured storage backend.
+
+    Args:
+        backend (Optional[str]): 'qt', 'sqlite' or 'memory'; defaults to tkc.STORAGE_BACKEND.
+        db_name (Optional[str]): The database file for the qt and sqlite backends;
+            defaults to the application database in the home directory.
+        profile_name (Optional[str]): The performance profile for the qt and sqlite
+            backends; defaults to tkc.DB_PERFORMANCE_PROFILE.
+
+    Returns:
+        AltmanStorage: The open backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or tkc.STORAGE_BACKEND
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    module_name, class_name = STORAGE_BACKENDS[backend]
+    if backend == 'qt':
+        ensure_qt_application()
+    module = importlib.import_module(module_name)
+    storage_class = getattr(module, class_name)
+    if backend == 'memory':
+        return storage_class()
+    return storage_class(db_name or module.target_db_path, profile_name)
@@ -0,0 +1,25 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class ChangeBus(QObject):
+    """
+    Broadcasts row-level changes made through DataManager.
+
+    Every signal carries the table name first. Signals emitted from the database
+    worker thread are delivered to GUI-thread subscribers through Qt's queued
+    connections, so models can apply the change on the thread that owns them.
+
+    Signals:
+        rows_inserted (str, list): Ids of newly inserted rows.
+        rows_updated (str, list): Ids of rows whose values changed.
+        rows_deleted (str, list): Ids of rows that were removed.
+        table_reset (str): Too many rows changed to list; subscribers should reload.
+    """
+    rows_inserted = pyqtSignal(str, list)
+    rows_updated = pyqtSignal(str, list)
+    rows_deleted = pyqtSignal(str, list)
+    table_reset = pyqtSignal(str)
+
+
+# Shared by every DataManager and model in the process.
+change_bus = ChangeBus()
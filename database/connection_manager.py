@@ -0,0 +1,177 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtSql import QSqlDatabase
+
+from logger_setup import logger
+from database.database_utility.performance_profile import (
+    PROFILE_PRAGMAS, READER_PRAGMAS, apply_performance_profile)
+from database.database_utility.qt_executor import QtSqlExecutor
+from database.database_utility.statement_registry import StatementRegistry
+
+CONNECTION_ROLES: Tuple[str, ...] = ('writer', 'reader')
+
+
+class ConnectionManager:
+    """
+    Hands out named, thread-affine QSQLITE connections.
+
+    A QSqlDatabase connection may only be used on the thread that opened it, and
+    addDatabase() on a name that is already taken replaces the connection under
+    whoever holds it ("connection still in use"). So no connection is opened on Qt's
+    default name: each one is named after its role, its thread and its database file,
+    and asking again on the same thread returns the same connection.
+
+        writer   read-write, with the whole performance profile applied
+        reader   opened with QSQLITE_OPEN_READONLY and only the per-connection pragmas;
+                 under WAL a reader sees a consistent snapshot and never waits on the
+                 writer, so exports and analytics can run alongside it
+
+    A caller may ask for an explicit name instead (the database workers do); that
+    name is bound to the thread that first opens it. Every open() is paired with a
+    release(); the connection closes when the last holder releases it. Each
+    connection has one StatementRegistry, shared by everything on it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # connection name -> (owning thread id, role, applied performance profile)
+        self._owners: Dict[str, Tuple[int, str, Optional[str]]] = {}
+        # connection name -> number of open() calls not yet released
+        self._holders: Dict[str, int] = {}
+        # connection name -> its prepared statements
+        self._statements: Dict[str, StatementRegistry] = {}
+
+    @staticmethod
+    def connection_name(db_name: str, role: str = 'writer', thread_id: Optional[int] = None) -> str:
+        """
+        Returns the name the calling (or given) thread's ``role`` connection to ``db_name`` goes by.
+        """
+        return f"altman_{role}:{thread_id or threading.get_ident()}:{db_name}"
+
+    def open(self,
+             db_name: str,
+             role: str = 'writer',
+             profile_name: Optional[str] = None,
+             name: Optional[str] = None) -> QSqlDatabase:
+        """
+        Returns this thread's ``role`` connection to ``db_name``, opening it on first use.
+
+        A connection that failed to open is retried on the next call. Callers check
+        isOpen(); the reason is logged here.
+
+        Args:
+            db_name (str): The database file.
+            role (str): 'writer' or 'reader'.
+            profile_name (Optional[str]): The performance profile; defaults to tkc.DB_PERFORMANCE_PROFILE.
+            name (Optional[str]): An explicit connection name instead of the per-thread one.
+
+        Returns:
+            QSqlDatabase: The connection.
+
+        Raises:
+            ValueError: If the role is unknown.
+            RuntimeError: If ``name`` belongs to another thread.
+        """
+        if role not in CONNECTION_ROLES:
+            raise ValueError(f"Unknown connection role: {role}")
+        name = name or self.connection_name(db_name, role)
+        thread_id = threading.get_ident()
+        with self._lock:
+            owner = self._owners.get(name)
+            if owner is not None and owner[0] != thread_id:
+                raise RuntimeError(f"Connection {name} belongs to another thread")
+            self._owners[name] = owner or (thread_id, role, None)
+            self._holders[name] = self._holders.get(name, 0) + 1
+        if owner is not None and QSqlDatabase.contains(name):
+            db = QSqlDatabase.database(name, False)
+        else:
+            db = QSqlDatabase.addDatabase('QSQLITE', name)
+            db.setDatabaseName(db_name)
+            if role == 'reader':
+                db.setConnectOptions('QSQLITE_OPEN_READONLY')
+        if not db.isOpen():
+            if db.open():
+                executor = QtSqlExecutor(db)
+                profile = apply_performance_profile(executor, profile_name,
+                                                    READER_PRAGMAS if role == 'reader' else PROFILE_PRAGMAS)
+                if role == 'reader' and str(executor.scalar("PRAGMA journal_mode", default='')).lower() != 'wal':
+                    logger.warning("%s is not in WAL mode; reader %s will wait on the writer", db_name, name)
+                with self._lock:
+                    self._owners[name] = (thread_id, role, profile)
+            else:
+                logger.error("Error opening %s connection to %s: %s", role, db_name, db.lastError().text())
+        return db
+
+    def writer(self, db_name: str, profile_name: Optional[str] = None) -> QSqlDatabase:
+        """
+        Returns this thread's read-write connection to ``db_name``.
+        """
+        return self.open(db_name, 'writer', profile_name)
+
+    def reader(self, db_name: str, profile_name: Optional[str] = None) -> QSqlDatabase:
+        """
+        Returns this thread's read-only connection to ``db_name``.
+        """
+        return self.open(db_name, 'reader', profile_name)
+
+    def profile(self, name: str) -> Optional[str]:
+        """
+        Returns the performance profile applied to connection ``name``, or None if it never opened.
+        """
+        with self._lock:
+            owner = self._owners.get(name)
+        return owner[2] if owner else None
+
+    def statements(self, name: str) -> StatementRegistry:
+        """
+        Returns the prepared-statement registry of connection ``name``, created on first use.
+        """
+        with self._lock:
+            registry = self._statements.get(name)
+            if registry is None:
+                registry = self._statements[name] = StatementRegistry(QSqlDatabase.database(name, False))
+        return registry
+
+    def names(self, thread_id: Optional[int] = None) -> List[str]:
+        """
+        Lists the connections held by a thread, the calling one by default.
+        """
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            return [name for name, owner in self._owners.items() if owner[0] == thread_id]
+
+    def release(self, name: str, force: bool = False) -> None:
+        """
+        Releases one hold on connection ``name``; the last (or a forced) release closes
+        it and removes it from Qt's registry.
+
+        Every QSqlDatabase and QSqlQuery handle on the connection must be gone by then,
+        or Qt warns that it is still in use.
+        """
+        with self._lock:
+            holders = self._holders.get(name, 0) - 1
+            if holders > 0 and not force:
+                self._holders[name] = holders
+                return
+            self._holders.pop(name, None)
+            self._owners.pop(name, None)
+            registry = self._statements.pop(name, None)
+        if registry is not None:
+            registry.close()
+        if QSqlDatabase.contains(name):
+            db = QSqlDatabase.database(name, False)
+            db.close()
+            del db
+            QSqlDatabase.removeDatabase(name)
+
+    def release_thread(self) -> None:
+        """
+        Releases every connection the calling thread holds.
+        """
+        for name in self.names():
+            self.release(name, force=True)
+
+
+# Shared by every DataManager in the process.
+connections = ConnectionManager()
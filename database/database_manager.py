@@ -2,14 +2,25 @@ import tracker_config as tkc
 from PyQt6.QtSql import QSqlDatabase, QSqlQuery
 import os
 import shutil
-from typing import List, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from logger_setup import logger
+from database.altman_storage import insert_altman_rows, query_altman_range
+from database.change_bus import change_bus
+from database.connection_manager import connections
+from database.database_utility import aggregates
+from database.database_utility.altman_schema import (
+    CREATE_ALTMAN_TABLE, INSERT_ALTMAN_ROW,
+    collapse_id_ranges, id_range_clauses, normalized_altman_row, normalized_altman_value, update_altman_sql)
+from database.database_utility.migrations import run_migrations
+from database.database_utility.qt_executor import QtSqlExecutor
+from database.database_utility.performance_profile import read_pragmas
+from database.database_utility.statement_registry import StatementRegistry
+from utility.instrumentation import count, timed
 
 user_dir: str = os.path.expanduser('~')
 db_path: str = os.path.join(os.getcwd(), tkc.DB_NAME)  # Database Name
 target_db_path: str = os.path.join(user_dir, tkc.DB_NAME)  # Database Name
 
-
 def initialize_database() -> None:
     """
     Initializes the database by creating a new database file or copying an existing one.
@@ -29,46 +40,84 @@ def initialize_database() -> None:
             if os.path.exists(db_path):
                 shutil.copy(db_path, target_db_path)
             else:
-                db: QSqlDatabase = QSqlDatabase.addDatabase('QSQLITE')
-                db.setDatabaseName(target_db_path)
-                if not db.open():
+                db: QSqlDatabase = connections.writer(target_db_path)
+                if not db.isOpen():
                     logger.error("Error: Unable to create database")
-                db.close()
+                name: str = db.connectionName()
+                del db
+                connections.release(name)
     except Exception as e:
-        logger.error("Error: Unable to create database", str(e))
+        logger.error("Error: Unable to create database %s", e)
 
 
 class DataManager:
+    """
+    The Qt SQL storage backend (see database.altman_storage), used by the GUI and its workers.
+
+    Its connection comes from database.connection_manager and belongs to the thread
+    that created the manager. Every statement goes through the connection's
+    StatementRegistry, so it is prepared once and each call only binds and executes.
+    Every write is announced on the change bus so open views update in place.
+    """
     
-    def __init__(self, db_name: str = target_db_path) -> None:
+    def __init__(self,
+                 db_name: str = target_db_path,
+                 profile_name: Optional[str] = None,
+                 connection_name: Optional[str] = None,
+                 read_only: bool = False) -> None:
         """
         Initializes the DataManager object and opens the database connection.
 
         Args:
             db_name (str): The path to the SQLite database file.
+            profile_name (Optional[str]): The performance profile to apply; defaults to
+                tkc.DB_PERFORMANCE_PROFILE.
+            connection_name (Optional[str]): An explicit connection name. Defaults to the
+                calling thread's own connection (see ConnectionManager).
+            read_only (bool): Open a reader connection: the tables are left alone and
+                every write fails. Under WAL it reads alongside the writer without waiting.
 
         Raises:
             Exception: If there is an error opening the database.
 
         """
+        self.performance_profile: Optional[str] = None
+        self.read_only: bool = read_only
         try:
-            self.db: QSqlDatabase = QSqlDatabase.addDatabase('QSQLITE')
-            self.db.setDatabaseName(db_name)
-            
-            if not self.db.open():
+            self.db: QSqlDatabase = connections.open(db_name, 'reader' if read_only else 'writer',
+                                                     profile_name, connection_name)
+            self.connection_name: str = self.db.connectionName()
+            if not self.db.isOpen():
                 logger.error("Error: Unable to open database")
             logger.info("DB INITIALIZING")
-            self.query: QSqlQuery = QSqlQuery()
-            self.setup_tables()
+            self.statements: StatementRegistry = connections.statements(self.connection_name)
+            self.executor: QtSqlExecutor = QtSqlExecutor(self.db, self.statements)
+            self.performance_profile = connections.profile(self.connection_name)
+            if not read_only:
+                self.setup_tables()
         except Exception as e:
-            logger.error(f"Error: Unable to open database {e}", exc_info=True)
+            logger.error("Error: Unable to open database %s", e, exc_info=True)
+    
+    def active_performance_profile(self) -> Tuple[Optional[str], Dict[str, Union[str, int]]]:
+        """
+        Reports the performance profile applied to this connection and the live pragma values.
+
+        Returns:
+            Tuple[Optional[str], Dict[str, Union[str, int]]]: The profile name (None if the
+            connection never opened) and the pragma values currently in effect.
+        """
+        return self.performance_profile, read_pragmas(self.executor)
     
     def setup_tables(self) -> None:
         """
-        Sets up the necessary tables in the database.
+        Sets up the necessary tables in the database and applies pending schema migrations.
 
         """
         self.setup_altman_table()
+        try:
+            run_migrations(self.executor)
+        except RuntimeError as e:
+            logger.error("Error migrating database: %s", e)
     
     def setup_altman_table(self) -> None:
         """
@@ -88,21 +137,12 @@ class DataManager:
         Returns:
             None
         """
-        if not self.query.exec(f"""
-                        CREATE TABLE IF NOT EXISTS altman_table (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                         altman_date TEXT,
-                         altman_time TEXT,
-                         altmans_sleep INTEGER,
-                         altmans_speech INTEGER,
-                         altmans_activity INTEGER,
-                         altmans_cheer INTEGER,
-                         altmans_confidence INTEGER,
-                         altmans_summary INTEGER
-                        )"""):
-            logger.error(f"Error creating table: altman_table",
-                         self.query.lastError().text())
+        try:
+            self.statements.run(CREATE_ALTMAN_TABLE)
+        except RuntimeError as e:
+            logger.error("Error creating table: altman_table %s", e)
     
+    @timed('altman_insert_seconds')
     def insert_into_altman_table(self,
                                  altman_date: str,
                                  altman_time: str,
@@ -111,10 +151,17 @@ class DataManager:
                                  altmans_activity: int,
                                  altmans_cheer: int,
                                  altmans_confidence: int,
-                                 altmans_summary: int
-                                 ) -> None:
+                                 altmans_summary: int,
+                                 upsert: bool = False
+                                 ) -> Optional[int]:
         """
-        Inserts data into the altman_table.
+        Inserts data into the altman_table and folds it into altman_aggregates.
+
+        The date and time are stored in canonical form (see normalized_altman_row);
+        an entry whose date or time cannot be read is not inserted.
+
+        With ``upsert`` an entry at an altman_date and altman_time already stored
+        replaces that row's values instead of failing on the unique timestamp.
 
         Args:
             altman_date (str): The date of the mental_mental record.
@@ -125,60 +172,497 @@ class DataManager:
             cheer (int): The value of the depression slider.
             confidence (int): The value of the mixed risk slider.
             altmans_summary (int): the summary of all things and all things summary'd
+            upsert (bool): Replace the row already stored at this date and time.
 
         Returns:
-            None
+            Optional[int]: The id of the inserted (or replaced) row, or None if the insert failed.
 
         Raises:
-            ValueError: If the number of bind values does not match the number of placeholders in the SQL query.
             Exception: If there is an error during data insertion.
 
         """
-        sql: str = f"""INSERT INTO altman_table(
-        altman_date,
-        altman_time,
-        altmans_sleep,
-        altmans_speech,
-        altmans_activity,
-        altmans_cheer,
-        altmans_confidence,
-        altmans_summary
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
-        bind_values: List[Union[str, int]] = [altman_date, altman_time, altmans_sleep, altmans_speech, altmans_activity, altmans_cheer, altmans_confidence, altmans_summary]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: altman_table Expected {sql.count('?')}
-                    bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: altman_table - {self.query.lastError().text()}")
+        try:
+            row, ts = normalized_altman_row((altman_date, altman_time, altmans_sleep, altmans_speech, altmans_activity,
+                                             altmans_cheer, altmans_confidence, altmans_summary))
         except ValueError as e:
-            logger.error(f"ValueError altman_table: {e}")
+            logger.error("Error during data insertion: altman_table %s", e)
+            return None
+        if upsert:
+            try:
+                written, _ = self.insert_many_into_altman_table([row], atomic=True, upsert=True)
+            except RuntimeError:
+                return None  # logged by insert_many_into_altman_table
+            if not written:
+                return None
+            return self.executor.scalar("SELECT id FROM altman_table WHERE altman_timestamp = ?", (ts,))
+        if not self.db.transaction():
+            logger.error("Error starting transaction: altman_table - %s", self.db.lastError().text())
+            return None
+        try:
+            query: QSqlQuery = self.statements.run(INSERT_ALTMAN_ROW, (*row, ts))
+            row_id: int = query.lastInsertId()
+            aggregates.add_inserted_rows(self.executor, row_id, row_id)
+            if not self.db.commit():
+                raise RuntimeError(self.db.lastError().text())
+            count('db_rows_written_total')
+            change_bus.rows_inserted.emit('altman_table', [row_id])
+            return row_id
         except Exception as e:
-            logger.error(f"Error during data insertion: altman_table {e}", exc_info=True)
+            self.db.rollback()
+            logger.error("Error during data insertion: altman_table %s", e, exc_info=True)
+        return None
+    
+    @timed('altman_bulk_insert_seconds')
+    def insert_many_into_altman_table(self,
+                                      rows: Iterable[Sequence[Union[str, int]]],
+                                      chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                                      atomic: bool = False,
+                                      upsert: bool = False
+                                      ) -> Tuple[int, List[Tuple[int, Sequence[Union[str, int]], str]]]:
+        """
+        Inserts many rows into the altman_table inside a single transaction.
 
+        The rows are written by altman_storage.insert_altman_rows, which this backend
+        shares with SqliteDataManager: chunked execBatch calls under savepoints with a
+        row-by-row fallback, one aggregate fold and one commit. Afterwards the change
+        bus hears about the new rows, or gets a table reset when rows were replaced in
+        place or there are too many to list.
 
-def close_database(self) -> None:
-    """
-    Closes the database connection if it is open.
+        Args:
+            rows (Iterable[Sequence[Union[str, int]]]): Rows whose values follow ALTMAN_COLUMNS order.
+            chunk_size (int): The number of rows bound per execBatch call.
+            atomic (bool): Roll everything back if any row fails.
+            upsert (bool): Replace stored rows at the same date and time.
 
-    This method checks if the database connection is open and closes it if it is.
-    If the connection is already closed or an error occurs while closing the
-    connection, an exception is logged.
+        Returns:
+            Tuple[int, List[Tuple[int, Sequence, str]]]: The number of rows written (for an
+            upsert, including rows already stored as given) and the failed rows as
+            (row index, row, error message) tuples.
 
-    Raises:
-        None
+        Raises:
+            RuntimeError: If the transaction could not begin or commit, or the call failed
+                for any reason other than refused rows; nothing was written.
+        """
+        written, failed, first_id, inserted, replaced = insert_altman_rows(
+            self.executor, rows, chunk_size, atomic, upsert)
+        if replaced or inserted > tkc.CHANGE_BUS_MAX_IDS:
+            # rows changed in place, and which ones is not known without reading them back
+            change_bus.table_reset.emit('altman_table')
+        elif inserted and upsert:
+            # a conflicting row uses up an id too, so the new ones need not be contiguous
+            self._announce(change_bus.rows_inserted, [row[0] for row in self.executor.fetch_all(
+                "SELECT id FROM altman_table WHERE id >= ? ORDER BY id LIMIT ?", (first_id, inserted))])
+        elif inserted:
+            self._announce(change_bus.rows_inserted, range(first_id, first_id + inserted))
+        return written, failed
+    
+    def update_altman_field(self, row_id: int, column: str, value: Any) -> bool:
+        """
+        Updates one column of one altman_table row.
 
-    Returns:
-        None
-    """
-    try:
-        logger.info("if database is open")
-        if self.db.isOpen():
-            logger.info("the database is closed successfully")
-            self.db.close()
-    except Exception as e:
-        logger.exception(f"Error closing database: {e}")
+        Editing altman_date or altman_time stores the value in canonical form and also
+        refreshes altman_timestamp; a date or time that cannot be read is refused. The
+        aggregate buckets at the row's old and new timestamps are rebuilt in the same
+        transaction.
+
+        Args:
+            row_id (int): The id of the row to update.
+            column (str): One of ALTMAN_COLUMNS.
+            value (Any): The new value.
+
+        Returns:
+            bool: True if the row was updated.
+        """
+        try:
+            sql: str = update_altman_sql(column)
+            value = normalized_altman_value(column, value)
+        except ValueError as e:
+            logger.error("ValueError altman_table: %s", e)
+            return False
+        bind_values: List[Any] = [value, value, row_id] if column in ('altman_date', 'altman_time') else [value, row_id]
+        if not self.db.transaction():
+            logger.error("Error starting transaction: altman_table - %s", self.db.lastError().text())
+            return False
+        try:
+            before = aggregates.timestamp_span(self.executor, "id = ?", row_id)
+            self.statements.run(sql, bind_values)
+            after = aggregates.timestamp_span(self.executor, "id = ?", row_id)
+            for span in {before, after} - {None}:
+                aggregates.rebuild_range(self.executor, *span)
+            if not self.db.commit():
+                raise RuntimeError(self.db.lastError().text())
+        except Exception as e:
+            self.db.rollback()
+            logger.error("Error updating data: altman_table - %s", e)
+            return False
+        count('db_rows_written_total')
+        change_bus.rows_updated.emit('altman_table', [row_id])
+        return True
+    
+    @timed('altman_edit_submit_seconds')
+    def update_altman_fields(self, edits: Sequence[Tuple[int, str, Any, Any]]) -> Optional[List[Tuple[int, str]]]:
+        """
+        Applies a batch of cell edits in one transaction, unless someone changed those cells first.
+
+        Each edit is (row id, column, new value, value the editor last saw). Every
+        UPDATE is guarded on that last value, so a cell another writer changed (or a
+        row it deleted) since it was read matches nothing. Any such conflict rolls the
+        whole batch back. Otherwise the aggregate buckets the rows span before and
+        after the edits are rebuilt and everything commits once. Dates and times are
+        stored in canonical form; one that cannot be read fails the batch.
+
+        Args:
+            edits (Sequence[Tuple[int, str, Any, Any]]): (row id, column, value, expected value),
+                at most one per cell; columns are ALTMAN_COLUMNS.
+
+        Returns:
+            Optional[List[Tuple[int, str]]]: The conflicting (row id, column) pairs, empty
+            when the batch was committed; None if it failed for any other reason.
+        """
+        if not edits:
+            return []
+        try:
+            edits = [(row_id, column, normalized_altman_value(column, value), expected)
+                     for row_id, column, value, expected in edits]
+        except ValueError as e:
+            logger.error("ValueError altman_table: %s", e)
+            return None
+        ids: List[int] = sorted({edit[0] for edit in edits})
+        if not self.db.transaction():
+            logger.error("Error starting transaction: altman_table - %s", self.db.lastError().text())
+            return None
+        try:
+            before = self._altman_timestamp_span(ids)
+            conflicts: List[Tuple[int, str]] = []
+            for row_id, column, value, expected in edits:
+                bind_values: List[Any] = [value, value] if column in ('altman_date', 'altman_time') else [value]
+                query: QSqlQuery = self.statements.run(update_altman_sql(column, guarded=True),
+                                                       bind_values + [row_id, expected])
+                if query.numRowsAffected() == 0:
+                    conflicts.append((row_id, column))
+            if conflicts:
+                self.db.rollback()
+                logger.warning("Edit submit: altman_table rolled back, %s cells changed elsewhere", len(conflicts))
+                return conflicts
+            after = self._altman_timestamp_span(ids)
+            spans = [span for span in (before, after) if span is not None]
+            if spans:
+                aggregates.rebuild_range(self.executor, min(span[0] for span in spans),
+                                         max(span[1] for span in spans))
+            if not self.db.commit():
+                raise RuntimeError(self.db.lastError().text())
+        except Exception as e:
+            self.db.rollback()
+            logger.error("Error submitting edits: altman_table - %s", e, exc_info=True)
+            return None
+        count('db_rows_written_total', len(ids))
+        self._announce(change_bus.rows_updated, ids)
+        return []
+    
+    def _altman_timestamp_span(self, ids: Sequence[int]) -> Optional[Tuple[int, int]]:
+        """
+        Returns the first and last altman_timestamp among the given ids, or None.
+        """
+        id_ranges = collapse_id_ranges(ids)
+        spans: List[Tuple[int, int]] = [(low, high) for low, high in id_ranges if low < high]
+        singles: List[int] = [low for low, high in id_ranges if low == high]
+        found: List[Tuple[int, int]] = []
+        for where, bind_values in id_range_clauses(spans, singles):
+            span = aggregates.timestamp_span(self.executor, where, *bind_values)
+            if span is not None:
+                found.append(span)
+        if not found:
+            return None
+        return min(span[0] for span in found), max(span[1] for span in found)
+    
+    def query_altman_aggregates(self, granularity: str,
+                                start_ts: Optional[int] = None,
+                                end_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Reads daily, weekly or monthly means and maxima from altman_aggregates.
+
+        Args:
+            granularity (str): 'day', 'week' or 'month'.
+            start_ts (Optional[int]): Only buckets ending after this epoch second.
+            end_ts (Optional[int]): Only buckets starting before this epoch second.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per non-empty bucket, oldest first, with
+            bucket_start, bucket_end, entry_count and mean_<metric> / max_<metric> for
+            summary, sleep, speech, activity, cheer and confidence. Empty on error.
+        """
+        try:
+            return aggregates.query_aggregates(self.executor, granularity, start_ts, end_ts)
+        except ValueError as e:
+            logger.error("ValueError altman_aggregates: %s", e)
+        except Exception as e:
+            logger.error("Error reading aggregates: altman_aggregates %s", e, exc_info=True)
+        return []
+    
+    def altman_timestamp_bounds(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the first and last altman_timestamp in altman_table, or None when it is empty.
+        """
+        try:
+            return aggregates.timestamp_span(self.executor, "altman_timestamp IS NOT NULL")
+        except Exception as e:
+            logger.error("Error reading timestamp bounds: altman_table %s", e, exc_info=True)
+        return None
+    
+    def query_altman_range(self, start_ts: int, end_ts: int,
+                           limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """
+        Reads the altman_table rows with start_ts <= altman_timestamp < end_ts, oldest first.
+
+        Args:
+            start_ts (int): The first epoch second, inclusive.
+            end_ts (int): The last epoch second, exclusive.
+            limit (Optional[int]): At most this many rows.
+
+        Returns:
+            List[Tuple[Any, ...]]: Rows in ALTMAN_ROW_COLUMNS order. Empty on error.
+        """
+        try:
+            return query_altman_range(self.executor, start_ts, end_ts, limit)
+        except Exception as e:
+            logger.error("Error reading range: altman_table %s", e, exc_info=True)
+        return []
+    
+    def query_altman_series(self, start_ts: int, end_ts: int,
+                            bucket_count: int) -> List[Tuple[Any, ...]]:
+        """
+        Downsamples altman_table between two timestamps into min/max buckets.
+
+        [start_ts, end_ts) is cut into ``bucket_count`` equal slices and each slice is
+        reduced in SQL to its first and last timestamp plus the minimum and maximum of
+        every metric in aggregates.AGGREGATE_METRICS. Drawing a min-max line per slice keeps
+        every spike visible while the result never exceeds ``bucket_count`` rows,
+        however many entries fall in the range. The scan is an index range on
+        altman_timestamp.
+
+        Args:
+            start_ts (int): The first epoch second, inclusive.
+            end_ts (int): The last epoch second, exclusive.
+            bucket_count (int): The number of slices, typically a few per pixel column.
+
+        Returns:
+            List[Tuple[Any, ...]]: One (first_ts, last_ts, min_0, max_0, min_1, max_1, ...)
+            tuple per non-empty slice, oldest first, metrics in AGGREGATE_METRICS order.
+            Empty on error.
+        """
+        span: int = max(1, int(end_ts) - int(start_ts))
+        bucket_count = max(1, int(bucket_count))
+        metrics: str = ', '.join(f"MIN({column}), MAX({column})"
+                                 for column in aggregates.AGGREGATE_METRICS.values())
+        try:
+            query: QSqlQuery = self.statements.run(f"""
+                SELECT (altman_timestamp - ?) * ? / ? AS bucket,
+                       MIN(altman_timestamp), MAX(altman_timestamp), {metrics}
+                  FROM altman_table
+                 WHERE altman_timestamp >= ? AND altman_timestamp < ?
+                 GROUP BY bucket ORDER BY bucket""",
+                (int(start_ts), bucket_count, span, int(start_ts), int(end_ts)))
+        except RuntimeError as e:
+            logger.error("Error reading series: altman_table - %s", e)
+            return []
+        width: int = 2 + 2 * len(aggregates.AGGREGATE_METRICS)
+        buckets: List[Tuple[Any, ...]] = []
+        while query.next():
+            buckets.append(tuple(None if query.isNull(i) else query.value(i) for i in range(1, width + 1)))
+        query.finish()
+        return buckets
+    
+    def export_altman_table(self,
+                            path: str,
+                            export_format: Optional[str] = None,
+                            date_from: Optional[str] = None,
+                            date_to: Optional[str] = None,
+                            progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Streams altman_table to a CSV, JSON Lines, Parquet or Arrow file.
+
+        See database.altman_export.export_altman_table.
+
+        Args:
+            path (str): The destination file.
+            export_format (Optional[str]): 'csv', 'jsonl', 'parquet' or 'arrow'; inferred
+                from the extension when omitted.
+            date_from (Optional[str]): First day to include, 'yyyy-MM-dd'.
+            date_to (Optional[str]): Last day to include, 'yyyy-MM-dd'.
+            progress (Optional[Callable[[int, int], None]]): Called with (rows written,
+                rows to write) after every chunk.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            ValueError: If the format is unknown.
+            RuntimeError: If the export fails.
+        """
+        # imported here: the export module builds on this one
+        from database.altman_export import export_altman_table
+        # a reader exports one snapshot, whatever the writer commits meanwhile
+        snapshot: bool = self.read_only and self.db.transaction()
+        try:
+            return export_altman_table(self.executor, path, export_format, date_from, date_to, progress=progress)
+        finally:
+            if snapshot:
+                self.db.commit()
+    
+    def import_altman_file(self,
+                           path: str,
+                           reject_path: Optional[str] = None,
+                           import_format: Optional[str] = None,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           upsert: bool = True) -> Tuple[int, int]:
+        """
+        Imports a CSV or JSON Lines file of ratings, all or nothing.
+
+        See database.altman_import.import_altman_file.
+
+        Args:
+            path (str): The file to import.
+            reject_path (Optional[str]): Where rejected records are written.
+            import_format (Optional[str]): 'csv' or 'jsonl'; inferred from the extension when omitted.
+            progress (Optional[Callable[[int, int], None]]): Called with (read, size) as the file is consumed.
+            upsert (bool): Replace stored entries at the same date and time, so a re-import adds nothing.
+
+        Returns:
+            Tuple[int, int]: The number of rows imported and the number rejected.
+
+        Raises:
+            ValueError: If the format is unknown.
+            RuntimeError: If the database refused the rows; nothing was imported.
+        """
+        # imported here: the import module builds on this one
+        from database.altman_import import import_altman_file
+        return import_altman_file(self, path, reject_path, import_format, progress=progress, upsert=upsert)
+    
+    def delete_altman_ids(self, ids: Iterable[int]) -> int:
+        """
+        Deletes the altman_table rows with the given ids.
+
+        The ids are collapsed into contiguous ranges first, see delete_altman_id_ranges.
+
+        Args:
+            ids (Iterable[int]): The ids to delete.
+
+        Returns:
+            int: The number of rows deleted.
+
+        Raises:
+            RuntimeError: If the delete failed; nothing was deleted.
+        """
+        return self.delete_altman_id_ranges(collapse_id_ranges(ids))
+    
+    def delete_altman_id_ranges(self, id_ranges: Sequence[Tuple[int, int]]) -> int:
+        """
+        Deletes every altman_table row whose id falls in one of the inclusive ranges.
+
+        Ranges become ``id BETWEEN ? AND ?`` terms and single ids one ``id IN (...)``
+        list, OR-ed into a single DELETE (split only to stay under SQLite's bound
+        parameter limit) inside one transaction. Deleting a whole table selected in id
+        order is therefore one range and one statement, however many rows it holds.
+        The aggregate buckets spanned by the deleted rows' timestamps are rebuilt
+        before the commit.
+
+        Args:
+            id_ranges (Sequence[Tuple[int, int]]): Inclusive (first id, last id) ranges.
+
+        Returns:
+            int: The number of rows deleted.
+
+        Raises:
+            RuntimeError: If the delete failed; nothing was deleted. A count of 0 only
+                ever means no row matched.
+        """
+        deleted: int = 0
+        spans: List[Tuple[int, int]] = [(low, high) for low, high in id_ranges if low < high]
+        singles: List[int] = [low for low, high in id_ranges if low == high]
+        if not spans and not singles:
+            return deleted
+        # with few enough rows, name them on the change bus so views update row by row
+        announced_ids: Optional[List[int]] = None
+        if sum(high - low + 1 for low, high in spans) + len(singles) <= tkc.CHANGE_BUS_MAX_IDS:
+            announced_ids = self._existing_altman_ids(spans, singles)
+        
+        if not self.db.transaction():
+            logger.error("Error starting transaction: altman_table - %s", self.db.lastError().text())
+            raise RuntimeError(f"Deleting from altman_table could not begin: {self.db.lastError().text()}")
+        try:
+            first_ts: Optional[int] = None
+            last_ts: Optional[int] = None
+            for where, bind_values in id_range_clauses(spans, singles):
+                span = aggregates.timestamp_span(self.executor, where, *bind_values)
+                if span is not None:
+                    first_ts = span[0] if first_ts is None else min(first_ts, span[0])
+                    last_ts = span[1] if last_ts is None else max(last_ts, span[1])
+                deleted += self.statements.run(f"DELETE FROM altman_table WHERE {where}",
+                                               bind_values).numRowsAffected()
+            if first_ts is not None:
+                aggregates.rebuild_range(self.executor, first_ts, last_ts)
+            if not self.db.commit():
+                raise RuntimeError(self.db.lastError().text())
+        except Exception as e:
+            self.db.rollback()
+            logger.error("Error deleting data: altman_table %s", e, exc_info=True)
+            raise RuntimeError(f"Deleting from altman_table failed: {e}") from e
+        count('db_rows_deleted_total', deleted)
+        if announced_ids is None:
+            change_bus.table_reset.emit('altman_table')
+        elif announced_ids:
+            change_bus.rows_deleted.emit('altman_table', announced_ids)
+        return deleted
+    
+    def _existing_altman_ids(self, spans: List[Tuple[int, int]], singles: List[int]) -> List[int]:
+        """
+        Returns the ids that actually exist within the given ranges and single ids.
+        """
+        ids: List[int] = []
+        for where, bind_values in id_range_clauses(spans, singles):
+            try:
+                query: QSqlQuery = self.statements.run(f"SELECT id FROM altman_table WHERE {where}", bind_values)
+            except RuntimeError as e:
+                logger.error("Error reading ids: altman_table - %s", e)
+                continue
+            while query.next():
+                ids.append(query.value(0))
+            query.finish()
+        return ids
+    
+    def _announce(self, signal, ids: Sequence[int]) -> None:
+        """
+        Emits ``signal`` with ids, or a table reset when there are too many to list.
+        """
+        if len(ids) > tkc.CHANGE_BUS_MAX_IDS:
+            change_bus.table_reset.emit('altman_table')
+        else:
+            signal.emit('altman_table', list(ids))
+    
+    def close_database(self) -> None:
+        """
+        Hands the database connection back to the connection manager, which closes it
+        once no other manager on this thread still holds it.
+
+        If the connection is already closed or an error occurs while closing the
+        connection, an exception is logged. Models built on ``db`` must be gone first.
+
+        Raises:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            logger.info("if database is open")
+            if not self.db.isValid():
+                return
+            # drop this manager's handles so the connection can be removed cleanly
+            self.db = QSqlDatabase()
+            self.executor = QtSqlExecutor(self.db)
+            self.statements = StatementRegistry(self.db)
+            connections.release(self.connection_name)
+            if not QSqlDatabase.contains(self.connection_name):
+                logger.info("the database is closed successfully")
+        except Exception as e:
+            logger.exception("Error closing database: %s", e)
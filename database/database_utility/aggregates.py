@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional, Tuple
+from logger_setup import logger
+from database.database_utility.sql_executor import SqlExecutor
+
+# Metric name -> altman_table column, aggregated as mean (via sum) and max per bucket.
+AGGREGATE_METRICS: Dict[str, str] = {
+    'summary': 'altmans_summary',
+    'sleep': 'altmans_sleep',
+    'speech': 'altmans_speech',
+    'activity': 'altmans_activity',
+    'cheer': 'altmans_cheer',
+    'confidence': 'altmans_confidence',
+}
+
+# Granularity -> (bucket start, bucket end) SQL over the epoch expression {ts}.
+# Weeks start on Monday; 1970-01-01 was a Thursday, hence the 3-day shift.
+GRANULARITIES: Dict[str, Tuple[str, str]] = {
+    'day': ("(({ts}) / 86400) * 86400",
+            "(({ts}) / 86400) * 86400 + 86400"),
+    'week': ("((({ts}) / 86400 + 3) / 7 * 7 - 3) * 86400",
+             "((({ts}) / 86400 + 3) / 7 * 7 - 3) * 86400 + 604800"),
+    'month': ("CAST(strftime('%s', {ts}, 'unixepoch', 'start of month') AS INTEGER)",
+              "CAST(strftime('%s', {ts}, 'unixepoch', 'start of month', '+1 month') AS INTEGER)"),
+}
+
+CREATE_AGGREGATE_TABLE: str = f"""
+    CREATE TABLE IF NOT EXISTS altman_aggregates (
+        granularity TEXT NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        bucket_end INTEGER NOT NULL,
+        entry_count INTEGER NOT NULL,
+        {', '.join(f'sum_{metric} INTEGER NOT NULL, max_{metric} INTEGER' for metric in AGGREGATE_METRICS)},
+        PRIMARY KEY (granularity, bucket_start)
+    ) WITHOUT ROWID"""
+
+
+def _bucket_select(granularity: str, where: str) -> str:
+    """
+    Builds the SELECT that aggregates the altman_table rows matching ``where`` per bucket.
+    """
+    start, end = (expression.format(ts='altman_timestamp') for expression in GRANULARITIES[granularity])
+    metrics = ', '.join(f"SUM(IFNULL({column}, 0)), MAX({column})" for column in AGGREGATE_METRICS.values())
+    return (f"SELECT '{granularity}', {start}, {end}, COUNT(*), {metrics} FROM altman_table "
+            f"WHERE altman_timestamp IS NOT NULL AND ({where}) GROUP BY 2")
+
+
+def add_inserted_rows(executor: SqlExecutor, first_id: int, last_id: int) -> None:
+    """
+    Folds freshly inserted rows (ids first_id..last_id) into every bucket they land in.
+
+    The rows are read once, into day buckets; weeks and months are rolled up from
+    those days, since every day lies inside one week and one month. Counts and sums
+    are added and maxima raised in a single upsert for all granularities, so the
+    cost follows the number of inserted rows, not the size of the table. Call it
+    inside the transaction that inserted the rows.
+    """
+    day_start = GRANULARITIES['day'][0].format(ts='altman_timestamp')
+    day_metrics = ', '.join(f"SUM(IFNULL({column}, 0)) AS sum_{metric}, MAX({column}) AS max_{metric}"
+                            for metric, column in AGGREGATE_METRICS.items())
+    rolled_metrics = ', '.join(f"SUM(sum_{metric}), MAX(max_{metric})" for metric in AGGREGATE_METRICS)
+    rollups = ' UNION ALL '.join(
+        f"SELECT '{granularity}', {start.format(ts='day')}, {end.format(ts='day')}, SUM(entry_count), "
+        f"{rolled_metrics} FROM days GROUP BY 2"
+        for granularity, (start, end) in GRANULARITIES.items())
+    updates = ', '.join(
+        f"sum_{metric} = sum_{metric} + excluded.sum_{metric}, "
+        f"max_{metric} = COALESCE(MAX(max_{metric}, excluded.max_{metric}), max_{metric}, excluded.max_{metric})"
+        for metric in AGGREGATE_METRICS)
+    executor.execute(f"WITH days AS (SELECT {day_start} AS day, COUNT(*) AS entry_count, {day_metrics} "
+                     f"FROM altman_table WHERE id BETWEEN ? AND ? AND altman_timestamp IS NOT NULL GROUP BY 1) "
+                     f"INSERT INTO altman_aggregates SELECT * FROM ({rollups}) WHERE true "
+                     f"ON CONFLICT(granularity, bucket_start) DO UPDATE SET "
+                     f"entry_count = entry_count + excluded.entry_count, {updates}",
+                     (first_id, last_id))
+
+
+def rebuild_range(executor: SqlExecutor, first_ts: int, last_ts: int) -> None:
+    """
+    Recomputes every bucket overlapping first_ts..last_ts from altman_table.
+
+    Deletes and edits can lower a maximum, which cannot be undone incrementally, so
+    the buckets they touched are recomputed from the rows still in them (an indexed
+    range on altman_timestamp). Empty buckets disappear. Call it inside the
+    transaction that changed the rows.
+    """
+    for granularity, (start, end) in GRANULARITIES.items():
+        low, high = executor.fetch_one(f"SELECT {start.format(ts='?')}, {end.format(ts='?')}",
+                                       (first_ts, last_ts))
+        executor.execute("DELETE FROM altman_aggregates "
+                         "WHERE granularity = ? AND bucket_start >= ? AND bucket_start < ?",
+                         (granularity, low, high))
+        executor.execute(f"INSERT INTO altman_aggregates "
+                         f"{_bucket_select(granularity, 'altman_timestamp >= ? AND altman_timestamp < ?')}",
+                         (low, high))
+
+
+def fold_upserted_rows(executor: SqlExecutor, first_id: int, changed: int,
+                       span: Optional[Tuple[int, int]]) -> int:
+    """
+    Brings the buckets up to date after an upsert batch that changed ``changed`` rows.
+
+    New rows got ids from first_id on; the other changed rows replaced stored rows
+    at the same altman_timestamp. When every change is a new row they are folded in
+    as add_inserted_rows does; otherwise the buckets over ``span``, the batch's
+    (min, max) timestamp, are recomputed, since a replaced row can lower a maximum.
+    Rows the batch repeated unchanged cost nothing. Call it inside the transaction
+    that wrote the rows.
+
+    Returns:
+        int: The number of rows inserted rather than replaced.
+    """
+    inserted: int = executor.scalar("SELECT COUNT(*) FROM altman_table WHERE id >= ?", (first_id,), default=0)
+    if inserted >= changed:
+        if inserted:
+            add_inserted_rows(executor, first_id, executor.scalar("SELECT MAX(id) FROM altman_table", default=0))
+    elif span is not None:
+        rebuild_range(executor, *span)
+    return inserted
+
+
+def rebuild_all(executor: SqlExecutor) -> None:
+    """
+    Rebuilds the whole aggregate table from altman_table.
+    """
+    executor.execute("DELETE FROM altman_aggregates")
+    for granularity in GRANULARITIES:
+        executor.execute(f"INSERT INTO altman_aggregates {_bucket_select(granularity, '1')}")
+
+
+def timestamp_span(executor: SqlExecutor, where: str, *bind_values) -> Optional[Tuple[int, int]]:
+    """
+    Returns (min, max) altman_timestamp of the altman_table rows matching ``where``, or None.
+    """
+    row = executor.fetch_one(f"SELECT MIN(altman_timestamp), MAX(altman_timestamp) FROM altman_table WHERE {where}",
+                             bind_values)
+    if row is None or row[0] is None:
+        return None
+    return row[0], row[1]
+
+
+def query_aggregates(executor: SqlExecutor, granularity: str,
+                     start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Reads buckets of one granularity, oldest first, as dictionaries.
+
+    Each dictionary holds bucket_start, bucket_end, entry_count and mean_<metric> /
+    max_<metric> for every metric in AGGREGATE_METRICS.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+        granularity (str): 'day', 'week' or 'month'.
+        start_ts (Optional[int]): Only buckets ending after this epoch second.
+        end_ts (Optional[int]): Only buckets starting before this epoch second.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per non-empty bucket.
+
+    Raises:
+        ValueError: If the granularity is unknown.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    metrics = ', '.join(f"CAST(sum_{metric} AS REAL) / entry_count, max_{metric}" for metric in AGGREGATE_METRICS)
+    sql = (f"SELECT bucket_start, bucket_end, entry_count, {metrics} FROM altman_aggregates "
+           f"WHERE granularity = ? AND bucket_end > ? AND bucket_start < ? ORDER BY bucket_start")
+    rows = executor.fetch_all(sql, (granularity,
+                                    start_ts if start_ts is not None else -2 ** 62,
+                                    end_ts if end_ts is not None else 2 ** 62))
+    names = ['bucket_start', 'bucket_end', 'entry_count']
+    for metric in AGGREGATE_METRICS:
+        names.extend((f"mean_{metric}", f"max_{metric}"))
+    buckets: List[Dict[str, Any]] = [dict(zip(names, row)) for row in rows]
+    logger.debug("Read %s %s aggregate buckets", len(buckets), granularity)
+    return buckets
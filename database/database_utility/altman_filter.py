@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+from typing import Any, List, Optional, Tuple
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS, altman_epoch
+
+
+def build_altman_filter(date_from: Optional[str] = None,
+                        date_to: Optional[str] = None,
+                        item_column: Optional[str] = None,
+                        item_min: int = 0,
+                        summary_min: int = 0) -> Tuple[str, List[Any]]:
+    """
+    Translates data view filter settings into an indexed SQL condition on altman_table.
+
+    Dates become a half-open range on altman_timestamp, so the filter seeks on
+    uq_altman_timestamp instead of comparing date strings row by row.
+
+    Args:
+        date_from (Optional[str]): First day to include, 'yyyy-MM-dd'.
+        date_to (Optional[str]): Last day to include, 'yyyy-MM-dd'.
+        item_column (Optional[str]): One of ALTMAN_ITEM_COLUMNS, or None for "any item".
+        item_min (int): Minimum item score; 0 disables the item threshold.
+        summary_min (int): Minimum altmans_summary; 0 disables it.
+
+    Returns:
+        Tuple[str, List[Any]]: The condition (empty when nothing is filtered) and its bind values.
+
+    Raises:
+        ValueError: If item_column is not an item column.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    if date_from:
+        clauses.append("altman_timestamp >= ?")
+        params.append(altman_epoch(date_from, '00:00:00'))
+    if date_to:
+        day_after = (date.fromisoformat(date_to) + timedelta(days=1)).isoformat()
+        clauses.append("altman_timestamp < ?")
+        params.append(altman_epoch(day_after, '00:00:00'))
+    if item_min > 0:
+        if item_column is None:
+            clauses.append('(' + ' OR '.join(f"{column} >= ?" for column in ALTMAN_ITEM_COLUMNS) + ')')
+            params.extend([item_min] * len(ALTMAN_ITEM_COLUMNS))
+        elif item_column in ALTMAN_ITEM_COLUMNS:
+            clauses.append(f"{item_column} >= ?")
+            params.append(item_min)
+        else:
+            raise ValueError(f"Not an item column: {item_column}")
+    if summary_min > 0:
+        clauses.append("altmans_summary >= ?")
+        params.append(summary_min)
+    return ' AND '.join(clauses), params
@@ -0,0 +1,269 @@
+"""
+The altman_table schema and the pure-Python helpers shared by every storage path.
+
+Nothing here imports Qt, so headless tools can use it without loading PyQt6.
+"""
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Insertable columns of altman_table, in bind order.
+ALTMAN_COLUMNS: Tuple[str, ...] = (
+    'altman_date',
+    'altman_time',
+    'altmans_sleep',
+    'altmans_speech',
+    'altmans_activity',
+    'altmans_cheer',
+    'altmans_confidence',
+    'altmans_summary',
+)
+# The five rated items, each scored 0-5; altmans_summary is derived from them.
+ALTMAN_ITEM_COLUMNS: Tuple[str, ...] = ALTMAN_COLUMNS[2:7]
+# Stored alongside ALTMAN_COLUMNS; derived from altman_date + altman_time on insert.
+ALTMAN_TIMESTAMP_COLUMN: str = 'altman_timestamp'
+# A full stored row, as range queries and exports return it.
+ALTMAN_ROW_COLUMNS: Tuple[str, ...] = ('id',) + ALTMAN_COLUMNS + (ALTMAN_TIMESTAMP_COLUMN,)
+
+# The base table; altman_timestamp and the indexes are added by the migrations.
+CREATE_ALTMAN_TABLE: str = """
+    CREATE TABLE IF NOT EXISTS altman_table (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        altman_date TEXT,
+        altman_time TEXT,
+        altmans_sleep INTEGER,
+        altmans_speech INTEGER,
+        altmans_activity INTEGER,
+        altmans_cheer INTEGER,
+        altmans_confidence INTEGER,
+        altmans_summary INTEGER
+    )"""
+
+# One row of ALTMAN_COLUMNS plus its altman_timestamp, in that bind order.
+INSERT_ALTMAN_ROW: str = (f"INSERT INTO altman_table({', '.join(ALTMAN_COLUMNS)}, {ALTMAN_TIMESTAMP_COLUMN}) "
+                          f"VALUES ({', '.join('?' for _ in ALTMAN_COLUMNS)}, ?)")
+# INSERT_ALTMAN_ROW, but a row whose altman_timestamp is already stored replaces that
+# row's values in place (keeping its id); an identical row is left unwritten.
+UPSERT_ALTMAN_ROW: str = (f"{INSERT_ALTMAN_ROW} ON CONFLICT({ALTMAN_TIMESTAMP_COLUMN}) DO UPDATE SET "
+                          f"{', '.join(f'{column} = excluded.{column}' for column in ALTMAN_COLUMNS)} "
+                          f"WHERE {' OR '.join(f'{column} IS NOT excluded.{column}' for column in ALTMAN_COLUMNS)}")
+
+
+def altman_epoch_sql(date_sql: str = 'altman_date', time_sql: str = 'altman_time') -> str:
+    """
+    Builds the SQL expression that computes altman_timestamp from a date and a time expression.
+
+    It is NULL unless both read back unchanged through SQLite's date() and time()
+    (with a no-op modifier, which rolls '2024-02-30' and '24:00:00' over), i.e. are
+    real dates and times in the canonical forms altman_epoch reads, so SQL and Python
+    agree on every input. A '?' stands for a bound value the caller has already normalized
+    and is not checked again, keeping one bind per value.
+    """
+    checks = [f"{sql} = {function}({sql}, '+0 {unit}')"
+              for function, sql, unit in (('date', date_sql, 'days'), ('time', time_sql, 'seconds')) if sql != '?']
+    return f"CASE WHEN {' AND '.join(checks)} THEN CAST(strftime('%s', {date_sql} || ' ' || {time_sql}) AS INTEGER) END"
+
+
+@lru_cache(maxsize=None)
+def update_altman_sql(column: str, guarded: bool = False) -> str:
+    """
+    Builds the UPDATE that sets one of ALTMAN_COLUMNS on the row with a given id.
+
+    Setting altman_date or altman_time binds the value a second time to refresh
+    altman_timestamp, so the binds are (value, [value,] id); pass such a value through
+    normalized_altman_value first: the timestamp is NULL for anything else, as
+    altman_epoch_sql computes it. A ``guarded`` update
+    also binds the value the column is expected to hold and changes nothing when
+    it holds something else: (value, [value,] id, expected).
+
+    Raises:
+        ValueError: If ``column`` is not one of ALTMAN_COLUMNS.
+    """
+    if column not in ALTMAN_COLUMNS:
+        raise ValueError(f"cannot update column {column}")
+    sql: str = f"UPDATE altman_table SET {column} = ?"
+    if column == 'altman_date':
+        sql += f", {ALTMAN_TIMESTAMP_COLUMN} = {altman_epoch_sql(date_sql='?')}"
+    elif column == 'altman_time':
+        sql += f", {ALTMAN_TIMESTAMP_COLUMN} = {altman_epoch_sql(time_sql='?')}"
+    sql += " WHERE id = ?"
+    if guarded:
+        sql += f" AND {column} IS ?"
+    return sql
+
+
+@lru_cache(maxsize=4096)
+def _epoch_day(altman_date: str) -> int:
+    """
+    Returns the epoch seconds at midnight UTC of a 'yyyy-MM-dd' date.
+
+    Raises:
+        ValueError: If the date is not exactly in that form.
+    """
+    if len(altman_date) != 10 or altman_date[4] != '-' or altman_date[7] != '-' or not altman_date.isascii():
+        raise ValueError(f"altman_date {altman_date!r} is not yyyy-MM-dd")
+    return int(datetime.fromisoformat(altman_date).replace(tzinfo=timezone.utc).timestamp())
+
+
+@lru_cache(maxsize=86400)
+def _day_seconds(altman_time: str) -> int:
+    """
+    Returns the seconds since midnight of an 'hh:mm:ss' time.
+
+    Raises:
+        ValueError: If the time is not exactly in that form.
+    """
+    hours, minutes, seconds = altman_time[:2], altman_time[3:5], altman_time[6:]
+    if (len(altman_time) != 8 or altman_time[2] != ':' or altman_time[5] != ':' or not altman_time.isascii()
+            or not (hours + minutes + seconds).isdigit() or int(minutes) > 59 or int(seconds) > 59 or int(hours) > 23):
+        raise ValueError(f"altman_time {altman_time!r} is not hh:mm:ss")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def altman_epoch(altman_date: str, altman_time: str) -> Optional[int]:
+    """
+    Converts an entry's stored date and time into the value kept in altman_timestamp.
+
+    Only the canonical 'yyyy-MM-dd' and 'hh:mm:ss' forms are read, as UTC, which is
+    what SQLite's strftime('%s', date || ' ' || time) turns into the same number; so
+    rows written here and timestamps the migrations and field edits compute in SQL
+    agree. Anything else ('9:05:00', '2024-1-5') gives None here, as it gives NULL
+    there: run input through normalized_altman_row before storing it.
+
+    Args:
+        altman_date (str): The entry date, 'yyyy-MM-dd'.
+        altman_time (str): The entry time, 'hh:mm:ss'.
+
+    Returns:
+        Optional[int]: Seconds since the epoch, or None if either part is not canonical.
+    """
+    try:
+        return _epoch_day(altman_date) + _day_seconds(altman_time)
+    except (ValueError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _normalized_date(value: str) -> str:
+    try:
+        return date.fromisoformat(value.strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"altman_date {value!r} is not yyyy-MM-dd") from None
+
+
+@lru_cache(maxsize=4096)
+def _normalized_time(value: str) -> str:
+    parts = value.strip().split(':')
+    if len(parts) == 2:
+        parts.append('0')
+    if len(parts) != 3 or not all(part.isascii() and part.strip().isdigit() for part in parts):
+        raise ValueError(f"altman_time {value!r} is not hh:mm[:ss]")
+    hours, minutes, seconds = (int(part) for part in parts)
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        raise ValueError(f"altman_time {value!r} is out of range")
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def normalized_altman_value(column: str, value: Any) -> Any:
+    """
+    Returns a value for ``column`` in the form altman_table stores it.
+
+    Dates become 'yyyy-MM-dd' and times 'hh:mm:ss' (from 'h:mm' or 'h:mm:ss'), the
+    forms altman_epoch and SQLite's strftime both read; other columns pass through.
+
+    Raises:
+        ValueError: If a date or time cannot be read.
+    """
+    if column == 'altman_date':
+        return _normalized_date(str(value))
+    if column == 'altman_time':
+        return _normalized_time(str(value))
+    return value
+
+
+def normalized_altman_row(row: Sequence[Union[str, int]]) -> Tuple[Sequence[Union[str, int]], int]:
+    """
+    Returns a row in ALTMAN_COLUMNS order with its date and time normalized, and its altman_timestamp.
+
+    Rows already in canonical form come back as they are.
+
+    Raises:
+        ValueError: If the date or time cannot be read.
+    """
+    ts = altman_epoch(row[0], row[1])
+    if ts is None:
+        row = (_normalized_date(str(row[0])), _normalized_time(str(row[1])), *row[2:])
+        ts = altman_epoch(row[0], row[1])
+    return row, ts
+
+
+def altman_summary(items: Iterable[int]) -> int:
+    """
+    Computes altmans_summary from the five item scores: the sum of the scores above 0.
+
+    Args:
+        items (Iterable[int]): The item scores, each 0-5.
+
+    Returns:
+        int: The summary score, 0-25.
+    """
+    return int(sum(value for value in items if value > 0))
+
+
+def widen_span(span: Optional[Tuple[int, int]], ts: Optional[int]) -> Optional[Tuple[int, int]]:
+    """
+    Returns the (min, max) timestamp span grown to cover ``ts``; a None ``ts`` leaves it as is.
+    """
+    if ts is None:
+        return span
+    if span is None:
+        return ts, ts
+    return min(span[0], ts), max(span[1], ts)
+
+
+def collapse_id_ranges(ids: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Collapses ids into sorted, inclusive (first, last) ranges of consecutive ids.
+
+    Args:
+        ids (Iterable[int]): The ids, in any order, duplicates allowed.
+
+    Returns:
+        List[Tuple[int, int]]: e.g. [3, 1, 2, 7] -> [(1, 3), (7, 7)].
+    """
+    ranges: List[Tuple[int, int]] = []
+    for row_id in sorted(set(ids)):
+        if ranges and ranges[-1][1] == row_id - 1:
+            ranges[-1] = (ranges[-1][0], row_id)
+        else:
+            ranges.append((row_id, row_id))
+    return ranges
+
+
+def id_range_clauses(spans: List[Tuple[int, int]], singles: List[int],
+                     max_bind_values: int = 900) -> Iterable[Tuple[str, List[int]]]:
+    """
+    Yields (WHERE clause, bind values) pairs covering id ranges and single ids.
+
+    Each clause ORs ``id BETWEEN ? AND ?`` terms and one ``id IN (...)`` list and
+    binds at most ``max_bind_values`` values, so one clause covers everything unless
+    SQLite's parameter limit forces a split.
+    """
+    terms: List[str] = []
+    bind_values: List[int] = []
+    for low, high in spans:
+        terms.append("id BETWEEN ? AND ?")
+        bind_values.extend((low, high))
+        if len(bind_values) >= max_bind_values:
+            yield ' OR '.join(terms), bind_values
+            terms, bind_values = [], []
+    pending: List[int] = list(singles)
+    while pending:
+        room: int = max(1, max_bind_values - len(bind_values))
+        chunk, pending = pending[:room], pending[room:]
+        terms.append(f"id IN ({', '.join('?' for _ in chunk)})")
+        bind_values.extend(chunk)
+        yield ' OR '.join(terms), bind_values
+        terms, bind_values = [], []
+    if terms:
+        yield ' OR '.join(terms), bind_values
@@ -1,12 +1,21 @@
+from typing import List, Tuple
 from PyQt6.QtWidgets import QTableView, QMainWindow
 from logger_setup import logger
+from utility.instrumentation import timed
 
 
+@timed('delete_selected_rows_seconds')
 def delete_selected_rows(main_window_instance: QMainWindow, table_view_widget_name: str,
                          model_name: str) -> None:
     """
     Delete the selected rows from the specified QTableView model.
 
+    The selection is read as row ranges rather than one index per row, so selecting
+    everything in a table of a million rows is a single range. Models that support
+    remove_row_ranges turn the ranges into one set-based delete and drop the rows once
+    the delete is reported on the change bus; other models get one removeRows call
+    per range followed by submitAll.
+
     Args:
         main_window_instance (QMainWindow): The instance of the main window.
         table_view_widget_name (str): The name of the QTableView widget in the main window.
@@ -25,17 +34,25 @@ def delete_selected_rows(main_window_instance: QMainWindow, table_view_widget_na
         model = getattr(main_window_instance, model_name)  # The model's specific type could vary
         
         if table_view is not None:
-            # Get indices of selected rows, sorted in reverse order for deletion
-            selected_rows = table_view.selectionModel().selectedRows()
-            rows_to_delete = sorted([index.row() for index in selected_rows], reverse=True)
-            
-            # Delete each selected row from the model
-            for row in rows_to_delete:
-                model.removeRow(row)
+            # Merge the selected ranges into sorted, non-overlapping row ranges
+            row_ranges: List[Tuple[int, int]] = []
+            for top, bottom in sorted((selection_range.top(), selection_range.bottom())
+                                      for selection_range in table_view.selectionModel().selection()):
+                if row_ranges and top <= row_ranges[-1][1] + 1:
+                    row_ranges[-1] = (row_ranges[-1][0], max(bottom, row_ranges[-1][1]))
+                else:
+                    row_ranges.append((top, bottom))
+            # Drop the selection first: Qt re-checks every selected index when rows
+            # are removed, which costs seconds for a "select all" on a large table
+            table_view.selectionModel().clearSelection()
             
-            # Submit changes and refresh the model
-            model.submitAll()
-            model.select()
+            if hasattr(model, 'remove_row_ranges'):
+                model.remove_row_ranges(row_ranges)
+            else:
+                # Delete bottom-up so earlier ranges keep their row numbers
+                for first, last in reversed(row_ranges):
+                    model.removeRows(first, last - first + 1)
+                model.submitAll()
     
     except Exception as e:
-        logger.error(f"An error occurred while deleting records: {str(e)}")
+        logger.error("An error occurred while deleting records: %s", str(e))
@@ -0,0 +1,771 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel
+import tracker_config as tkc
+from logger_setup import logger
+from database.change_bus import change_bus
+from database.database_utility.altman_schema import collapse_id_ranges
+from utility.instrumentation import count, timed
+
+
+# Columns whose ordering is served by another, indexed column.
+SORT_ALIASES: Dict[str, str] = {
+    'altman_date': 'altman_timestamp',  # date then time, i.e. chronological
+}
+# Order columns an index serves as (column, id), see migrations; sort() refuses the others.
+SORTABLE_COLUMNS: Tuple[str, ...] = ('id', 'altman_timestamp', 'altmans_summary')
+
+# One buffered edit as submit_method receives it: (row id, column, value, value last read).
+Edit = Tuple[int, str, Any, Any]
+# Writes a batch of edits, then calls back with the conflicting (row id, column) pairs, or None on failure.
+SubmitMethod = Callable[[List[Edit], Callable[[Optional[List[Tuple[int, str]]]], None]], Any]
+
+
+class KeysetTableModel(QAbstractTableModel):
+    """
+    A read-mostly table model that pages rows in on demand with keyset queries.
+
+    Only the row count is known up front. Rows are fetched in pages of ``page_size``
+    when the view asks for them, with ``WHERE (order_column, id) > (?, ?)`` seeks
+    from the last row of the previous page, so the cost of a page does not grow with
+    its position. At most ``max_cached_pages`` pages are kept; the pages furthest
+    from the one being read are dropped first, so memory stays flat however large
+    the table gets.
+
+    Sorting and filtering are pushed down to SQL: sort() changes the ORDER BY (with
+    ``SORT_ALIASES`` mapping a column onto an indexed equivalent) and set_filter()
+    adds a WHERE clause to every query, so neither touches rows outside the pages
+    being shown. Only the orders in ``SORTABLE_COLUMNS`` have an index to seek on;
+    sort() leaves the order as it is for any other column.
+
+    The model keeps the parts of the QSqlTableModel API the rest of the app uses
+    (select, fieldIndex, removeRow, setEditStrategy, submitAll + revertAll). Edits
+    are handed to ``update_method`` and deletes to ``delete_method`` as inclusive id
+    ranges (normally DataManager calls queued on the database worker); without them
+    the model is read-only.
+
+    With EditStrategy.OnManualSubmit, edits are buffered instead: they show at once,
+    tinted, and submitAll hands them all to ``submit_method`` together with the values
+    they replace, to be written in one transaction that fails if any of those cells
+    changed in the meantime. Conflicting cells stay pending, tinted as conflicts and
+    rebased on the values now stored, so submitting again overwrites them
+    deliberately. revertAll drops every pending edit. The model never reloads
+    itself after a write: it listens on the change bus and applies row-level
+    inserts, updates and removals, so a commit costs the same however long the
+    table is.
+
+    Signals:
+        pending_changed (bool): Whether any edit is waiting to be submitted.
+        submit_finished (object): A submit's outcome: a list of conflicting
+            (row id, column) pairs, empty on success, or None if it failed.
+
+    Attributes:
+        table_name (str): The table being shown.
+        page_size (int): Rows per page.
+        max_cached_pages (int): Pages kept in memory at once.
+    """
+    pending_changed = pyqtSignal(bool)
+    submit_finished = pyqtSignal(object)
+
+    def __init__(self,
+                 table_name: str,
+                 db: QSqlDatabase,
+                 page_size: int = tkc.TABLE_PAGE_SIZE,
+                 max_cached_pages: int = tkc.TABLE_MAX_CACHED_PAGES,
+                 update_method: Optional[Callable[[int, str, Any], Any]] = None,
+                 delete_method: Optional[Callable[[List[Tuple[int, int]]], Any]] = None,
+                 submit_method: Optional[SubmitMethod] = None,
+                 parent=None) -> None:
+        super().__init__(parent)
+        self.table_name: str = table_name
+        self.update_method: Optional[Callable[[int, str, Any], Any]] = update_method
+        self.delete_method: Optional[Callable[[List[Tuple[int, int]]], Any]] = delete_method
+        self.submit_method: Optional[SubmitMethod] = submit_method
+        self.db: QSqlDatabase = db
+        self.page_size: int = page_size
+        self.max_cached_pages: int = max(2, max_cached_pages)
+        record = db.record(table_name)
+        self._columns: List[str] = [record.fieldName(i) for i in range(record.count())]
+        self._id_column: int = self._columns.index('id')
+        self._order_column: str = 'id'
+        self._descending: bool = False
+        # the column sort() was last given; altman_date orders by altman_timestamp
+        self._sort_column: int = self._id_column
+        self._filter_sql: str = ''
+        self._filter_params: List[Any] = []
+        self._row_count: int = 0
+        self._fully_counted: bool = True
+        self.count_chunk: int = tkc.TABLE_COUNT_CHUNK
+        # highest id counted by the last select(); inserts at or below it are already in _row_count
+        self._max_id: int = 0
+        # page number -> rows, most recently used last
+        self._pages: "OrderedDict[int, List[List[Any]]]" = OrderedDict()
+        # page number -> sort key (order value, id) of the last row before that page
+        self._anchors: Dict[int, Tuple[Any, int]] = {}
+        self._last_error: str = ''
+        self._edit_strategy: QSqlTableModel.EditStrategy = QSqlTableModel.EditStrategy.OnFieldChange
+        # (id, column index) -> (edited value, value it replaces), waiting for submitAll
+        self._pending: Dict[Tuple[int, int], Tuple[Any, Any]] = {}
+        # the pending edits of the submit in flight
+        self._submitting: Dict[Tuple[int, int], Tuple[Any, Any]] = {}
+        # pending cells a submit found changed by someone else
+        self._conflicts: Set[Tuple[int, int]] = set()
+        change_bus.rows_inserted.connect(self._on_rows_inserted)
+        change_bus.rows_updated.connect(self._on_rows_updated)
+        change_bus.rows_deleted.connect(self._on_rows_deleted)
+        change_bus.table_reset.connect(self._on_table_reset)
+
+    # ------------------------------------------------------------------ SQL
+    def _exec(self, sql: str, params: Sequence[Any] = ()) -> Optional[QSqlQuery]:
+        """
+        Runs a forward-only query on the model's connection.
+
+        Returns:
+            Optional[QSqlQuery]: The executed query, or None on error (logged).
+        """
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        query.prepare(sql)
+        for value in params:
+            query.addBindValue(value)
+        if not query.exec():
+            self._last_error = query.lastError().text()
+            logger.error("Error querying %s: %s", self.table_name, self._last_error)
+            return None
+        return query
+
+    def _where(self, clause: str = '', params: Sequence[Any] = ()) -> Tuple[str, List[Any]]:
+        """
+        Combines the active filter with ``clause`` into a WHERE fragment and its params.
+
+        Returns:
+            Tuple[str, List[Any]]: ' WHERE ...' (or '') and the values to bind, filter first.
+        """
+        parts = [f"({self._filter_sql})"] if self._filter_sql else []
+        if clause:
+            parts.append(clause)
+        if not parts:
+            return '', list(params)
+        return f" WHERE {' AND '.join(parts)}", self._filter_params + list(params)
+
+    def _order_by(self) -> str:
+        direction = 'DESC' if self._descending else 'ASC'
+        if self._order_column == 'id':
+            return f"id {direction}"
+        return f"{self._order_column} {direction}, id {direction}"
+
+    def _seek_segments(self, anchor: Tuple[Any, int],
+                       descending: Optional[bool] = None) -> List[Tuple[str, List[Any]]]:
+        """
+        Builds the keyset conditions selecting rows after ``anchor`` in the current order.
+
+        Passing the opposite of the current direction selects the rows before it.
+        SQLite sorts NULLs first, so the rows after an anchor can span the NULL and
+        the non-NULL order values. OR-ing the two into one condition would stop
+        SQLite from seeking on the index, so they come back as separate segments, in
+        order, each one index range; callers read them one after the other.
+        """
+        value, row_id = anchor
+        descending = self._descending if descending is None else descending
+        if self._order_column == 'id':
+            return [(("id < ?" if descending else "id > ?"), [row_id])]
+        column = self._order_column
+        if descending:
+            if value is None:
+                return [(f"{column} IS NULL AND id < ?", [row_id])]
+            return [(f"({column}, id) < (?, ?)", [value, row_id]), (f"{column} IS NULL", [])]
+        if value is None:
+            return [(f"{column} IS NULL AND id > ?", [row_id]), (f"{column} IS NOT NULL", [])]
+        return [(f"({column}, id) > (?, ?)", [value, row_id])]
+
+    def _row_key(self, row: List[Any]) -> Tuple[Any, int]:
+        return row[self._columns.index(self._order_column)], row[self._id_column]
+
+    def _scalar(self, sql: str, params: Sequence[Any] = (), default: Any = 0) -> Any:
+        query = self._exec(sql, params)
+        return query.value(0) if query is not None and query.next() and not query.isNull(0) else default
+
+    def _count_more(self, anchor: Optional[Tuple[Any, int]] = None) -> int:
+        """
+        Counts up to count_chunk filtered rows after ``anchor`` (from the top when None).
+
+        A bounded count costs at most count_chunk index steps however selective the
+        filter is, where COUNT(*) over a broad filter would visit every match.
+        """
+        return self._count_seek(anchor, self.count_chunk)
+
+    def _count_seek(self, anchor: Optional[Tuple[Any, int]], limit: int,
+                    descending: Optional[bool] = None) -> int:
+        """
+        Counts up to ``limit`` filtered rows after ``anchor`` (from the top when None).
+
+        Passing the opposite of the current direction counts the rows before it.
+        """
+        counted = 0
+        for segment in (self._seek_segments(anchor, descending) if anchor else [('', [])]):
+            where, params = self._where(*segment)
+            counted += self._scalar(f"SELECT COUNT(*) FROM (SELECT 1 FROM {self.table_name}{where} LIMIT ?)",
+                                    params + [limit - counted])
+            if counted >= limit:
+                break
+        return counted
+
+    def _fetch_rows_by_id(self, ids: Sequence[int]) -> Dict[int, List[Any]]:
+        """
+        Loads the given rows by id, keyed by id. Rows outside the filter are left out.
+        """
+        found: Dict[int, List[Any]] = {}
+        ids = list(ids)
+        width = len(self._columns)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            where, params = self._where(f"id IN ({', '.join('?' for _ in chunk)})", chunk)
+            query = self._exec(f"SELECT {', '.join(self._columns)} FROM {self.table_name}{where}", params)
+            while query is not None and query.next():
+                values = [None if query.isNull(i) else query.value(i) for i in range(width)]
+                found[values[self._id_column]] = values
+        count('db_rows_read_total', len(found))
+        return found
+
+    def _position_of(self, values: List[Any]) -> Optional[int]:
+        """
+        Returns the row a stored row with ``values`` occupies in an order other than id.
+
+        The rows before it are counted only as far as the cached pages reach
+        (page_size * max_cached_pages rows), so the count stays cheap however long
+        the table is.
+
+        Returns:
+            Optional[int]: The row, or None if it lies beyond that reach.
+        """
+        reach = self.page_size * self.max_cached_pages
+        before = self._count_seek(self._row_key(values), reach + 1, not self._descending)
+        return before if before <= reach else None
+
+    def _order_key(self, values: List[Any]) -> Tuple[bool, Any, int]:
+        """
+        Sorts rows in Python the way the current ORDER BY does, ascending (NULLs first).
+        """
+        value, row_id = self._row_key(values)
+        return value is not None, 0 if value is None else value, row_id
+
+    def _cached_rows_by_id(self) -> Dict[int, Tuple[int, List[Any]]]:
+        """
+        Maps the id of every cached row to its (row, values).
+        """
+        located: Dict[int, Tuple[int, List[Any]]] = {}
+        for page, rows in self._pages.items():
+            for offset, values in enumerate(rows):
+                located[values[self._id_column]] = (page * self.page_size + offset, values)
+        return located
+
+    def _fetch_page(self, page: int) -> List[List[Any]]:
+        """
+        Loads one page, seeking from a known anchor when possible.
+
+        Pages reached without an anchor (a jump far down the scrollbar) fall back to
+        a single OFFSET query; later neighbouring pages then seek from it. A seek
+        reads its segments in order until the page is full.
+        """
+        columns = ', '.join(self._columns)
+        anchor = self._anchors.get(page)
+        if anchor is None and page - 1 in self._pages and self._pages[page - 1]:
+            anchor = self._row_key(self._pages[page - 1][-1])
+        # (WHERE fragment, its params, OFFSET) per query, read in order
+        statements: List[Tuple[str, List[Any], int]] = []
+        if page > 0 and anchor is not None:
+            statements.extend((*self._where(*segment), 0) for segment in self._seek_segments(anchor))
+        else:
+            statements.append((*self._where(), page * self.page_size))
+
+        rows: List[List[Any]] = []
+        width = len(self._columns)
+        for where, params, offset in statements:
+            if len(rows) >= self.page_size:
+                break
+            query = self._exec(f"SELECT {columns} FROM {self.table_name}{where} "
+                               f"ORDER BY {self._order_by()} LIMIT ? OFFSET ?",
+                               params + [self.page_size - len(rows), offset])
+            while query is not None and query.next():
+                # PyQt hands NULL back as '', which would break NULL-aware seeks
+                rows.append([None if query.isNull(i) else query.value(i) for i in range(width)])
+        if len(rows) == self.page_size:
+            self._anchors[page + 1] = self._row_key(rows[-1])
+        count('db_rows_read_total', len(rows))
+        return rows
+
+    def _page(self, page: int) -> List[List[Any]]:
+        rows = self._pages.get(page)
+        if rows is not None:
+            self._pages.move_to_end(page)
+            return rows
+        rows = self._fetch_page(page)
+        self._pages[page] = rows
+        while len(self._pages) > self.max_cached_pages:
+            furthest = max(self._pages, key=lambda cached: abs(cached - page))
+            del self._pages[furthest]
+        return rows
+
+    def _row(self, row: int) -> Optional[List[Any]]:
+        rows = self._page(row // self.page_size)
+        offset = row % self.page_size
+        return rows[offset] if offset < len(rows) else None
+
+    def _invalidate_from(self, row: int) -> None:
+        """
+        Drops cached pages and anchors at or after the page holding ``row``.
+        """
+        first_page = max(0, row) // self.page_size
+        for page in [p for p in self._pages if p >= first_page]:
+            del self._pages[page]
+        for page in [p for p in self._anchors if p > first_page]:
+            del self._anchors[page]
+
+    # ------------------------------------------------------- QSqlTableModel-ish API
+    @timed('model_select_seconds')
+    def select(self) -> bool:
+        """
+        Re-counts the table and drops every cached page.
+
+        An unfiltered table is counted exactly (SQLite answers a bare COUNT(*) from its
+        smallest index). A filtered one is counted up to count_chunk rows and extended
+        through fetchMore as the view scrolls towards the end, the same way
+        QSqlTableModel grows as it fetches.
+
+        Returns:
+            bool: Always True; errors are logged.
+        """
+        self.beginResetModel()
+        self._pages.clear()
+        self._anchors.clear()
+        self._max_id = self._scalar(f"SELECT MAX(id) FROM {self.table_name}")
+        if self._filter_sql:
+            self._row_count = self._count_more()
+            self._fully_counted = self._row_count < self.count_chunk
+        else:
+            self._row_count = self._scalar(f"SELECT COUNT(*) FROM {self.table_name}")
+            self._fully_counted = True
+        self.endResetModel()
+        return True
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._fully_counted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """
+        Extends a partially counted filtered view by up to count_chunk rows.
+        """
+        if not self.canFetchMore(parent):
+            return
+        last = self._row(self._row_count - 1) if self._row_count else None
+        more = self._count_more(self._row_key(last) if last else None)
+        self._fully_counted = more < self.count_chunk
+        if more:
+            self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + more - 1)
+            self._row_count += more
+            self.endInsertRows()
+
+    def setEditStrategy(self, strategy: QSqlTableModel.EditStrategy) -> None:
+        """
+        Chooses between writing each edit at once and buffering them until submitAll.
+
+        OnManualSubmit buffers; any other strategy writes through update_method. Edits
+        still pending when buffering is turned off are submitted first.
+        """
+        if strategy != QSqlTableModel.EditStrategy.OnManualSubmit and self._pending:
+            self.submitAll()
+        self._edit_strategy = strategy
+
+    def editStrategy(self) -> QSqlTableModel.EditStrategy:
+        return self._edit_strategy
+
+    def isDirty(self, index: Optional[QModelIndex] = None) -> bool:
+        """
+        Returns whether ``index`` (or, without one, any cell) has a pending edit.
+        """
+        if index is None:
+            return bool(self._pending)
+        values = self._row(index.row()) if index.isValid() else None
+        return bool(values) and (values[self._id_column], index.column()) in self._pending
+
+    def submitAll(self) -> bool:
+        """
+        Hands every pending edit to submit_method as one batch.
+
+        The edits stay pending until the result comes back (see submit_finished).
+        Immediate edits have already been handed off, so there is nothing to do.
+
+        Returns:
+            bool: False if there are pending edits but no submit_method, or a submit is
+            still in flight.
+        """
+        if not self._pending:
+            return True
+        if self.submit_method is None or self._submitting:
+            return False
+        self._submitting = dict(self._pending)
+        edits: List[Edit] = [(row_id, self._columns[column], value, expected)
+                             for (row_id, column), (value, expected) in self._submitting.items()]
+        self.submit_method(edits, self._on_submit_done)
+        return True
+
+    def revertAll(self) -> None:
+        """
+        Drops every pending edit and shows the stored values again.
+        """
+        reverted = {row_id for row_id, _ in self._pending}
+        self._pending.clear()
+        self._conflicts.clear()
+        self._cells_changed(reverted)
+        self.pending_changed.emit(False)
+
+    def _on_submit_done(self, conflicts: Optional[List[Tuple[int, str]]]) -> None:
+        """
+        Settles the submit in flight.
+
+        On success the submitted edits leave the buffer, except cells edited again
+        while it ran, which now replace the submitted value. On a conflict every edit
+        stays pending; the conflicting rows are re-read so those cells are rebased on
+        what is stored now, and edits to rows that no longer exist are dropped.
+        """
+        submitted, self._submitting = self._submitting, {}
+        touched = {row_id for row_id, _ in submitted}
+        if conflicts is None:
+            self._last_error = "Submitting the edits failed"
+        elif not conflicts:
+            self._conflicts.difference_update(submitted)
+            for key, (value, _) in submitted.items():
+                current = self._pending.get(key)
+                if current is not None and current[0] == value:
+                    del self._pending[key]
+                elif current is not None:
+                    self._pending[key] = (current[0], value)
+        else:
+            conflicted = {(row_id, self._columns.index(column)) for row_id, column in conflicts}
+            fresh = self._fetch_rows_by_id(sorted({row_id for row_id, _ in conflicted}))
+            cached = self._cached_rows_by_id()
+            for row_id, values in fresh.items():
+                if row_id in cached:
+                    cached[row_id][1][:] = values
+            for key in conflicted:
+                row_id, column = key
+                if row_id not in fresh:
+                    self._pending.pop(key, None)
+                    continue
+                if key in self._pending:
+                    self._pending[key] = (self._pending[key][0], fresh[row_id][column])
+                    self._conflicts.add(key)
+            gone = {row_id for row_id, _ in conflicted} - fresh.keys()
+            for key in [key for key in self._pending if key[0] in gone]:
+                del self._pending[key]
+        self._conflicts.intersection_update(self._pending)
+        self._cells_changed(touched)
+        self.pending_changed.emit(bool(self._pending))
+        self.submit_finished.emit(conflicts)
+
+    def _cells_changed(self, ids: Set[int]) -> None:
+        """
+        Emits dataChanged for the cached rows among ``ids``.
+        """
+        cached = self._cached_rows_by_id()
+        for row_id in ids:
+            if row_id in cached:
+                row = cached[row_id][0]
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    # ------------------------------------------------------------ change bus
+    def _on_rows_inserted(self, table_name: str, ids: List[int]) -> None:
+        """
+        Inserts newly written rows at their place in the current order.
+
+        In id order new rows go to the top or the bottom without a query. In any
+        other order each row is placed with a bounded count (see _position_of),
+        so a batch of more than TABLE_INSERT_PLACE_MAX rows, or one with a row
+        landing beyond the cached pages, reloads the view with a single select()
+        instead of counting the table once per row.
+        """
+        if table_name != self.table_name:
+            return
+        new_ids = sorted(row_id for row_id in ids if row_id > self._max_id)
+        if not new_ids:
+            return
+        self._max_id = new_ids[-1]
+        if self._order_column != 'id' and len(new_ids) > tkc.TABLE_INSERT_PLACE_MAX:
+            self.select()
+            return
+        ordered = sorted(self._fetch_rows_by_id(new_ids).values(), key=self._order_key, reverse=self._descending)
+        if self._order_column == 'id':
+            # new ids are always the largest
+            first = 0 if self._descending else self._row_count
+            positions: List[Optional[int]] = list(range(first, first + len(ordered)))
+        else:
+            # counted in the table as committed, so each count includes the new rows before it
+            positions = [self._position_of(values) for values in ordered]
+            if None in positions:
+                self.select()
+                return
+        for row in positions:
+            if row >= self._row_count and not self._fully_counted:
+                break  # beyond the counted rows, as is every later one; fetchMore will reach them
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._row_count += 1
+            self._invalidate_from(row)
+            self.endInsertRows()
+
+    def _on_rows_updated(self, table_name: str, ids: List[int]) -> None:
+        """
+        Refreshes cached rows whose values changed.
+
+        A change to the value the table is ordered by moves the row, and a change
+        that takes it out of the filter removes it; both are handled with a reload.
+        """
+        if table_name != self.table_name:
+            return
+        cached = self._cached_rows_by_id()
+        stale = [row_id for row_id in ids if row_id in cached]
+        if not stale:
+            return
+        order_index = self._columns.index(self._order_column)
+        fresh = self._fetch_rows_by_id(stale)
+        if len(fresh) != len(stale):
+            self.select()
+            return
+        for row_id, values in fresh.items():
+            row, cached_values = cached[row_id]
+            if values[order_index] != cached_values[order_index]:
+                self.select()
+                return
+            cached_values[:] = values
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    def _on_rows_deleted(self, table_name: str, ids: List[int]) -> None:
+        """
+        Removes deleted rows, one beginRemoveRows per contiguous run.
+
+        Rows that are not cached cannot be placed without a query per row, so a
+        delete that reaches outside the cache falls back to a reload.
+        """
+        if table_name != self.table_name:
+            return
+        cached = self._cached_rows_by_id()
+        deleted = set(ids)
+        if any(key[0] in deleted for key in self._pending):
+            self._pending = {key: edit for key, edit in self._pending.items() if key[0] not in deleted}
+            self._conflicts.intersection_update(self._pending)
+            self.pending_changed.emit(bool(self._pending))
+        if any(row_id not in cached for row_id in ids):
+            self.select()
+            return
+        rows = sorted((cached[row_id][0] for row_id in ids), reverse=True)
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._row_count -= last - first + 1
+            self._invalidate_from(first)
+            self.endRemoveRows()
+
+    def _on_table_reset(self, table_name: str) -> None:
+        if table_name == self.table_name:
+            self.select()
+
+    def fieldIndex(self, field_name: str) -> int:
+        return self._columns.index(field_name) if field_name in self._columns else -1
+
+    def lastError(self) -> str:
+        return self._last_error
+
+    def row_id(self, row: int) -> Optional[int]:
+        """
+        Returns the id of the row at ``row`` in the current order, or None.
+        """
+        values = self._row(row) if 0 <= row < self._row_count else None
+        return values[self._id_column] if values else None
+
+    # ------------------------------------------------------------- Qt model API
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole,
+                                               Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        values = self._row(index.row())
+        if not values:
+            return None
+        key = (values[self._id_column], index.column())
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if key in self._conflicts:
+                return QColor(tkc.TABLE_CONFLICT_EDIT_COLOR)
+            return QColor(tkc.TABLE_PENDING_EDIT_COLOR) if key in self._pending else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if key in self._conflicts:
+                return f"Changed elsewhere to {self._pending[key][1]}; submit again to overwrite it"
+            return f"Was {self._pending[key][1]}" if key in self._pending else None
+        edit = self._pending.get(key)
+        return edit[0] if edit is not None else values[index.column()]
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if (role == Qt.ItemDataRole.ToolTipRole and orientation == Qt.Orientation.Horizontal
+                and 0 <= section < len(self._columns) and not self.is_sortable(section)):
+            return "Not sortable: no index on this column"
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._columns[section] if 0 <= section < len(self._columns) else None
+        return section + 1
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        writer = (self.submit_method if self._edit_strategy == QSqlTableModel.EditStrategy.OnManualSubmit
+                  else self.update_method)
+        if index.isValid() and index.column() != self._id_column and writer is not None:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """
+        Hands an edited cell to update_method and shows the new value right away.
+
+        The change bus confirms the write and refreshes the row from the database.
+        Under OnManualSubmit the edit is buffered instead; editing a cell back to the
+        value it replaces un-buffers it.
+        """
+        buffered = self._edit_strategy == QSqlTableModel.EditStrategy.OnManualSubmit
+        writer = self.submit_method if buffered else self.update_method
+        if (writer is None or not index.isValid()
+                or role != Qt.ItemDataRole.EditRole or index.column() == self._id_column):
+            return False
+        values = self._row(index.row())
+        if not values:
+            return False
+        if buffered:
+            key = (values[self._id_column], index.column())
+            expected = self._pending[key][1] if key in self._pending else values[index.column()]
+            if value == expected and key not in self._conflicts:
+                self._pending.pop(key, None)
+            else:
+                self._pending[key] = (value, expected)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole,
+                                                 Qt.ItemDataRole.BackgroundRole])
+            self.pending_changed.emit(bool(self._pending))
+            return True
+        self.update_method(values[self._id_column], self._columns[index.column()], value)
+        values[index.column()] = value
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        """
+        Deletes ``count`` rows starting at ``row``; see remove_row_ranges.
+        """
+        if parent.isValid() or count <= 0:
+            return False
+        return self.remove_row_ranges([(row, row + count - 1)])
+
+    def remove_row_ranges(self, row_ranges: Sequence[Tuple[int, int]]) -> bool:
+        """
+        Hands the rows in the inclusive (first row, last row) ranges to delete_method.
+
+        The rows leave the model when the change bus reports the delete.
+
+        Args:
+            row_ranges (Sequence[Tuple[int, int]]): Inclusive row ranges in the current order.
+
+        Returns:
+            bool: False if the model is read-only or a range is out of bounds.
+        """
+        if self.delete_method is None:
+            return False
+        id_ranges: List[Tuple[int, int]] = []
+        for first, last in row_ranges:
+            if first < 0 or last < first or last >= self._row_count:
+                return False
+            id_ranges.extend(self._id_ranges_in_rows(first, last))
+        if id_ranges:
+            self.delete_method(id_ranges)
+        return True
+
+    def _id_ranges_in_rows(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """
+        Returns inclusive id ranges covering exactly the rows first..last.
+
+        Without a filter, in id order the rows between two ids are exactly the ids
+        between them, so a row range of any length is one id range found from its two
+        end rows; the same holds for every row in any order. Otherwise the ids of the
+        rows are read (from the cache when every page is loaded, else with one query)
+        and collapsed, so rows hidden by the filter are never caught in a range.
+        """
+        if not self._filter_sql and first == 0 and last == self._row_count - 1 and self._fully_counted:
+            query = self._exec(f"SELECT MIN(id), MAX(id) FROM {self.table_name}")
+            if query is not None and query.next() and not query.isNull(0):
+                return [(query.value(0), query.value(1))]
+            return []
+        if not self._filter_sql and self._order_column == 'id':
+            first_id, last_id = self.row_id(first), self.row_id(last)
+            return [(min(first_id, last_id), max(first_id, last_id))]
+        pages = range(first // self.page_size, last // self.page_size + 1)
+        if all(page in self._pages for page in pages):
+            ids = [self.row_id(row) for row in range(first, last + 1)]
+        else:
+            ids = []
+            where, params = self._where()
+            query = self._exec(f"SELECT id FROM {self.table_name}{where} ORDER BY {self._order_by()} "
+                               f"LIMIT ? OFFSET ?", params + [last - first + 1, first])
+            while query is not None and query.next():
+                ids.append(query.value(0))
+        return collapse_id_ranges(ids)
+
+    def set_filter(self, where: str = '', params: Sequence[Any] = ()) -> None:
+        """
+        Restricts the model to rows matching an SQL condition and reloads.
+
+        Args:
+            where (str): A boolean SQL expression over the table's columns with ``?``
+                placeholders, or '' to show every row.
+            params (Sequence[Any]): The values bound to the placeholders.
+        """
+        self._filter_sql = where
+        self._filter_params = list(params)
+        self.select()
+
+    def is_sortable(self, column: int) -> bool:
+        """
+        Whether sort() accepts ``column``: an index serves its order (see SORTABLE_COLUMNS).
+        """
+        if not 0 <= column < len(self._columns):
+            return False
+        column_name = self._columns[column]
+        return SORT_ALIASES.get(column_name, column_name) in SORTABLE_COLUMNS
+
+    def sort_order(self) -> Tuple[int, Qt.SortOrder]:
+        """
+        Returns the column and direction the rows are currently sorted by.
+        """
+        return self._sort_column, Qt.SortOrder.DescendingOrder if self._descending else Qt.SortOrder.AscendingOrder
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """
+        Re-orders by ``column`` (ties broken by id) and restarts paging from the top.
+
+        A column is_sortable refuses keeps the current order: without an index every
+        page would sort the whole filtered table.
+        """
+        if not self.is_sortable(column):
+            logger.info("Not sorting %s by column %s: no index serves that order", self.table_name, column)
+            return
+        self.beginResetModel()
+        column_name = self._columns[column]
+        self._sort_column = column
+        self._order_column = SORT_ALIASES.get(column_name, column_name)
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self._pages.clear()
+        self._anchors.clear()
+        self.endResetModel()
@@ -0,0 +1,177 @@
+from typing import Callable, List, Tuple
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.aggregates import CREATE_AGGREGATE_TABLE, rebuild_all
+from database.database_utility.altman_schema import ALTMAN_COLUMNS, altman_epoch_sql, normalized_altman_row
+from database.database_utility.sql_executor import SqlExecutor
+
+# Where migration 4 moves rows that share a timestamp with a newer entry, for the user to review.
+DUPLICATES_TABLE: str = 'altman_duplicates'
+CREATE_DUPLICATES_TABLE: str = f"""
+    CREATE TABLE IF NOT EXISTS {DUPLICATES_TABLE} (
+        id INTEGER PRIMARY KEY,
+        {', '.join(f'{column} {"TEXT" if column in ("altman_date", "altman_time") else "INTEGER"}'
+                   for column in ALTMAN_COLUMNS)},
+        altman_timestamp INTEGER,
+        kept_id INTEGER NOT NULL,
+        moved_at INTEGER NOT NULL
+    )"""
+
+
+def _column_exists(executor: SqlExecutor, table: str, column: str) -> bool:
+    """
+    Checks whether ``column`` is already part of ``table``.
+    """
+    return any(row[1] == column for row in executor.fetch_all(f"PRAGMA table_info({table})"))
+
+
+def _add_altman_timestamp(executor: SqlExecutor) -> None:
+    """
+    Migration 1: adds the INTEGER epoch column altman_timestamp and backfills it.
+
+    The column holds seconds since the epoch for altman_date + altman_time, read as
+    UTC the same way SQLite's strftime('%s') does. Existing rows are backfilled in
+    id ranges of MIGRATION_BACKFILL_CHUNK_SIZE, each committed on its own, so a large
+    history never holds one long write lock and an interrupted run resumes cheaply.
+    Rows whose text is not in canonical form ('9:05:00') are rewritten in it with
+    normalized_altman_row, as new entries are on insert; rows that cannot be read
+    at all keep a NULL timestamp and are reported.
+    """
+    if not _column_exists(executor, 'altman_table', 'altman_timestamp'):
+        executor.execute("ALTER TABLE altman_table ADD COLUMN altman_timestamp INTEGER")
+
+    max_id = executor.scalar("SELECT MAX(id) FROM altman_table", default=0)
+    chunk_size: int = tkc.MIGRATION_BACKFILL_CHUNK_SIZE
+    unreadable: int = 0
+    for low in range(1, max_id + 1, chunk_size):
+        executor.begin()
+        try:
+            bounds = (low, low + chunk_size - 1)
+            executor.execute(f"""
+                UPDATE altman_table
+                   SET altman_timestamp = {altman_epoch_sql()}
+                 WHERE id BETWEEN ? AND ? AND altman_timestamp IS NULL""", bounds)
+            for row_id, altman_date, altman_time in executor.fetch_all(
+                    "SELECT id, altman_date, altman_time FROM altman_table "
+                    "WHERE id BETWEEN ? AND ? AND altman_timestamp IS NULL", bounds):
+                try:
+                    (altman_date, altman_time), ts = normalized_altman_row((altman_date, altman_time))
+                except ValueError:
+                    unreadable += 1
+                    continue
+                executor.execute("UPDATE altman_table SET altman_date = ?, altman_time = ?, altman_timestamp = ? "
+                                 "WHERE id = ?", (altman_date, altman_time, ts, row_id))
+            executor.commit()
+        except Exception:
+            executor.rollback()
+            raise
+    if unreadable:
+        logger.error("%s altman_table rows have a date or time that cannot be read; they keep a NULL "
+                     "altman_timestamp and stay out of range queries and aggregates", unreadable)
+
+
+def _index_summary_sort(executor: SqlExecutor) -> None:
+    """
+    Migration 2: indexes (altmans_summary, id), the order the data view's keyset sort
+    on the summary seeks on.
+
+    altman_timestamp gets its index from migration 4, unique. The 0-5 item columns and
+    altman_time get none: they are too unselective for filters to use one, every
+    insert would pay for it, and the data view does not sort on them.
+    """
+    executor.execute("CREATE INDEX IF NOT EXISTS idx_altmans_summary_id ON altman_table(altmans_summary, id)")
+
+
+def _create_altman_aggregates(executor: SqlExecutor) -> None:
+    """
+    Migration 3: creates altman_aggregates and builds it from the existing history.
+
+    From here on DataManager keeps the table current on every write.
+    """
+    executor.execute(CREATE_AGGREGATE_TABLE)
+    executor.begin()
+    try:
+        rebuild_all(executor)
+        executor.commit()
+    except Exception:
+        executor.rollback()
+        raise
+
+
+def _unique_altman_timestamp(executor: SqlExecutor) -> None:
+    """
+    Migration 4: indexes altman_timestamp, unique, one entry per moment.
+
+    A timestamp stored more than once keeps its most recently written row (highest
+    id) in altman_table. The others are moved, not deleted, to DUPLICATES_TABLE
+    with their ids, the id of the row that stayed (kept_id) and the time they were
+    moved. The move is logged as an error naming the table and the database file,
+    and the aggregates are rebuilt. The index serves range lookups and the date
+    sort, and it is the conflict target of UPSERT_ALTMAN_ROW. Rows without a
+    timestamp are left alone; SQLite lets NULLs repeat under a unique index.
+    """
+    columns: str = ', '.join(ALTMAN_COLUMNS)
+    executor.begin()
+    try:
+        executor.execute(CREATE_DUPLICATES_TABLE)
+        moved: int = executor.execute(f"""
+            INSERT INTO {DUPLICATES_TABLE} (id, {columns}, altman_timestamp, kept_id, moved_at)
+            SELECT altman_table.id, {columns}, altman_timestamp, kept.kept_id, CAST(strftime('%s', 'now') AS INTEGER)
+              FROM altman_table
+              JOIN (SELECT altman_timestamp, MAX(id) AS kept_id FROM altman_table
+                     WHERE altman_timestamp IS NOT NULL
+                     GROUP BY altman_timestamp HAVING COUNT(*) > 1) AS kept USING (altman_timestamp)
+             WHERE altman_table.id <> kept.kept_id""")
+        if moved:
+            executor.execute(f"DELETE FROM altman_table WHERE id IN (SELECT id FROM {DUPLICATES_TABLE})")
+            rebuild_all(executor)
+        executor.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_altman_timestamp ON altman_table(altman_timestamp)")
+        executor.commit()
+    except Exception:
+        executor.rollback()
+        raise
+    if moved:
+        database_file = executor.scalar("SELECT file FROM pragma_database_list WHERE name = 'main'", default='')
+        logger.error("Moved %s altman_table rows that share their date and time with a newer entry to the "
+                     "%s table of %s; review them there, nothing was deleted", moved, DUPLICATES_TABLE, database_file)
+
+
+# Ordered (version, description, migration) entries. Append only; never renumber.
+MIGRATIONS: List[Tuple[int, str, Callable[[SqlExecutor], None]]] = [
+    (1, "add altman_timestamp epoch column", _add_altman_timestamp),
+    (2, "index the summary sort", _index_summary_sort),
+    (3, "create altman_aggregates", _create_altman_aggregates),
+    (4, "unique altman_timestamp index", _unique_altman_timestamp),
+]
+
+
+def run_migrations(executor: SqlExecutor) -> int:
+    """
+    Brings the schema up to date, driven by ``PRAGMA user_version``.
+
+    Only migrations newer than the stored version are applied, and the version is
+    bumped after each one, so an up-to-date database costs a single PRAGMA read on
+    launch and an interrupted upgrade picks up where it stopped.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+
+    Returns:
+        int: The schema version after running.
+
+    Raises:
+        RuntimeError: If a migration fails; the version stays at the last good one.
+    """
+    current: int = executor.scalar("PRAGMA user_version", default=0)
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info("Applying migration %s: %s", version, description)
+        try:
+            migration(executor)
+            executor.execute(f"PRAGMA user_version = {version}")
+        except Exception as e:
+            logger.error("Migration %s (%s) failed: %s", version, description, e, exc_info=True)
+            raise RuntimeError(f"Migration {version} failed: {e}") from e
+        current = version
+    return current
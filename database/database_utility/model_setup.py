@@ -1,15 +1,21 @@
+from typing import Any, Callable, List, Optional, Tuple
 from PyQt6 import QtSql
-from PyQt6.QtWidgets import QAbstractItemView
+from PyQt6.QtWidgets import QAbstractItemView, QTableView
 from logger_setup import logger
+from database.database_utility.keyset_table_model import KeysetTableModel, SubmitMethod
 
 
-def create_and_set_model(table_name: str, view_widget: QAbstractItemView) -> QtSql.QSqlTableModel:
+def create_and_set_model(table_name: str, view_widget: QAbstractItemView,
+                         edit_strategy: QtSql.QSqlTableModel.EditStrategy =
+                         QtSql.QSqlTableModel.EditStrategy.OnFieldChange) -> QtSql.QSqlTableModel:
     """
     Creates and sets up a QSqlTableModel for the specified table name and view widget.
 
     Args:
         table_name (str): The name of the table to create the model for.
         view_widget (QAbstractItemView): The view widget to set the model on.
+        edit_strategy (QSqlTableModel.EditStrategy): OnManualSubmit buffers edits until
+            submitAll writes them in one transaction.
 
     Returns:
         QSqlTableModel: The created QSqlTableModel.
@@ -19,7 +25,7 @@ def create_and_set_model(table_name: str, view_widget: QAbstractItemView) -> QtS
     """
     model = QtSql.QSqlTableModel()
     model.setTable(table_name)
-    model.setEditStrategy(QtSql.QSqlTableModel.EditStrategy.OnFieldChange)
+    model.setEditStrategy(edit_strategy)
 
     if not model.select():
         error_message = f"Error selecting data from table: {table_name}, {model.lastError().text()}"
@@ -28,3 +34,58 @@ def create_and_set_model(table_name: str, view_widget: QAbstractItemView) -> QtS
 
     view_widget.setModel(model)
     return model
+
+
+def create_and_set_keyset_model(table_name: str, view_widget: QAbstractItemView,
+                                db: QtSql.QSqlDatabase,
+                                update_method: Optional[Callable[[int, str, Any], Any]] = None,
+                                delete_method: Optional[Callable[[List[Tuple[int, int]]], Any]] = None,
+                                submit_method: Optional[SubmitMethod] = None,
+                                edit_strategy: QtSql.QSqlTableModel.EditStrategy =
+                                QtSql.QSqlTableModel.EditStrategy.OnFieldChange
+                                ) -> KeysetTableModel:
+    """
+    Creates a KeysetTableModel for the specified table and sets it on the view widget.
+
+    Unlike create_and_set_model, nothing beyond the row count is read up front; rows
+    are paged in as the view scrolls. On a table view, a header click on a column the
+    model cannot sort leaves the sort indicator where the rows are actually sorted.
+
+    Args:
+        table_name (str): The name of the table to create the model for.
+        view_widget (QAbstractItemView): The view widget to set the model on.
+        db (QSqlDatabase): The open connection the model reads from.
+        update_method (Optional[Callable]): Writes one edited cell (row id, column, value).
+        delete_method (Optional[Callable]): Deletes rows by inclusive id ranges.
+        submit_method (Optional[SubmitMethod]): Writes a batch of buffered edits (see
+            KeysetTableModel.submitAll).
+        edit_strategy (QSqlTableModel.EditStrategy): OnManualSubmit buffers edits for
+            submit_method; anything else writes each through update_method.
+
+    Returns:
+        KeysetTableModel: The created model.
+
+    Raises:
+        RuntimeError: If the table has no columns (missing table or closed connection).
+    """
+    model = KeysetTableModel(table_name, db, update_method=update_method, delete_method=delete_method,
+                             submit_method=submit_method)
+    model.setEditStrategy(edit_strategy)
+    if model.columnCount() == 0:
+        error_message = f"Error selecting data from table: {table_name}, {db.lastError().text()}"
+        logger.error(error_message)
+        raise RuntimeError(error_message)
+    model.select()
+    view_widget.setModel(model)
+    if isinstance(view_widget, QTableView):
+        header = view_widget.horizontalHeader()
+
+        def keep_sort_indicator(column: int, order) -> None:
+            if not model.is_sortable(column):
+                # blocked, or the view would sort again on the indicator it is handed back
+                header.blockSignals(True)
+                header.setSortIndicator(*model.sort_order())
+                header.blockSignals(False)
+
+        header.sortIndicatorChanged.connect(keep_sort_indicator)
+    return model
@@ -0,0 +1,63 @@
+from typing import Dict, Optional, Sequence, Union
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.sql_executor import SqlExecutor
+
+# Pragmas a profile may set, in the order they are applied.
+PROFILE_PRAGMAS = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout')
+# The per-connection subset a read-only connection applies; the journal mode belongs to the
+# database file and is set by its writer, and synchronous only affects commits.
+READER_PRAGMAS = ('mmap_size', 'cache_size', 'temp_store', 'busy_timeout')
+
+
+def apply_performance_profile(executor: SqlExecutor, profile_name: Optional[str] = None,
+                              pragmas: Sequence[str] = PROFILE_PRAGMAS) -> str:
+    """
+    Applies a performance profile from tracker_config to an open connection.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+        profile_name (Optional[str]): A key of tkc.DB_PERFORMANCE_PROFILES. Defaults to
+            tkc.DB_PERFORMANCE_PROFILE.
+        pragmas (Sequence[str]): The profile pragmas to apply; READER_PRAGMAS for
+            read-only connections.
+
+    Returns:
+        str: The name of the profile that was applied. Unknown names fall back to 'balanced'.
+    """
+    profile_name = profile_name or tkc.DB_PERFORMANCE_PROFILE
+    if profile_name not in tkc.DB_PERFORMANCE_PROFILES:
+        logger.error("Unknown database performance profile '%s', using 'balanced'", profile_name)
+        profile_name = 'balanced'
+    profile: Dict[str, Union[str, int]] = tkc.DB_PERFORMANCE_PROFILES[profile_name]
+
+    for pragma in pragmas:
+        if pragma in profile:
+            try:
+                # PRAGMA assignments may return a row (journal_mode does), so fetch rather than execute
+                executor.fetch_all(f"PRAGMA {pragma} = {profile[pragma]}")
+            except RuntimeError as e:
+                logger.error("Error applying PRAGMA %s: %s", pragma, e)
+    logger.info("Database performance profile '%s' applied", profile_name)
+    return profile_name
+
+
+def read_pragmas(executor: SqlExecutor) -> Dict[str, Union[str, int]]:
+    """
+    Reads back the current value of every profile pragma on a connection.
+
+    Args:
+        executor (SqlExecutor): The open connection.
+
+    Returns:
+        Dict[str, Union[str, int]]: The live pragma values keyed by pragma name.
+    """
+    values: Dict[str, Union[str, int]] = {}
+    for pragma in PROFILE_PRAGMAS:
+        try:
+            row = executor.fetch_one(f"PRAGMA {pragma}")
+        except RuntimeError:
+            continue
+        if row is not None:
+            values[pragma] = row[0]
+    return values
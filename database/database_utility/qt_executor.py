@@ -0,0 +1,126 @@
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery
+from database.database_utility.statement_registry import StatementRegistry
+
+
+class QtSqlExecutor:
+    """
+    Runs SQL on a QSqlDatabase connection.
+
+    The Qt implementation of sql_executor.SqlExecutor, so schema migrations,
+    aggregate maintenance and exports are written once for Qt and stdlib connections.
+
+    Given the connection's StatementRegistry, statements with bind values are prepared
+    once and reused; statements without (DDL, PRAGMAs) are run as they come.
+
+    Args:
+        db (QSqlDatabase): The open database connection.
+        statements (Optional[StatementRegistry]): The connection's prepared statements.
+    """
+
+    def __init__(self, db: QSqlDatabase, statements: Optional[StatementRegistry] = None) -> None:
+        self.db: QSqlDatabase = db
+        self.statements: Optional[StatementRegistry] = statements
+
+    def _run(self, sql: str, params: Sequence[Any]) -> QSqlQuery:
+        if params and self.statements is not None:
+            return self.statements.run(sql, params)
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        if params:
+            query.prepare(sql)
+            for value in params:
+                query.addBindValue(value)
+            ok = query.exec()
+        else:
+            ok = query.exec(sql)
+        if not ok:
+            raise RuntimeError(f"{sql.split()[0]} failed: {query.lastError().text()}")
+        return query
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """
+        Executes one statement and returns the number of rows it changed.
+
+        Raises:
+            RuntimeError: If the statement fails.
+        """
+        query = self._run(sql, params)
+        affected = query.numRowsAffected()
+        query.finish()
+        return affected
+
+    def execute_many(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Executes one statement for every row of bind values with a single execBatch.
+
+        Raises:
+            RuntimeError: If the batch fails.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        if self.statements is not None:
+            query = self.statements.bind(sql, [list(column) for column in zip(*rows)])
+        else:
+            query = QSqlQuery(self.db)
+            query.prepare(sql)
+            for column in zip(*rows):
+                query.addBindValue(list(column))
+        if not query.execBatch():
+            raise RuntimeError(f"{sql.split()[0]} failed: {query.lastError().text()}")
+        return len(rows)
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Returns every row of a query as tuples; SQL NULL is None.
+
+        Raises:
+            RuntimeError: If the query fails.
+        """
+        query = self._run(sql, params)
+        columns = range(query.record().count())
+        read = query.value
+        rows: List[Tuple[Any, ...]] = []
+        while query.next():
+            row = tuple(map(read, columns))
+            if '' in row:  # the driver hands NULL back as ''; only then tell the two apart
+                row = tuple(None if query.isNull(i) else cell for i, cell in enumerate(row))
+            rows.append(row)
+        query.finish()
+        return rows
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the first row of a query, or None.
+
+        Raises:
+            RuntimeError: If the query fails.
+        """
+        query = self._run(sql, params)
+        row = None
+        if query.next():
+            row = tuple(None if query.isNull(i) else query.value(i) for i in range(query.record().count()))
+        query.finish()
+        return row
+
+    def scalar(self, sql: str, params: Sequence[Any] = (), default: Any = None) -> Any:
+        """
+        Returns the first column of the first row, or ``default`` when there is none or it is NULL.
+        """
+        row = self.fetch_one(sql, params)
+        return default if row is None or row[0] is None else row[0]
+
+    def begin(self) -> None:
+        if not self.db.transaction():
+            raise RuntimeError(f"BEGIN failed: {self.db.lastError().text()}")
+
+    def commit(self) -> None:
+        if not self.db.commit():
+            raise RuntimeError(f"COMMIT failed: {self.db.lastError().text()}")
+
+    def rollback(self) -> None:
+        self.db.rollback()
+
+    def last_insert_id(self) -> int:
+        return self.scalar("SELECT last_insert_rowid()", default=0)
@@ -0,0 +1,118 @@
+"""
+The small SQL interface migrations, aggregates and exports are written against.
+
+SqlExecutor is implemented by QtSqlExecutor (qt_executor.py) for QSqlDatabase
+connections and by SqliteExecutor below for stdlib sqlite3 connections. This
+module does not import Qt.
+"""
+import sqlite3
+from typing import Any, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+
+class SqlExecutor(Protocol):
+    """
+    Executes SQL on one open connection; failures raise RuntimeError.
+    """
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int: ...
+
+    def execute_many(self, sql: str, rows: Iterable[Sequence[Any]]) -> int: ...
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]: ...
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]: ...
+
+    def scalar(self, sql: str, params: Sequence[Any] = (), default: Any = None) -> Any: ...
+
+    def begin(self) -> None: ...
+
+    def commit(self) -> None: ...
+
+    def rollback(self) -> None: ...
+
+    def last_insert_id(self) -> int: ...
+
+
+class SqliteExecutor:
+    """
+    Runs SQL on a stdlib sqlite3 connection.
+
+    The stdlib implementation of SqlExecutor, so schema migrations, aggregate
+    maintenance and exports run unchanged without Qt. The connection is put in
+    autocommit mode; transactions are explicit through begin / commit / rollback.
+
+    Args:
+        connection (sqlite3.Connection): The open connection.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection: sqlite3.Connection = connection
+        self.connection.isolation_level = None
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """
+        Executes one statement and returns the number of rows it changed.
+
+        Raises:
+            RuntimeError: If the statement fails.
+        """
+        try:
+            return self.connection.execute(sql, tuple(params)).rowcount
+        except sqlite3.Error as e:
+            raise RuntimeError(f"{sql.split()[0]} failed: {e}") from e
+
+    def execute_many(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Executes one statement once per row of bind values.
+
+        Raises:
+            RuntimeError: If any execution fails.
+        """
+        try:
+            return self.connection.executemany(sql, rows).rowcount
+        except sqlite3.Error as e:
+            raise RuntimeError(f"{sql.split()[0]} failed: {e}") from e
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Returns every row of a query as tuples; SQL NULL is None.
+
+        Raises:
+            RuntimeError: If the query fails.
+        """
+        try:
+            return self.connection.execute(sql, tuple(params)).fetchall()
+        except sqlite3.Error as e:
+            raise RuntimeError(f"{sql.split()[0]} failed: {e}") from e
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        """
+        Returns the first row of a query, or None.
+
+        Raises:
+            RuntimeError: If the query fails.
+        """
+        try:
+            return self.connection.execute(sql, tuple(params)).fetchone()
+        except sqlite3.Error as e:
+            raise RuntimeError(f"{sql.split()[0]} failed: {e}") from e
+
+    def scalar(self, sql: str, params: Sequence[Any] = (), default: Any = None) -> Any:
+        """
+        Returns the first column of the first row, or ``default`` when there is none or it is NULL.
+        """
+        row = self.fetch_one(sql, params)
+        return default if row is None or row[0] is None else row[0]
+
+    def begin(self) -> None:
+        self.execute("BEGIN")
+
+    def commit(self) -> None:
+        self.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+
+    def last_insert_id(self) -> int:
+        return self.scalar("SELECT last_insert_rowid()", default=0)
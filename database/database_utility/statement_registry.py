@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Any, Sequence, Tuple
+
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery
+
+import tracker_config as tkc
+
+
+class StatementRegistry:
+    """
+    Prepares each SQL statement once per connection and keeps it.
+
+    A statement is looked up by its SQL text. The first lookup prepares it and counts
+    its placeholders; later ones bind and exec the same QSqlQuery, so a call costs a
+    dictionary hit instead of a prepare and a scan of the SQL. The number of values
+    is checked against that count before anything is bound.
+
+    At most ``max_statements`` statements are kept, least recently used dropped
+    first, since id-range deletes build a WHERE clause per shape of selection.
+
+    Queries are forward-only and shared: read a result to the end (or finish() it)
+    before running the same SQL again. Get a connection's registry from
+    ConnectionManager.statements, which closes it before the connection closes.
+
+    Args:
+        db (QSqlDatabase): The open database connection.
+        max_statements (int): The number of prepared statements kept.
+    """
+
+    def __init__(self, db: QSqlDatabase, max_statements: int = tkc.STATEMENT_CACHE_SIZE) -> None:
+        self.db: QSqlDatabase = db
+        self.max_statements: int = max_statements
+        # SQL text -> (prepared query, placeholder count), most recently used last
+        self._statements: 'OrderedDict[str, Tuple[QSqlQuery, int]]' = OrderedDict()
+
+    def prepare(self, sql: str) -> Tuple[QSqlQuery, int]:
+        """
+        Returns the prepared query for ``sql`` and its number of placeholders.
+
+        Raises:
+            RuntimeError: If the statement does not prepare.
+        """
+        entry = self._statements.get(sql)
+        if entry is not None:
+            self._statements.move_to_end(sql)
+            return entry
+        query = QSqlQuery(self.db)
+        query.setForwardOnly(True)
+        if not query.prepare(sql):
+            raise RuntimeError(f"{sql.split()[0]} failed to prepare: {query.lastError().text()}")
+        entry = (query, sql.count('?'))
+        self._statements[sql] = entry
+        if len(self._statements) > self.max_statements:
+            evicted, _ = self._statements.popitem(last=False)[1]
+            evicted.finish()
+        return entry
+
+    def bind(self, sql: str, values: Sequence[Any]) -> QSqlQuery:
+        """
+        Binds ``values`` to the prepared ``sql`` without executing it.
+
+        A value may be a list, one entry per row, for QSqlQuery.execBatch.
+
+        Raises:
+            ValueError: If the number of values does not match the placeholders.
+            RuntimeError: If the statement does not prepare.
+        """
+        query, arity = self.prepare(sql)
+        if len(values) != arity:
+            raise ValueError(f"{sql.split()[0]} expects {arity} bind values, got {len(values)}")
+        for position, value in enumerate(values):
+            query.bindValue(position, value)
+        return query
+
+    def run(self, sql: str, values: Sequence[Any] = ()) -> QSqlQuery:
+        """
+        Binds ``values`` to the prepared ``sql`` and executes it.
+
+        Returns:
+            QSqlQuery: The executed query, positioned before its first row.
+
+        Raises:
+            ValueError: If the number of values does not match the placeholders.
+            RuntimeError: If the statement does not prepare or fails.
+        """
+        query = self.bind(sql, values)
+        if not query.exec():
+            raise RuntimeError(f"{sql.split()[0]} failed: {query.lastError().text()}")
+        return query
+
+    def close(self) -> None:
+        """
+        Finishes and drops every prepared statement and lets go of the connection.
+        """
+        for query, _ in self._statements.values():
+            query.finish()
+        self._statements.clear()
+        self.db = QSqlDatabase()
+
+    def __len__(self) -> int:
+        return len(self._statements)
@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from PyQt6.QtCore import QObject, QThread, Qt, pyqtSignal, pyqtSlot
+from logger_setup import logger
+from database.database_manager import DataManager, target_db_path
+
+WORKER_CONNECTION_NAME: str = 'altman_worker'
+READER_CONNECTION_NAME: str = 'altman_reader'
+
+
+class DatabaseWorker(QObject):
+    """
+    Runs DataManager calls on a dedicated thread with its own named connection.
+
+    The worker owns its DataManager, which is created on the worker thread so the
+    QSqlDatabase connection never crosses threads. Jobs arrive through run_job and
+    complete through job_finished / job_failed, in submission order. Long jobs that
+    take a ``progress`` callback report through job_progress. A read-only worker
+    opens a reader connection (see ConnectionManager) and leaves the schema alone.
+    """
+    opened = pyqtSignal()
+    job_finished = pyqtSignal(int, object)
+    job_failed = pyqtSignal(int, str)
+    job_progress = pyqtSignal(int, int, int)
+
+    def __init__(self, db_name: str = target_db_path,
+                 connection_name: str = WORKER_CONNECTION_NAME,
+                 read_only: bool = False) -> None:
+        super().__init__()
+        self.db_name: str = db_name
+        self.connection_name: str = connection_name
+        self.read_only: bool = read_only
+        self.data_manager: Optional[DataManager] = None
+
+    @pyqtSlot()
+    def open(self) -> None:
+        """
+        Opens the worker's connection; runs on the worker thread.
+        """
+        if self.data_manager is None:
+            self.data_manager = DataManager(self.db_name, connection_name=self.connection_name,
+                                            read_only=self.read_only)
+            self.opened.emit()
+
+    @pyqtSlot(int, str, object, bool)
+    def run_job(self, job_id: int, method_name: str, args: Tuple[Any, ...], report_progress: bool) -> None:
+        """
+        Calls ``DataManager.<method_name>(*args)`` and reports the outcome.
+
+        Args:
+            job_id (int): The id handed out by DatabaseThread.submit.
+            method_name (str): The DataManager method to call.
+            args (Tuple[Any, ...]): The positional arguments for the call.
+            report_progress (bool): Pass the method a ``progress(done, total)`` callback
+                that emits job_progress.
+        """
+        try:
+            self.open()
+            kwargs: Dict[str, Any] = {}
+            if report_progress:
+                kwargs['progress'] = lambda done, total: self.job_progress.emit(job_id, done, total)
+            result = getattr(self.data_manager, method_name)(*args, **kwargs)
+            self.job_finished.emit(job_id, result)
+        except Exception as e:
+            logger.error("Database job %s failed: %s", method_name, e, exc_info=True)
+            self.job_failed.emit(job_id, str(e))
+
+    @pyqtSlot()
+    def close(self) -> None:
+        """
+        Closes and removes the worker's connection; runs on the worker thread.
+        """
+        if self.data_manager is not None:
+            self.data_manager.close_database()
+            self.data_manager = None
+
+
+class DatabaseThread(QObject):
+    """
+    GUI-side handle for a DatabaseWorker running on its own QThread.
+
+    submit() queues a DataManager call and returns immediately; the optional
+    callbacks are invoked on the thread that owns this object (the GUI thread)
+    once the worker reports back. DataManager methods log a failure and return
+    None or False rather than raise; given ``failed_if``, such a result goes to
+    on_error like an exception would.
+
+    A read-only thread runs reads beside the writer's thread instead of queueing
+    behind its writes. Given ``start_after``, it starts once that thread's worker
+    has opened (and so created and migrated the tables); jobs submitted before then
+    wait in its queue.
+    """
+    opened = pyqtSignal()
+    job_requested = pyqtSignal(int, str, object, bool)
+    shutdown_requested = pyqtSignal()
+
+    def __init__(self, db_name: str = target_db_path,
+                 connection_name: str = WORKER_CONNECTION_NAME,
+                 parent: Optional[QObject] = None,
+                 read_only: bool = False,
+                 start_after: Optional['DatabaseThread'] = None) -> None:
+        super().__init__(parent)
+        self.is_open: bool = False
+        self._next_job_id: int = 0
+        # job id -> (method name, on_done, on_error, failed_if)
+        self._callbacks: Dict[int, Tuple[str, Optional[Callable[[Any], None]],
+                                         Optional[Callable[[str], None]],
+                                         Optional[Callable[[Any], bool]]]] = {}
+        self._progress_callbacks: Dict[int, Callable[[int, int], None]] = {}
+        self.thread: QThread = QThread()
+        self.thread.setObjectName(connection_name)
+        self.worker: DatabaseWorker = DatabaseWorker(db_name, connection_name, read_only)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.open)
+        self.worker.opened.connect(self._on_opened)
+        self.job_requested.connect(self.worker.run_job)
+        self.shutdown_requested.connect(self.worker.close,
+                                        Qt.ConnectionType.BlockingQueuedConnection)
+        self.worker.job_finished.connect(self._on_job_finished)
+        self.worker.job_failed.connect(self._on_job_failed)
+        self.worker.job_progress.connect(self._on_job_progress)
+        if start_after is None or start_after.is_open:
+            self.thread.start()
+        else:
+            start_after.opened.connect(self.thread.start)
+
+    def submit(self, method_name: str, *args: Any,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[str], None]] = None,
+               on_progress: Optional[Callable[[int, int], None]] = None,
+               failed_if: Optional[Callable[[Any], bool]] = None) -> int:
+        """
+        Queues ``DataManager.<method_name>(*args)`` on the worker thread.
+
+        Args:
+            method_name (str): The DataManager method to call.
+            *args (Any): The positional arguments for the call.
+            on_done (Optional[Callable[[Any], None]]): Called with the method's return value.
+            on_error (Optional[Callable[[str], None]]): Called with the error message.
+            on_progress (Optional[Callable[[int, int], None]]): Called with (done, total) as
+                the job advances; the method must accept a ``progress`` keyword.
+            failed_if (Optional[Callable[[Any], bool]]): Tells a failed return value apart,
+                e.g. ``lambda row_id: row_id is None``; such a result goes to on_error.
+
+        Returns:
+            int: The job id.
+        """
+        self._next_job_id += 1
+        job_id: int = self._next_job_id
+        if on_done is not None or on_error is not None:
+            self._callbacks[job_id] = (method_name, on_done, on_error, failed_if)
+        if on_progress is not None:
+            self._progress_callbacks[job_id] = on_progress
+        self.job_requested.emit(job_id, method_name, args, on_progress is not None)
+        return job_id
+
+    def _on_opened(self) -> None:
+        self.is_open = True
+        self.opened.emit()
+
+    def _on_job_progress(self, job_id: int, done: int, total: int) -> None:
+        on_progress = self._progress_callbacks.get(job_id)
+        if on_progress is not None:
+            try:
+                on_progress(done, total)
+            except Exception as e:
+                logger.error("Error in database job progress callback: %s", e, exc_info=True)
+
+    def _on_job_finished(self, job_id: int, result: Any) -> None:
+        method_name, on_done, on_error, failed_if = self._callbacks.get(job_id, ('', None, None, None))
+        if failed_if is not None and failed_if(result):
+            self._on_job_failed(job_id, f"{method_name} failed, see the log for details")
+            return
+        self._progress_callbacks.pop(job_id, None)
+        self._callbacks.pop(job_id, None)
+        if on_done is not None:
+            try:
+                on_done(result)
+            except Exception as e:
+                logger.error("Error in database job callback: %s", e, exc_info=True)
+
+    def _on_job_failed(self, job_id: int, message: str) -> None:
+        self._progress_callbacks.pop(job_id, None)
+        _, _, on_error, _ = self._callbacks.pop(job_id, ('', None, None, None))
+        if on_error is not None:
+            try:
+                on_error(message)
+            except Exception as e:
+                logger.error("Error in database job error callback: %s", e, exc_info=True)
+
+    def stop(self) -> None:
+        """
+        Drains queued jobs, closes the worker's connection and stops the thread.
+        """
+        if self.thread.isRunning():
+            self.shutdown_requested.emit()
+            self.thread.quit()
+            self.thread.wait()
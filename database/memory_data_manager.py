@@ -0,0 +1,230 @@
+import bisect
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.aggregates import AGGREGATE_METRICS, GRANULARITIES
+from database.database_utility.altman_schema import ALTMAN_COLUMNS, normalized_altman_row
+
+# What SQLite reports for a second row at a stored altman_timestamp, matched here.
+UNIQUE_TIMESTAMP_ERROR: str = "UNIQUE constraint failed: altman_table.altman_timestamp"
+# Position of each aggregated column within a stored row (ALTMAN_ROW_COLUMNS order).
+_METRIC_INDEXES: Tuple[int, ...] = tuple(1 + ALTMAN_COLUMNS.index(column) for column in AGGREGATE_METRICS.values())
+
+
+def _bucket(granularity: str, ts: int) -> Tuple[int, int]:
+    """
+    Returns the (start, end) epoch seconds of the bucket holding ``ts``, as GRANULARITIES computes them in SQL.
+    """
+    if granularity == 'day':
+        start = ts // 86400 * 86400
+        return start, start + 86400
+    if granularity == 'week':
+        start = ((ts // 86400 + 3) // 7 * 7 - 3) * 86400
+        return start, start + 604800
+    month = datetime.fromtimestamp(ts, tz=timezone.utc).replace(day=1, hour=0, minute=0, second=0)
+    following = month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+    return int(month.timestamp()), int(following.timestamp())
+
+
+class MemoryDataManager:
+    """
+    The in-memory storage backend (see database.altman_storage).
+
+    A test double, not a storage engine. Rows live in a dict keyed by id plus a
+    sorted (altman_timestamp, id) list, so range queries are a bisect, but every
+    insert (bisect.insort) and delete (list del) shifts that list: O(n) per row,
+    quadratic for a bulk load. Aggregates are recomputed from the rows on each call.
+    Fine for unit tests and small throwaway sessions; everything is gone once the
+    object is. Use the sqlite backend for real data.
+    """
+
+    def __init__(self) -> None:
+        self.rows: Dict[int, Tuple[Any, ...]] = {}
+        self._by_time: List[Tuple[int, int]] = []
+        self._next_id: int = 1
+
+    def insert_into_altman_table(self, altman_date: str, altman_time: str, altmans_sleep: int,
+                                 altmans_speech: int, altmans_activity: int, altmans_cheer: int,
+                                 altmans_confidence: int, altmans_summary: int,
+                                 upsert: bool = False) -> Optional[int]:
+        """
+        Inserts one row; with ``upsert`` a row already stored at the same date and time is replaced.
+
+        Returns:
+            Optional[int]: The id of the inserted (or replaced) row, or None if the timestamp is
+            taken or the date or time cannot be read.
+        """
+        try:
+            row, ts = normalized_altman_row((altman_date, altman_time, altmans_sleep, altmans_speech,
+                                             altmans_activity, altmans_cheer, altmans_confidence, altmans_summary))
+        except ValueError as e:
+            logger.error("Error during data insertion: altman_table %s", e)
+            return None
+        if not upsert and self._find(ts) is not None:
+            logger.error("Error during data insertion: altman_table %s", UNIQUE_TIMESTAMP_ERROR)
+            return None
+        return self._store(row, ts)
+
+    def insert_many_into_altman_table(self,
+                                      rows: Iterable[Sequence[Union[str, int]]],
+                                      chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                                      atomic: bool = False,
+                                      upsert: bool = False
+                                      ) -> Tuple[int, List[Tuple[int, Sequence[Union[str, int]], str]]]:
+        """
+        Inserts many rows, as DataManager.insert_many_into_altman_table.
+
+        Only rows with the wrong number of values, a date or time that cannot be read,
+        or (without ``upsert``) a timestamp already taken can fail. With ``atomic`` any failure leaves the
+        store untouched. ``chunk_size`` is accepted for interface compatibility and
+        ignored.
+
+        Returns:
+            Tuple[int, List[Tuple[int, Sequence, str]]]: The number of rows written and the
+            failed rows as (row index, row, error message) tuples.
+        """
+        column_count: int = len(ALTMAN_COLUMNS)
+        accepted: List[Tuple[Sequence[Union[str, int]], int]] = []
+        failed: List[Tuple[int, Sequence[Union[str, int]], str]] = []
+        taken: Set[int] = set()
+        for index, row in enumerate(rows):
+            if len(row) != column_count:
+                failed.append((index, row, f"Expected {column_count} values, got {len(row)}"))
+                continue
+            try:
+                stored, ts = normalized_altman_row(row)
+            except ValueError as e:
+                failed.append((index, row, str(e)))
+                continue
+            if not upsert and (ts in taken or self._find(ts) is not None):
+                failed.append((index, row, UNIQUE_TIMESTAMP_ERROR))
+                continue
+            taken.add(ts)
+            accepted.append((stored, ts))
+        if atomic and failed:
+            logger.error("Bulk insertion: altman_table rolled back, %s rows failed", len(failed))
+            return 0, failed
+        for row, ts in accepted:
+            self._store(row, ts)
+        if failed:
+            logger.error("Bulk insertion: altman_table skipped %s failed rows", len(failed))
+        return len(accepted), failed
+
+    def _find(self, ts: Optional[int]) -> Optional[int]:
+        """
+        Returns the id of the row stored at altman_timestamp ``ts``, if any.
+        """
+        if ts is None:
+            return None
+        position = bisect.bisect_left(self._by_time, (ts, -1))
+        if position < len(self._by_time) and self._by_time[position][0] == ts:
+            return self._by_time[position][1]
+        return None
+
+    def _store(self, row: Sequence[Union[str, int]], ts: int) -> int:
+        """
+        Stores a normalized row at altman_timestamp ``ts``, replacing the one already there, and returns its id.
+        """
+        row_id = self._find(ts)
+        if row_id is not None:
+            self.rows[row_id] = (row_id, *row, ts)
+            return row_id
+        row_id = self._next_id
+        self._next_id += 1
+        self.rows[row_id] = (row_id, *row, ts)
+        bisect.insort(self._by_time, (ts, row_id))
+        return row_id
+
+    def query_altman_range(self, start_ts: int, end_ts: int,
+                           limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """
+        Reads the rows with start_ts <= altman_timestamp < end_ts, oldest first.
+
+        Returns:
+            List[Tuple[Any, ...]]: Rows in ALTMAN_ROW_COLUMNS order.
+        """
+        low = bisect.bisect_left(self._by_time, (int(start_ts), -1))
+        high = bisect.bisect_left(self._by_time, (int(end_ts), -1))
+        if limit is not None:
+            high = min(high, low + max(0, int(limit)))
+        return [self.rows[row_id] for _, row_id in self._by_time[low:high]]
+
+    def delete_altman_ids(self, ids: Iterable[int]) -> int:
+        """
+        Deletes the rows with the given ids.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        deleted: int = 0
+        for row_id in set(ids):
+            row = self.rows.pop(row_id, None)
+            if row is None:
+                continue
+            deleted += 1
+            if row[-1] is not None:
+                del self._by_time[bisect.bisect_left(self._by_time, (row[-1], row_id))]
+        return deleted
+
+    def query_altman_aggregates(self, granularity: str, start_ts: Optional[int] = None,
+                                end_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Computes daily, weekly or monthly means and maxima, see DataManager.query_altman_aggregates.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per non-empty bucket, oldest first. Empty on error.
+        """
+        if granularity not in GRANULARITIES:
+            logger.error("ValueError altman_aggregates: Unknown granularity: %s", granularity)
+            return []
+        # only rows in buckets overlapping [start_ts, end_ts) can contribute
+        low = 0 if start_ts is None else bisect.bisect_left(self._by_time, (_bucket(granularity, start_ts)[0], -1))
+        high = (len(self._by_time) if end_ts is None
+                else bisect.bisect_left(self._by_time, (_bucket(granularity, end_ts)[1], -1)))
+        buckets: Dict[int, List[Any]] = {}
+        for ts, row_id in self._by_time[low:high]:
+            start, end = _bucket(granularity, ts)
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = [end, 0, [0] * len(_METRIC_INDEXES), [None] * len(_METRIC_INDEXES)]
+            row = self.rows[row_id]
+            bucket[1] += 1
+            for position, index in enumerate(_METRIC_INDEXES):
+                value = row[index]
+                if value is not None:
+                    bucket[2][position] += value
+                    if bucket[3][position] is None or value > bucket[3][position]:
+                        bucket[3][position] = value
+        results: List[Dict[str, Any]] = []
+        for start, (end, count, sums, maxima) in buckets.items():
+            if (start_ts is not None and end <= start_ts) or (end_ts is not None and start >= end_ts):
+                continue
+            result: Dict[str, Any] = {'bucket_start': start, 'bucket_end': end, 'entry_count': count}
+            for position, metric in enumerate(AGGREGATE_METRICS):
+                result[f"mean_{metric}"] = sums[position] / count
+                result[f"max_{metric}"] = maxima[position]
+            results.append(result)
+        return results
+
+    def altman_timestamp_bounds(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the first and last altman_timestamp, or None when there are none.
+        """
+        if not self._by_time:
+            return None
+        return self._by_time[0][0], self._by_time[-1][0]
+
+    def altman_row_count(self) -> int:
+        """
+        Returns the number of stored rows.
+        """
+        return len(self.rows)
+
+    def close_database(self) -> None:
+        """
+        Drops every row.
+        """
+        self.rows.clear()
+        self._by_time.clear()
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility import aggregates
+from database.altman_storage import insert_altman_rows, query_altman_range
+from database.database_utility.altman_schema import (
+    CREATE_ALTMAN_TABLE, collapse_id_ranges, id_range_clauses, normalized_altman_row)
+from database.database_utility.migrations import run_migrations
+from database.database_utility.performance_profile import apply_performance_profile
+from database.database_utility.sql_executor import SqliteExecutor
+from utility.instrumentation import count, timed
+
+target_db_path: str = os.path.join(os.path.expanduser('~'), tkc.DB_NAME)  # Database Name
+
+
+class SqliteDataManager:
+    """
+    The stdlib sqlite3 storage backend (see database.altman_storage).
+
+    For headless use (the command line, cron jobs): it shares the schema,
+    migrations, aggregate maintenance, importer and exporter with DataManager but
+    never imports PyQt6, and so has no change bus; a running GUI sees these writes
+    on its next reload.
+
+    Args:
+        db_name (str): The path to the SQLite database file.
+        profile_name (Optional[str]): The performance profile to apply; defaults to
+            tkc.DB_PERFORMANCE_PROFILE.
+
+    Raises:
+        RuntimeError: If the database cannot be opened or migrated.
+    """
+
+    def __init__(self, db_name: str = target_db_path, profile_name: Optional[str] = None) -> None:
+        self.db_name: str = db_name
+        try:
+            self.connection: sqlite3.Connection = sqlite3.connect(db_name)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Unable to open database {db_name}: {e}") from e
+        self.executor: SqliteExecutor = SqliteExecutor(self.connection)
+        self.performance_profile: str = apply_performance_profile(self.executor, profile_name)
+        self.executor.execute(CREATE_ALTMAN_TABLE)
+        run_migrations(self.executor)
+
+    def insert_into_altman_table(self, altman_date: str, altman_time: str, altmans_sleep: int,
+                                 altmans_speech: int, altmans_activity: int, altmans_cheer: int,
+                                 altmans_confidence: int, altmans_summary: int,
+                                 upsert: bool = False) -> Optional[int]:
+        """
+        Inserts one row and folds it into altman_aggregates.
+
+        With ``upsert`` a row already stored at the same date and time is replaced.
+
+        Returns:
+            Optional[int]: The id of the inserted (or replaced) row, or None if the insert failed.
+        """
+        row = (altman_date, altman_time, altmans_sleep, altmans_speech, altmans_activity,
+               altmans_cheer, altmans_confidence, altmans_summary)
+        try:
+            written, failed = self.insert_many_into_altman_table([row], atomic=True, upsert=upsert)
+        except RuntimeError:
+            return None  # logged by insert_many_into_altman_table
+        if not written:
+            return None
+        if upsert:
+            _, ts = normalized_altman_row(row)
+            return self.executor.scalar("SELECT id FROM altman_table WHERE altman_timestamp = ?", (ts,))
+        return self.executor.last_insert_id()
+
+    @timed('altman_bulk_insert_seconds')
+    def insert_many_into_altman_table(self,
+                                      rows: Iterable[Sequence[Union[str, int]]],
+                                      chunk_size: int = tkc.BULK_INSERT_CHUNK_SIZE,
+                                      atomic: bool = False,
+                                      upsert: bool = False
+                                      ) -> Tuple[int, List[Tuple[int, Sequence[Union[str, int]], str]]]:
+        """
+        Inserts many rows inside a single transaction, as DataManager.insert_many_into_altman_table.
+
+        Both backends write through altman_storage.insert_altman_rows: chunks go through
+        executemany under a savepoint and a failing chunk is retried row by row to
+        isolate the bad rows. With ``atomic`` any failed row rolls the whole call back.
+        With ``upsert`` rows at a date and time already stored replace them.
+
+        Args:
+            rows (Iterable[Sequence[Union[str, int]]]): Rows whose values follow ALTMAN_COLUMNS order.
+            chunk_size (int): Rows per executemany call.
+            atomic (bool): Roll everything back if any row fails.
+            upsert (bool): Replace stored rows at the same date and time.
+
+        Returns:
+            Tuple[int, List[Tuple[int, Sequence, str]]]: The number of rows written (for an
+            upsert, including rows already stored as given) and the failed rows as
+            (row index, row, error message) tuples.
+
+        Raises:
+            RuntimeError: If the transaction could not begin or commit, or the call failed
+                for any reason other than refused rows; nothing was written.
+        """
+        written, failed, _, _, _ = insert_altman_rows(self.executor, rows, chunk_size, atomic, upsert)
+        return written, failed
+
+    def query_altman_aggregates(self, granularity: str, start_ts: Optional[int] = None,
+                                end_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Reads daily, weekly or monthly means and maxima, see DataManager.query_altman_aggregates.
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per non-empty bucket, oldest first. Empty on error.
+        """
+        try:
+            return aggregates.query_aggregates(self.executor, granularity, start_ts, end_ts)
+        except ValueError as e:
+            logger.error("ValueError altman_aggregates: %s", e)
+        except RuntimeError as e:
+            logger.error("Error reading aggregates: altman_aggregates %s", e, exc_info=True)
+        return []
+
+    def altman_timestamp_bounds(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the first and last altman_timestamp in altman_table, or None when it is empty.
+        """
+        return aggregates.timestamp_span(self.executor, "altman_timestamp IS NOT NULL")
+
+    def query_altman_range(self, start_ts: int, end_ts: int,
+                           limit: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """
+        Reads the altman_table rows with start_ts <= altman_timestamp < end_ts, oldest first.
+
+        Returns:
+            List[Tuple[Any, ...]]: Rows in ALTMAN_ROW_COLUMNS order. Empty on error.
+        """
+        try:
+            return query_altman_range(self.executor, start_ts, end_ts, limit)
+        except RuntimeError as e:
+            logger.error("Error reading range: altman_table %s", e, exc_info=True)
+        return []
+
+    def delete_altman_ids(self, ids: Iterable[int]) -> int:
+        """
+        Deletes the altman_table rows with the given ids, see delete_altman_id_ranges.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        return self.delete_altman_id_ranges(collapse_id_ranges(ids))
+
+    def delete_altman_id_ranges(self, id_ranges: Sequence[Tuple[int, int]]) -> int:
+        """
+        Deletes every row whose id falls in one of the inclusive ranges, as
+        DataManager.delete_altman_id_ranges does: one transaction, few statements, and
+        the touched aggregate buckets rebuilt before the commit.
+
+        Returns:
+            int: The number of rows deleted.
+
+        Raises:
+            RuntimeError: If the delete failed; nothing was deleted.
+        """
+        spans: List[Tuple[int, int]] = [(low, high) for low, high in id_ranges if low < high]
+        singles: List[int] = [low for low, high in id_ranges if low == high]
+        if not spans and not singles:
+            return 0
+        deleted: int = 0
+        try:
+            self.executor.begin()
+            first_ts: Optional[int] = None
+            last_ts: Optional[int] = None
+            for where, bind_values in id_range_clauses(spans, singles):
+                span = aggregates.timestamp_span(self.executor, where, *bind_values)
+                if span is not None:
+                    first_ts = span[0] if first_ts is None else min(first_ts, span[0])
+                    last_ts = span[1] if last_ts is None else max(last_ts, span[1])
+                deleted += self.executor.execute(f"DELETE FROM altman_table WHERE {where}", bind_values)
+            if first_ts is not None:
+                aggregates.rebuild_range(self.executor, first_ts, last_ts)
+            self.executor.commit()
+        except RuntimeError as e:
+            self.executor.rollback()
+            logger.error("Error deleting data: altman_table %s", e, exc_info=True)
+            raise RuntimeError(f"Deleting from altman_table failed: {e}") from e
+        count('db_rows_deleted_total', deleted)
+        return deleted
+
+    def altman_row_count(self) -> int:
+        """
+        Returns the number of rows in altman_table.
+        """
+        return self.executor.scalar("SELECT COUNT(*) FROM altman_table", default=0)
+
+    def export_altman_table(self, path: str, export_format: Optional[str] = None,
+                            date_from: Optional[str] = None, date_to: Optional[str] = None,
+                            progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """
+        Streams altman_table to a file, see database.altman_export.export_altman_table.
+        """
+        from database.altman_export import export_altman_table
+        return export_altman_table(self.executor, path, export_format, date_from, date_to, progress=progress)
+
+    def import_altman_file(self, path: str, reject_path: Optional[str] = None,
+                           import_format: Optional[str] = None,
+                           progress: Optional[Callable[[int, int], None]] = None,
+                           upsert: bool = True) -> Tuple[int, int]:
+        """
+        Imports a CSV or JSON Lines file, see database.altman_import.import_altman_file.
+        """
+        from database.altman_import import import_altman_file
+        return import_altman_file(self, path, reject_path, import_format, progress=progress, upsert=upsert)
+
+    def vacuum(self) -> Tuple[int, int]:
+        """
+        Checkpoints the WAL, rebuilds the database file and refreshes planner statistics.
+
+        Returns:
+            Tuple[int, int]: The database file size in bytes before and after.
+        """
+        before: int = os.path.getsize(self.db_name)
+        self.executor.fetch_all("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.executor.execute("VACUUM")
+        self.executor.fetch_all("PRAGMA optimize")
+        self.executor.fetch_all("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before, os.path.getsize(self.db_name)
+
+    def close_database(self) -> None:
+        """
+        Closes the connection.
+        """
+        try:
+            self.connection.close()
+        except sqlite3.Error as e:
+            logger.exception("Error closing database: %s", e)
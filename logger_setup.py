@@ -1,6 +1,10 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
 import os
-import sys
+import queue
 
 import tracker_config as tkc
 
@@ -18,10 +22,90 @@ if not os.path.exists(log_directory):
 # Path to your log file
 log_file = os.path.join(log_directory, tkc.LOG_FILE)
 
-logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.ERROR,
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    datefmt=tkc.DATEFORMAT,
-                    filename=log_file,
-                    filemode=tkc.FILE_MODE)
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line, for log shippers and jq.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'module': record.module,
+            'line': record.lineno,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry)
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for a listener in this process.
+
+    Only the message (and traceback) is rendered on the calling thread, so the
+    record no longer refers to mutable arguments; layout is left to the file
+    handler's formatter on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+
+
+def _file_handler() -> logging.Handler:
+    """
+    Builds the size-rotated file handler that the queue listener writes through.
+    """
+    handler = logging.handlers.RotatingFileHandler(log_file,
+                                                   mode=tkc.FILE_MODE,
+                                                   maxBytes=tkc.LOG_MAX_BYTES,
+                                                   backupCount=tkc.LOG_BACKUP_COUNT,
+                                                   encoding='utf-8',
+                                                   delay=True)
+    if tkc.LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter(datefmt=tkc.DATEFORMAT))
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s',
+                                               datefmt=tkc.DATEFORMAT))
+    return handler
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Routes every log record through a queue to a background thread that does the file I/O.
+
+    The calling thread only renders the message of records that pass the level check
+    and puts them on an unbounded queue, so logging never waits on the disk; the
+    listener thread formats and writes them to the rotating log file. Pending records
+    are flushed at exit.
+
+    Returns:
+        logging.handlers.QueueListener: The running listener.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(tkc.LOG_LEVEL)
+    root.addHandler(_LocalQueueHandler(log_queue))
+    queue_listener = logging.handlers.QueueListener(log_queue, _file_handler(), respect_handler_level=True)
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
+    return queue_listener
+
+
+logger = logging.getLogger(__name__)
+listener = setup_logging()
@@ -1,9 +1,13 @@
+import time
+STARTED: float = time.perf_counter()  # taken before the Qt imports so the startup report counts them
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow
 import sys
 from logger_setup import logger
 # pyrcc5 resources.qrc -o resources.py
 from ui.main_ui import res
+from utility.app_operations.startup_timing import StartupTimer
+from utility.instrumentation import start_metrics_export
 
 
 def run_app():
@@ -18,14 +22,20 @@ def run_app():
 
     """
     logger.info("ENTER BY PORTAL START YES!")
+    startup_timer = StartupTimer(STARTED)
+    startup_timer.mark('imports')
     try: 
         app = QApplication(sys.argv)
+        startup_timer.mark('qapplication')
         
         window = MainWindow()
+        startup_timer.mark('main_window')
+        startup_timer.watch_first_paint(window)
         window.show()
+        start_metrics_export()
         sys.exit(app.exec())
     except Exception as e:
-        logger.error(f"Error at portal {e}", exc_info=True)
+        logger.error("Error at portal %s", e, exc_info=True)
     
 
 if __name__ == "__main__":
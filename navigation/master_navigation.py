@@ -21,6 +21,6 @@ def change_stack_page(minderStacks: Any, index: int) -> None:
         minderStacks.setCurrentIndex(index)
         logger.info("Minder Stack Page Change")
     except Exception as e:
-        logger.error(f"Minder Stack Page Change Error: {e}", exc_info=True)
+        logger.error("Minder Stack Page Change Error: %s", e, exc_info=True)
 
 
@@ -7,6 +7,74 @@ APPLICATION_NAME = "altmans_mania_assesment"
 LOG_FILE = 'altmans_mania_assesment.log'
 PRINGLES = 'altmans_mania_assesment'  # lol the directory made/placed
 DATEFORMAT = '%d-%b-%y %I:%M:%S %p'  # this is how you want it from now on lolol ok?
-FILE_MODE = 'w'
+FILE_MODE = 'a'  # keep earlier launches; LOG_MAX_BYTES rotation bounds the size
+LOG_LEVEL = 'ERROR'
+LOG_MAX_BYTES = 5 * 1024 * 1024  # rotate the log file at this size
+LOG_BACKUP_COUNT = 3  # rotated files kept as LOG_FILE.1 .. LOG_FILE.3
+LOG_FORMAT = 'text'  # "text" or "json" (one JSON object per line)
+STARTUP_TIMING_FILE = 'startup_timing.jsonl'  # one record per launch, next to the log file
+# hot-path metrics (utility.instrumentation), written to the log directory for scraping
+METRICS_FILE = 'altman_metrics.prom'
+METRICS_FORMAT = 'prometheus'  # "prometheus" (textfile collector format) or "json"
+METRICS_EXPORT_INTERVAL_S = 60  # seconds between snapshots; 0 disables the export
 # database
 DB_NAME = 'the_one_and_only_babababy_june17.db'
+BULK_INSERT_CHUNK_SIZE = 5000  # rows bound per execBatch in DataManager.insert_many_into_altman_table
+STATEMENT_CACHE_SIZE = 64  # prepared statements kept per Qt connection (see StatementRegistry)
+# storage backend opened by database.altman_storage.open_altman_storage for headless use:
+# "qt" (QSqlDatabase), "sqlite" (stdlib sqlite3) or "memory" (nothing persisted, tests only). The GUI always uses "qt".
+STORAGE_BACKEND = 'sqlite'
+MIGRATION_BACKFILL_CHUNK_SIZE = 10000  # rows updated per committed chunk when a migration backfills a column
+# SQLite performance profile applied whenever a connection is opened.
+# "durable": fsync on every commit, "balanced": WAL with NORMAL sync, "fast": no fsync (risk on power loss)
+DB_PERFORMANCE_PROFILE = 'balanced'
+DB_PERFORMANCE_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -2000,  # negative values are KiB
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,  # ms
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024,
+        'cache_size': -16000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+# data view paging (KeysetTableModel)
+TABLE_PAGE_SIZE = 256  # rows fetched per keyset page
+TABLE_MAX_CACHED_PAGES = 8  # pages kept in memory; the furthest from the viewport are dropped first
+# change bus: writes touching more rows than this announce a table reset instead of listing ids
+CHANGE_BUS_MAX_IDS = 1000
+# data view inserts in an order other than id are placed row by row up to this many rows; more reload the view
+TABLE_INSERT_PLACE_MAX = 32
+FILTER_DEBOUNCE_MS = 250  # quiet time after the last filter edit before the data view re-queries
+TABLE_COUNT_CHUNK = 50000  # filtered views are counted this many rows at a time as they scroll
+# "manual": data view edits are buffered and written in one transaction by Submit; "field": each edit is written at once
+TABLE_EDIT_STRATEGY = 'manual'
+TABLE_PENDING_EDIT_COLOR = '#5c5326'  # background of edited cells waiting to be submitted
+TABLE_CONFLICT_EDIT_COLOR = '#6b2e2e'  # background of pending cells someone else changed first
+BACKFILL_DEFAULT_DAYS = 14  # rows the backfill page's "Add days" appends, and how far back it starts
+# chart view: slices fetched per pixel column, and how far beyond the visible range (in view widths) to fetch
+CHART_BUCKETS_PER_PIXEL = 2
+CHART_FETCH_MARGIN = 1.0
+CHART_FETCH_INTERVAL_MS = 33  # at most one range request per interval while panning or zooming
+CHART_MIN_SPAN_SECONDS = 3600  # the narrowest time range the chart zooms into
+EXPORT_CHUNK_SIZE = 10000  # rows read and written per step when exporting altman_table
+# benchmarks/db_benchmarks.py: compare mode flags a benchmark whose median is this many percent slower than the baseline
+BENCHMARK_REGRESSION_PCT = 10
+# bulk_insert floor in rows/s from benchmarks.db_benchmarks.FLOOR_MIN_SIZE rows up
+BENCHMARK_MIN_INSERT_ROWS_PER_S = 100000
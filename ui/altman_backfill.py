@@ -0,0 +1,322 @@
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QAbstractTableModel, QDate, QModelIndex, QTime, Qt
+from PyQt6.QtGui import QColor, QKeySequence, QShortcut
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.altman_import import ITEM_MAX, ITEM_MIN, validate_record
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS, altman_summary
+
+# Grid columns: the date, the time, the five items and the derived summary.
+BACKFILL_FIELDS: Tuple[str, ...] = ('altman_date', 'altman_time') + ALTMAN_ITEM_COLUMNS
+SUMMARY_COLUMN: int = len(BACKFILL_FIELDS)
+# insert_many_into_altman_table's result: rows written, and (row index, row, error) for each failure.
+InsertResult = Tuple[int, List[Tuple[int, Sequence[Union[str, int]], str]]]
+
+
+class BackfillModel(QAbstractTableModel):
+    """
+    The rows of the backfill grid, held in memory until they are committed.
+
+    Each row is a date, a time and the five item scores; the summary column is
+    derived with altman_summary, as on the input page. Rows are checked with the
+    importer's validate_record, so the grid accepts exactly what an import would,
+    and a row that fails is tinted with the reason as its tooltip. Editing touches
+    only the Python list: nothing reaches the database, or the data view, until
+    commit.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.rows: List[List[Any]] = []
+        # row -> why it cannot be committed
+        self.errors: Dict[int, str] = {}
+
+    def _check(self, row: int) -> Optional[List[Union[str, int]]]:
+        """
+        Validates one row, records or clears its error, and returns it as an altman_table row.
+        """
+        try:
+            valid = validate_record(dict(zip(BACKFILL_FIELDS, self.rows[row])))
+        except ValueError as e:
+            self.errors[row] = str(e)
+            return None
+        self.errors.pop(row, None)
+        return valid
+
+    def append_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Appends rows of BACKFILL_FIELDS values with a single insert notification.
+        """
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for offset, values in enumerate(rows):
+            self.rows.append(list(values))
+            self._check(first + offset)
+        self.endInsertRows()
+
+    def append_days(self, start: date, days: int, altman_time: str) -> None:
+        """
+        Appends one row per day from ``start``, at ``altman_time``, with every item at 0.
+        """
+        self.append_rows([((start + timedelta(days=day)).isoformat(), altman_time)
+                          + (ITEM_MIN,) * len(ALTMAN_ITEM_COLUMNS) for day in range(days)])
+
+    def next_date(self) -> Optional[date]:
+        """
+        Returns the day after the last row's date, or None if there is no valid one.
+        """
+        if not self.rows:
+            return None
+        try:
+            return date.fromisoformat(str(self.rows[-1][0])) + timedelta(days=1)
+        except ValueError:
+            return None
+
+    def paste(self, text: str) -> int:
+        """
+        Appends tab- or comma-separated lines of date, time and five items.
+
+        A trailing summary is ignored; it is always recomputed.
+
+        Returns:
+            int: The number of rows appended.
+        """
+        rows: List[List[str]] = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            fields = [field.strip() for field in line.split('\t' if '\t' in line else ',')]
+            rows.append((fields + [''] * len(BACKFILL_FIELDS))[:len(BACKFILL_FIELDS)])
+        self.append_rows(rows)
+        return len(rows)
+
+    def remove_rows(self, rows: Sequence[int]) -> None:
+        """
+        Removes the given rows with a single reset.
+        """
+        doomed = set(rows)
+        if not doomed:
+            return
+        self.beginResetModel()
+        self.rows = [values for row, values in enumerate(self.rows) if row not in doomed]
+        self.errors.clear()
+        for row in range(len(self.rows)):
+            self._check(row)
+        self.endResetModel()
+
+    def valid_rows(self) -> Tuple[List[int], List[List[Union[str, int]]]]:
+        """
+        Returns the grid rows that can be committed and the altman_table rows they become.
+        """
+        indexes: List[int] = []
+        rows: List[List[Union[str, int]]] = []
+        for row in range(len(self.rows)):
+            valid = self._check(row)
+            if valid is not None:
+                indexes.append(row)
+                rows.append(valid)
+        return indexes, rows
+
+    def mark_failed(self, failures: Dict[int, str]) -> None:
+        """
+        Flags rows the database refused, keyed by grid row.
+        """
+        self.errors.update(failures)
+        if failures:
+            self.dataChanged.emit(self.index(min(failures), 0),
+                                  self.index(max(failures), SUMMARY_COLUMN))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else SUMMARY_COLUMN + 1
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return QColor(tkc.TABLE_CONFLICT_EDIT_COLOR) if row in self.errors else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.errors.get(row)
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        values = self.rows[row]
+        if column == SUMMARY_COLUMN:
+            try:
+                return altman_summary(int(item) for item in values[2:])
+            except (TypeError, ValueError):
+                return None
+        return values[column]
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return section + 1
+        if section == SUMMARY_COLUMN:
+            return 'summary'
+        return BACKFILL_FIELDS[section].replace('altmans_', '').replace('altman_', '')
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.isValid() and index.column() != SUMMARY_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """
+        Stores an edited cell and re-checks its row. Items take whole numbers 0-5.
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() == SUMMARY_COLUMN:
+            return False
+        if index.column() >= 2:
+            try:
+                value = int(str(value).strip())
+            except ValueError:
+                return False
+            if not ITEM_MIN <= value <= ITEM_MAX:
+                return False
+        self.rows[index.row()][index.column()] = value
+        self._check(index.row())
+        self.dataChanged.emit(self.index(index.row(), 0), self.index(index.row(), SUMMARY_COLUMN))
+        return True
+
+
+class AltmanBackfillPage(QtWidgets.QWidget):
+    """
+    A grid for entering many backdated entries and committing them together.
+
+    "Add days" appends a row per day, continuing from the last row (or the start
+    date), at the chosen time. Scores are typed straight into the grid, and rows can
+    be pasted from a spreadsheet (date, time and the five items per line). Commit
+    hands every valid row to ``insert_method`` as one batch, written in a single
+    transaction; committed rows leave the grid, and rows the database refused stay,
+    flagged. The data view hears about the batch once, on the change bus.
+
+    Args:
+        insert_method (Callable): ``insert_method(rows, on_done, on_error)`` writes rows in
+            ALTMAN_COLUMNS order with DataManager.insert_many_into_altman_table and
+            delivers its (written, failed) result to ``on_done``.
+        parent (Optional[QtWidgets.QWidget]): The parent widget.
+    """
+
+    def __init__(self,
+                 insert_method: Callable[[List[List[Union[str, int]]], Callable[[InsertResult], None],
+                                          Callable[[str], None]], Any],
+                 parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("altman_backfill_page")
+        self.insert_method = insert_method
+        # grid rows of the batch in flight, in the order they were submitted
+        self._committing: Optional[List[int]] = None
+        self.model = BackfillModel(self)
+
+        self.start_date = QtWidgets.QDateEdit(QDate.currentDate().addDays(-tkc.BACKFILL_DEFAULT_DAYS), parent=self)
+        self.start_date.setCalendarPopup(True)
+        self.start_date.setDisplayFormat("yyyy-MM-dd")
+        self.entry_time = QtWidgets.QTimeEdit(QTime(12, 0), parent=self)
+        self.entry_time.setDisplayFormat("hh:mm:ss")
+        self.day_count = QtWidgets.QSpinBox(parent=self)
+        self.day_count.setRange(1, 366)
+        self.day_count.setValue(tkc.BACKFILL_DEFAULT_DAYS)
+        self.day_count.setSuffix(" days")
+        self.add_button = QtWidgets.QPushButton("Add days", parent=self)
+        self.remove_button = QtWidgets.QPushButton("Remove rows", parent=self)
+        self.commit_button = QtWidgets.QPushButton("Commit", parent=self)
+        self.commit_button.setShortcut("Ctrl+Return")
+        self.status = QtWidgets.QLabel(parent=self)
+
+        self.table = QtWidgets.QTableView(parent=self)
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.setContentsMargins(0, 0, 0, 0)
+        for widget in (self.start_date, self.entry_time, self.day_count, self.add_button, self.remove_button):
+            controls.addWidget(widget)
+        controls.addStretch()
+        controls.addWidget(self.status)
+        controls.addWidget(self.commit_button)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.table)
+
+        self.add_button.clicked.connect(self.add_days)
+        self.remove_button.clicked.connect(self.remove_selected_rows)
+        self.commit_button.clicked.connect(self.commit)
+        QShortcut(QKeySequence.StandardKey.Paste, self.table, activated=self.paste)
+        self.model.rowsInserted.connect(self.update_status)
+        self.model.modelReset.connect(self.update_status)
+        self.model.dataChanged.connect(self.update_status)
+        self.update_status()
+
+    def add_days(self) -> None:
+        """
+        Appends day_count rows, starting the day after the last row (or at start_date).
+        """
+        start = self.model.next_date() or date.fromisoformat(self.start_date.date().toString("yyyy-MM-dd"))
+        self.model.append_days(start, self.day_count.value(), self.entry_time.time().toString("hh:mm:ss"))
+        self.table.setCurrentIndex(self.model.index(self.model.rowCount() - self.day_count.value(), 2))
+
+    def paste(self) -> None:
+        """
+        Appends the rows on the clipboard.
+        """
+        self.model.paste(QtWidgets.QApplication.clipboard().text())
+
+    def remove_selected_rows(self) -> None:
+        if self._committing is None:
+            self.model.remove_rows([index.row() for index in self.table.selectionModel().selectedRows()]
+                                   or [index.row() for index in self.table.selectedIndexes()])
+
+    def update_status(self, *_: Any) -> None:
+        invalid = len(self.model.errors)
+        self.status.setText(f"{self.model.rowCount()} rows" + (f", {invalid} to fix" if invalid else ''))
+        self.commit_button.setEnabled(self._committing is None and self.model.rowCount() > invalid)
+        self.table.setEnabled(self._committing is None)
+
+    def commit(self) -> None:
+        """
+        Hands every valid row to insert_method as one batch.
+        """
+        if self._committing is not None:
+            return
+        indexes, rows = self.model.valid_rows()
+        if not rows:
+            self.update_status()
+            return
+        self._committing = indexes
+        self.update_status()
+        self.insert_method(rows, self.commit_done, self.commit_failed)
+
+    def commit_done(self, result: InsertResult) -> None:
+        """
+        Drops the committed rows from the grid and flags the ones the database refused.
+        """
+        indexes, self._committing = self._committing or [], None
+        written, failed = result
+        refused = {indexes[position]: error for position, _, error in failed}
+        committed = [row for row in indexes if row not in refused] if written else []
+        self.model.remove_rows(committed)
+        # the refused rows moved up past the committed rows above them
+        self.model.mark_failed({row - bisect_left(committed, row): error for row, error in refused.items()})
+        if refused or not written:
+            logger.error("Backfill: %s rows written, %s refused", written, len(refused))
+        self.update_status()
+
+    def commit_failed(self, message: str) -> None:
+        self._committing = None
+        logger.error("Backfill commit failed: %s", message)
+        self.update_status()
+        QtWidgets.QMessageBox.warning(self, "Backfill failed", message)
@@ -0,0 +1,360 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QDateTime, QPointF, QRectF, Qt, QTimeZone, QTimer
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF, QTransform
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.change_bus import change_bus
+from database.database_utility.aggregates import AGGREGATE_METRICS
+
+# Series colours, in AGGREGATE_METRICS order.
+SERIES_COLORS: Tuple[str, ...] = ('#e8e8e8', '#4e9ad8', '#e0a040', '#5cb85c', '#d9534f', '#a67bd4')
+# The summary is the sum of five 0-5 items; it is drawn on its own 0-25 scale.
+SERIES_MAXIMUM: Dict[str, int] = {'summary': 25}
+# Candidate x-axis tick steps in seconds, with their label formats.
+TICK_STEPS: Tuple[Tuple[int, str], ...] = (
+    (3600, "hh:mm"),
+    (6 * 3600, "MMM d hh:mm"),
+    (86400, "MMM d"),
+    (7 * 86400, "MMM d"),
+    (30 * 86400, "MMM yyyy"),
+    (91 * 86400, "MMM yyyy"),
+    (365 * 86400, "yyyy"),
+)
+
+
+class AltmanChart(QtWidgets.QWidget):
+    """
+    Time-series plot of altmans_summary and the five items, downsampled in SQL.
+
+    The chart never holds raw entries. It asks ``fetch_method`` for min/max slices of
+    the visible range plus CHART_FETCH_MARGIN view widths on either side, at
+    CHART_BUCKETS_PER_PIXEL slices per pixel column, and keeps each series as a pair
+    of QPolygonF (slice maxima and minima) in data coordinates. Panning and zooming only change the transform
+    applied to those polygons, so a frame costs a handful of C++ map and polyline
+    calls regardless of the history's length; a new range is requested (at most once per
+    CHART_FETCH_INTERVAL_MS, one request in flight) only when the view leaves the
+    fetched range or its resolution drifts too far from the pixel width.
+
+    Args:
+        fetch_method (Callable): ``fetch_method(start_ts, end_ts, bucket_count, on_done)``
+            delivers DataManager.query_altman_series rows to ``on_done``.
+        bounds_method (Callable): ``bounds_method(on_done)`` delivers
+            DataManager.altman_timestamp_bounds to ``on_done``.
+        parent (Optional[QtWidgets.QWidget]): The parent widget.
+
+    Either method reports failures through request_failed.
+    """
+    MARGINS: Tuple[int, int, int, int] = (34, 10, 34, 24)  # left, top, right, bottom
+
+    def __init__(self,
+                 fetch_method: Callable[[int, int, int, Callable[[List[Tuple[Any, ...]]], None]], Any],
+                 bounds_method: Callable[[Callable[[Optional[Tuple[int, int]]], None]], Any],
+                 parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("altman_chart")
+        self.setMinimumHeight(160)
+        self.setMouseTracking(False)
+        self.fetch_method = fetch_method
+        self.bounds_method = bounds_method
+        self.visible_series: Dict[str, bool] = {metric: True for metric in AGGREGATE_METRICS}
+
+        self.view_start: Optional[float] = None
+        self.view_end: Optional[float] = None
+        self._bounds: Optional[Tuple[int, int]] = None
+        self._bounds_pending: bool = False
+        # fetched range and its series, x relative to _origin to keep the transform well conditioned
+        self._origin: float = 0.0
+        self._cache_range: Optional[Tuple[float, float, float]] = None  # start, end, seconds per slice
+        self._polygons: Dict[str, Tuple[QPolygonF, QPolygonF]] = {}  # metric -> (maxima, minima)
+        self._stale: bool = False
+        self._in_flight: bool = False
+        self._request_id: int = 0
+        self._drag_x: Optional[float] = None
+
+        self.fetch_timer = QTimer(self)
+        self.fetch_timer.setSingleShot(True)
+        self.fetch_timer.setInterval(tkc.CHART_FETCH_INTERVAL_MS)
+        self.fetch_timer.timeout.connect(self._fetch_if_needed)
+
+        change_bus.rows_inserted.connect(self._on_table_changed)
+        change_bus.rows_updated.connect(self._on_table_changed)
+        change_bus.rows_deleted.connect(self._on_table_changed)
+        change_bus.table_reset.connect(self._on_table_changed)
+
+    # ------------------------------------------------------------------ view state
+    def plot_rect(self) -> QRectF:
+        left, top, right, bottom = self.MARGINS
+        return QRectF(left, top, max(1, self.width() - left - right), max(1, self.height() - top - bottom))
+
+    def set_series_visible(self, metric: str, visible: bool) -> None:
+        """
+        Shows or hides one series; hidden series stay cached.
+        """
+        self.visible_series[metric] = visible
+        self.update()
+
+    def fit_all(self) -> None:
+        """
+        Zooms out to the whole history, re-reading its bounds from the database.
+        """
+        self._read_bounds(fit=True)
+
+    def _read_bounds(self, fit: bool) -> None:
+        if self._bounds_pending:
+            return
+        self._bounds_pending = True
+        self.bounds_method(lambda bounds: self._on_bounds(bounds, fit))
+
+    def set_view(self, start_ts: float, end_ts: float) -> None:
+        """
+        Shows [start_ts, end_ts) and requests data for it if the cache does not cover it.
+        """
+        span: float = max(float(tkc.CHART_MIN_SPAN_SECONDS), end_ts - start_ts)
+        center: float = (start_ts + end_ts) / 2
+        if self._bounds is not None:
+            # keep the centre of the view on the history so it cannot be panned off into empty time
+            low, high = self._bounds
+            span = min(span, max(float(tkc.CHART_MIN_SPAN_SECONDS), 3.0 * (high - low)))
+            center = min(max(center, float(low)), float(high))
+        self.view_start, self.view_end = center - span / 2, center + span / 2
+        self.schedule_fetch()
+        self.update()
+
+    def _on_bounds(self, bounds: Optional[Tuple[int, int]], fit: bool) -> None:
+        self._bounds_pending = False
+        self._bounds = tuple(bounds) if bounds else None
+        if not fit and self._bounds is not None and self.view_start is not None:
+            self.schedule_fetch()
+            return
+        if self._bounds is None:
+            self.view_start = self.view_end = None
+            self._polygons = {}
+            self._cache_range = None
+            self.update()
+            return
+        low, high = self._bounds
+        pad: float = max(60.0, (high - low) * 0.02)
+        self.set_view(low - pad, high + pad)
+
+    # ------------------------------------------------------------------ fetching
+    def schedule_fetch(self) -> None:
+        """
+        Checks the cache against the view within CHART_FETCH_INTERVAL_MS.
+
+        The timer is not restarted while it runs, so a continuous pan still refreshes
+        at a steady rate instead of waiting for the mouse to stop.
+        """
+        if not self.fetch_timer.isActive():
+            self.fetch_timer.start()
+
+    def _needs_fetch(self) -> bool:
+        if self.view_start is None:
+            return False
+        if self._cache_range is None or self._stale:
+            return True
+        cache_start, cache_end, resolution = self._cache_range
+        wanted: float = (self.view_end - self.view_start) / (self.plot_rect().width() * tkc.CHART_BUCKETS_PER_PIXEL)
+        return (self.view_start < cache_start or self.view_end > cache_end
+                or resolution > 2 * wanted or resolution < wanted / 4)
+
+    def _fetch_if_needed(self) -> None:
+        if self._in_flight or not self.isVisible() or not self._needs_fetch():
+            return
+        span: float = self.view_end - self.view_start
+        start: int = int(self.view_start - tkc.CHART_FETCH_MARGIN * span)
+        end: int = int(self.view_end + tkc.CHART_FETCH_MARGIN * span) + 1
+        bucket_count: int = max(1, int(self.plot_rect().width() * tkc.CHART_BUCKETS_PER_PIXEL
+                                       * (1 + 2 * tkc.CHART_FETCH_MARGIN)))
+        self._request_id += 1
+        request_id: int = self._request_id
+        self._in_flight = True
+        self._stale = False
+        try:
+            self.fetch_method(start, end, bucket_count,
+                              lambda rows: self._on_series(request_id, start, end, bucket_count, rows))
+        except Exception as e:
+            self._in_flight = False
+            logger.error("Error requesting chart data: %s", e, exc_info=True)
+
+    def request_failed(self, message: str) -> None:
+        """
+        Releases a failed series or bounds request so the next view change retries.
+        """
+        self._in_flight = False
+        self._bounds_pending = False
+        logger.error("Error fetching chart data: %s", message)
+
+    def _on_series(self, request_id: int, start: int, end: int, bucket_count: int,
+                   rows: List[Tuple[Any, ...]]) -> None:
+        self._in_flight = False
+        if request_id != self._request_id:
+            return
+        self._origin = float(start)
+        self._cache_range = (float(start), float(end), (end - start) / bucket_count)
+        polygons: Dict[str, Tuple[QPolygonF, QPolygonF]] = {}
+        for index, metric in enumerate(AGGREGATE_METRICS):
+            scale: float = 5.0 / SERIES_MAXIMUM.get(metric, 5)
+            maxima: List[QPointF] = []
+            minima: List[QPointF] = []
+            for row in rows:
+                low, high = row[2 + 2 * index], row[3 + 2 * index]
+                if low is None:
+                    continue
+                x: float = (row[0] + row[1]) / 2 - self._origin
+                maxima.append(QPointF(x, high * scale))
+                minima.append(QPointF(x, low * scale))
+            polygons[metric] = (QPolygonF(maxima), QPolygonF(minima))
+        self._polygons = polygons
+        self.update()
+        # the view may have moved on while the request was out
+        if self._needs_fetch():
+            self.schedule_fetch()
+
+    def _on_table_changed(self, table_name: str, *_) -> None:
+        if table_name != 'altman_table':
+            return
+        self._stale = True
+        # entries may have landed outside the known history; the first ones also fit the view
+        self._read_bounds(fit=self._bounds is None)
+
+    # ------------------------------------------------------------------ painting
+    def _x_to_pixel(self, ts: float, plot: QRectF) -> float:
+        return plot.left() + (ts - self.view_start) * plot.width() / (self.view_end - self.view_start)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        try:
+            painter.fillRect(self.rect(), QColor('#1e1e1e'))
+            plot: QRectF = self.plot_rect()
+            if self.view_start is None:
+                painter.setPen(QColor('#9a9a9a'))
+                painter.drawText(plot, Qt.AlignmentFlag.AlignCenter,
+                                 "Loading…" if self._bounds_pending else "No entries yet")
+                return
+            self._paint_axes(painter, plot)
+            painter.save()
+            painter.setClipRect(plot)
+            # data coordinates (seconds from _origin, score 0-5) -> pixels
+            x_scale: float = plot.width() / (self.view_end - self.view_start)
+            y_scale: float = -plot.height() / 5.0
+            transform = QTransform(x_scale, 0, 0, y_scale,
+                                   plot.left() + (self._origin - self.view_start) * x_scale,
+                                   plot.bottom())
+            for color, metric in zip(SERIES_COLORS, AGGREGATE_METRICS):
+                envelope: Optional[Tuple[QPolygonF, QPolygonF]] = self._polygons.get(metric)
+                if envelope is None or not self.visible_series.get(metric, True):
+                    continue
+                # the slice maxima and minima as two lines: spikes stay visible, and unlike
+                # a min-max zigzag no segment has to cross the full plot height
+                painter.setPen(QPen(QColor(color), 1.0))
+                for polygon in envelope:
+                    painter.drawPolyline(transform.map(polygon))
+            painter.restore()
+        except Exception as e:
+            logger.error("Error painting the chart: %s", e, exc_info=True)
+        finally:
+            painter.end()
+
+    def _paint_axes(self, painter: QPainter, plot: QRectF) -> None:
+        grid = QColor('#3a3a3a')
+        text = QColor('#9a9a9a')
+        for score in range(6):
+            y: float = plot.bottom() - score * plot.height() / 5
+            painter.setPen(grid)
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(text)
+            painter.drawText(QRectF(0, y - 8, plot.left() - 4, 16),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, str(score))
+            painter.drawText(QRectF(plot.right() + 4, y - 8, self.MARGINS[2] - 4, 16),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, str(score * 5))
+
+        seconds_per_pixel: float = (self.view_end - self.view_start) / plot.width()
+        step, label_format = next(((step, fmt) for step, fmt in TICK_STEPS if step / seconds_per_pixel >= 90),
+                                  TICK_STEPS[-1])
+        if step == TICK_STEPS[-1][0]:
+            step = int(step * max(1, round(90 * seconds_per_pixel / step)))
+        tick: int = int(self.view_start // step + 1) * step
+        utc = QTimeZone.utc()
+        while tick < self.view_end:
+            x: float = self._x_to_pixel(tick, plot)
+            painter.setPen(grid)
+            painter.drawLine(QPointF(x, plot.top()), QPointF(x, plot.bottom()))
+            painter.setPen(text)
+            label: str = QDateTime.fromSecsSinceEpoch(tick, utc).toString(label_format)
+            painter.drawText(QRectF(x - 50, plot.bottom() + 4, 100, 16), Qt.AlignmentFlag.AlignHCenter, label)
+            tick += step
+
+    # ------------------------------------------------------------------ interaction
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self.view_start is None:
+            self.fit_all()
+        else:
+            self.schedule_fetch()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.schedule_fetch()
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_x = event.position().x()
+
+    def mouseMoveEvent(self, event) -> None:
+        if self._drag_x is None or self.view_start is None:
+            return
+        x: float = event.position().x()
+        shift: float = (self._drag_x - x) * (self.view_end - self.view_start) / self.plot_rect().width()
+        self._drag_x = x
+        self.set_view(self.view_start + shift, self.view_end + shift)
+
+    def mouseReleaseEvent(self, event) -> None:
+        self._drag_x = None
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        self.fit_all()
+
+    def wheelEvent(self, event) -> None:
+        if self.view_start is None:
+            return
+        factor: float = 0.85 ** (event.angleDelta().y() / 120)
+        plot: QRectF = self.plot_rect()
+        fraction: float = min(max((event.position().x() - plot.left()) / plot.width(), 0.0), 1.0)
+        anchor: float = self.view_start + fraction * (self.view_end - self.view_start)
+        span: float = max(float(tkc.CHART_MIN_SPAN_SECONDS), (self.view_end - self.view_start) * factor)
+        self.set_view(anchor - fraction * span, anchor + (1 - fraction) * span)
+
+
+class AltmanChartPage(QtWidgets.QWidget):
+    """
+    The chart page: series toggles above an AltmanChart.
+
+    Args:
+        fetch_method (Callable): Passed to AltmanChart.
+        bounds_method (Callable): Passed to AltmanChart.
+        parent (Optional[QtWidgets.QWidget]): The parent widget.
+    """
+
+    def __init__(self, fetch_method, bounds_method, parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("altman_chart_page")
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        toggles = QtWidgets.QHBoxLayout()
+        self.chart = AltmanChart(fetch_method, bounds_method, parent=self)
+        self.series_toggles: Dict[str, QtWidgets.QCheckBox] = {}
+        for color, metric in zip(SERIES_COLORS, AGGREGATE_METRICS):
+            toggle = QtWidgets.QCheckBox(metric, parent=self)
+            toggle.setChecked(True)
+            toggle.setStyleSheet(f"QCheckBox {{ color: {color}; }}")
+            toggle.toggled.connect(lambda checked, m=metric: self.chart.set_series_visible(m, checked))
+            toggles.addWidget(toggle)
+            self.series_toggles[metric] = toggle
+        toggles.addStretch()
+        fit_button = QtWidgets.QPushButton("Fit", parent=self)
+        fit_button.clicked.connect(self.chart.fit_all)
+        toggles.addWidget(fit_button)
+        layout.addLayout(toggles)
+        layout.addWidget(self.chart, 1)
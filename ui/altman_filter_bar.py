@@ -0,0 +1,82 @@
+from PyQt6 import QtWidgets
+from PyQt6.QtCore import QDate, QTimer, pyqtSignal
+
+import tracker_config as tkc
+from logger_setup import logger
+from database.database_utility.altman_schema import ALTMAN_ITEM_COLUMNS
+from database.database_utility.altman_filter import build_altman_filter
+
+
+class AltmanFilterBar(QtWidgets.QWidget):
+    """
+    Filter controls for the data view: date range, item score threshold and summary >= N.
+
+    Edits restart a single-shot timer of tkc.FILTER_DEBOUNCE_MS, so typing or spinning
+    through values produces one query once the user pauses rather than one per keystroke.
+
+    Signals:
+        filter_changed (str, list): The SQL condition and its bind values, ready for
+            KeysetTableModel.set_filter.
+    """
+    filter_changed = pyqtSignal(str, list)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setObjectName("altman_filter_bar")
+        layout = QtWidgets.QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.date_from_enabled = QtWidgets.QCheckBox("From", parent=self)
+        self.date_from = QtWidgets.QDateEdit(QDate.currentDate().addMonths(-1), parent=self)
+        self.date_to_enabled = QtWidgets.QCheckBox("To", parent=self)
+        self.date_to = QtWidgets.QDateEdit(QDate.currentDate(), parent=self)
+        for date_edit in (self.date_from, self.date_to):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+
+        self.item_column = QtWidgets.QComboBox(parent=self)
+        self.item_column.addItem("any item", None)
+        for column in ALTMAN_ITEM_COLUMNS:
+            self.item_column.addItem(column.replace('altmans_', ''), column)
+        self.item_min = QtWidgets.QSpinBox(parent=self)
+        self.item_min.setRange(0, 5)
+        self.item_min.setPrefix(">= ")
+        self.item_min.setSpecialValueText("off")
+
+        self.summary_min = QtWidgets.QSpinBox(parent=self)
+        self.summary_min.setRange(0, 5 * len(ALTMAN_ITEM_COLUMNS))
+        self.summary_min.setPrefix("summary >= ")
+        self.summary_min.setSpecialValueText("summary: off")
+
+        for widget in (self.date_from_enabled, self.date_from, self.date_to_enabled, self.date_to,
+                       self.item_column, self.item_min, self.summary_min):
+            layout.addWidget(widget)
+        layout.addStretch()
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(tkc.FILTER_DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.emit_filter)
+
+        self.date_from_enabled.toggled.connect(self.debounce.start)
+        self.date_to_enabled.toggled.connect(self.debounce.start)
+        self.date_from.dateChanged.connect(self.debounce.start)
+        self.date_to.dateChanged.connect(self.debounce.start)
+        self.item_column.currentIndexChanged.connect(self.debounce.start)
+        self.item_min.valueChanged.connect(self.debounce.start)
+        self.summary_min.valueChanged.connect(self.debounce.start)
+
+    def emit_filter(self) -> None:
+        """
+        Builds the SQL condition from the current settings and emits filter_changed.
+        """
+        try:
+            where, params = build_altman_filter(
+                date_from=self.date_from.date().toString("yyyy-MM-dd") if self.date_from_enabled.isChecked() else None,
+                date_to=self.date_to.date().toString("yyyy-MM-dd") if self.date_to_enabled.isChecked() else None,
+                item_column=self.item_column.currentData(),
+                item_min=self.item_min.value(),
+                summary_min=self.summary_min.value())
+            self.filter_changed.emit(where, params)
+        except Exception as e:
+            logger.error("Error building the data view filter: %s", e, exc_info=True)
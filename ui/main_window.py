@@ -1,7 +1,8 @@
-import datetime
-from PyQt6 import QtWidgets
-from PyQt6.QtCore import QDate, QSettings, QTime, Qt, QByteArray, QDateTime
-from PyQt6.QtGui import QCloseEvent
+from typing import Callable, List, Optional, Tuple
+
+from PyQt6 import QtSql, QtWidgets
+from PyQt6.QtCore import QDate, QEventLoop, QSettings, QTime, Qt, QByteArray, QDateTime
+from PyQt6.QtGui import QAction, QCloseEvent
 
 import tracker_config as tkc
 # ////////////////////////////////////////////////////////////////////////////////////////
@@ -33,16 +34,16 @@ from utility.app_operations.show_hide import toggle_views
 # DATABASE Magicks w/ Wizardry & Necromancy
 # ////////////////////////////////////////////////////////////////////////////////////////
 # Database connections
-from database.database_manager import (
-    DataManager)
+from database.database_manager import DataManager
+from database.database_utility.altman_schema import altman_summary
+from database.database_worker import (
+    DatabaseThread, READER_CONNECTION_NAME)
 
 # Delete Records
 from database.database_utility.delete_records import (
     delete_selected_rows)
 
-# setup Models
-from database.database_utility.model_setup import (
-    create_and_set_model)
+# The data view's model and filter bar and the chart page are imported when first shown
 
 # ////////////////////////////////////////////////////////////////////////////////////////
 # ADD DATA MODULES
@@ -69,15 +70,24 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
                  **kwargs):
         super().__init__(*args, **kwargs)
         self.altmans_model = None
+        self.altmans_filter_bar = None
+        self.altman_chart_page = None
+        self.altman_backfill_page = None
+        # the GUI connection only backs the data view, so it opens (read-only) with that page
+        self.db_manager = None
         self.ui = Ui_MainWindow()
         self.setupUi(self)
-        # Database init
-        self.db_manager = DataManager()
-        self.setup_models()
+        # Database init: all writes go through the worker
+        self.db_worker = DatabaseThread(parent=self)
+        # charts and exports read on their own connection, alongside the writes
+        self.db_reader = DatabaseThread(connection_name=READER_CONNECTION_NAME, parent=self,
+                                        read_only=True, start_after=self.db_worker)
+        self.setup_chart_page()
+        self.setup_backfill_page()
+        self.setup_export()
         # QSettings settings_manager setup
         self.settings = QSettings(tkc.ORGANIZATION_NAME, tkc.APPLICATION_NAME)
         self.window_controller = WindowController()
-        self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.restore_state()
         self.app_operations()
         # self.slider_set_spinbox()
@@ -126,6 +136,26 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         self.stackedWidget.setCurrentWidget(self.mainpanePage2)
         self.resize(1000, 450)
     
+    def switch_to_page3(self) -> None:
+        """
+        Switches to the chart page and resizes the main window to fit it.
+
+        Returns:
+            None
+        """
+        self.stackedWidget.setCurrentWidget(self.mainpanePage3)
+        self.resize(1000, 450)
+    
+    def switch_to_page4(self) -> None:
+        """
+        Switches to the backfill page and resizes the main window to fit it.
+
+        Returns:
+            None
+        """
+        self.stackedWidget.setCurrentWidget(self.mainpanePage4)
+        self.resize(1000, 450)
+    
     def handle_minimize_action(self) -> None:
         """
         Handles the minimize action of the main window.
@@ -138,7 +168,7 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             self.window_controller.toggle_minimize(self)
         except Exception as e:
-            logger.exception(f"Error occurred while minimizing {e}", exc_info=True)
+            logger.exception("Error occurred while minimizing %s", e, exc_info=True)
     
     def handle_maximize_action(self) -> None:
         """
@@ -153,7 +183,7 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             self.window_controller.toggle_maximize(self)
         except Exception as e:
-            logger.exception(f"Error occurred while maximizing {e}", exc_info=True)
+            logger.exception("Error occurred while maximizing %s", e, exc_info=True)
     
     # ////////////////////////////////////////////////////////////////////////////////////////
     # APP-OPERATIONS setup
@@ -170,6 +200,7 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
 
             """
         try:
+            self.stackedWidget.currentChanged.connect(self.build_page)
             self.stackedWidget.currentChanged.connect(self.on_page_changed)
             last_index = self.settings.value("lastPageIndex", 0, type=int)
             self.stackedWidget.setCurrentIndex(last_index)
@@ -177,10 +208,35 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             self.altman_date.setDate(QDate.currentDate())
             self.actionInput_View.triggered.connect(self.switch_to_page1)
             self.actionDataview.triggered.connect(self.switch_to_page2)
+            self.actionChartview.triggered.connect(self.switch_to_page3)
+            self.actionBackfill.triggered.connect(self.switch_to_page4)
             self.actionMinimize.triggered.connect(self.handle_minimize_action)
             self.actionMaximize.triggered.connect(self.handle_maximize_action)
         except Exception as e:
-            logger.error(f"Error occurred while setting up app_operations : {e}", exc_info=True)
+            logger.error("Error occurred while setting up app_operations : %s", e, exc_info=True)
+    
+    def build_page(self, index: int) -> None:
+        """
+        Builds a stack page's contents the first time it is shown.
+
+        Only the input page is needed for the first frame. The data view (its
+        connection, model and filter bar) and the chart are set up on first visit,
+        before the page is painted; the data view waits for the database worker if
+        it has not opened the file yet.
+
+        Args:
+            index (int): The index of the page being shown.
+        """
+        try:
+            page = self.stackedWidget.widget(index)
+            if page is self.mainpanePage2 and self.altmans_model is None:
+                self.setup_dataview_page()
+            elif page is self.mainpanePage3 and self.altman_chart_page is None:
+                self.setup_chart()
+            elif page is self.mainpanePage4 and self.altman_backfill_page is None:
+                self.setup_backfill()
+        except Exception as e:
+            logger.error("Error building page %s: %s", index, e, exc_info=True)
     
     def on_page_changed(self,
                         index):
@@ -197,7 +253,7 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             self.settings.setValue("lastPageIndex", index)
         except Exception as e:
-            logger.error(f"{e}", exc_info=True)
+            logger.error("%s", e, exc_info=True)
     
     def commits(self):
         """
@@ -224,6 +280,8 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             change_stack_pages = {
                 self.actionInput_View: 0,
                 self.actionDataview: 1,
+                self.actionChartview: 2,
+                self.actionBackfill: 3,
             }
             
             for action, page in change_stack_pages.items():
@@ -231,7 +289,7 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
                                                 p=page: change_stack_page(self.stackedWidget, p))
         
         except Exception as e:
-            logger.error(f"An error has occurred: {e}", exc_info=True)
+            logger.error("An error has occurred: %s", e, exc_info=True)
     
     def altman_table_commit(self) -> None:
         """
@@ -239,7 +297,9 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
 
         This method connects the 'commit' action to the 'add_mentalsolo_data' function, which inserts data into the altman_table.
         The data to be inserted is obtained from various widgets in the UI and passed as arguments to the 'add_altmans_data' function.
-        The 'add_altmans_data' function is called with the appropriate arguments and the 'insert_into_altman_table' method of the 'db_manager' object.
+        The 'add_altmans_data' function is called with the appropriate arguments and a callable that queues
+        'insert_into_altman_table' on the database worker thread; the model refreshes and the form resets once
+        the insert completes, and a failed insert leaves the entered values in place.
 
         Raises:
             Exception: If an error occurs during the process.
@@ -256,11 +316,10 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
                         "altmans_cheer": "altmans_cheer",
                         "altmans_confidence": "altmans_confidence",
                         "altmans_summary": "altmans_summary",
-                        "model": "altmans_model"
                     },
-                    self.db_manager.insert_into_altman_table, ))
+                    self.queue_altman_insert, ))
         except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+            logger.error("An Error has occurred %s", e, exc_info=True)
         
     #########################################################################
     # ALTMAN summer of summation
@@ -277,6 +336,41 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         self.altmans_cheer.valueChanged.connect(self.update_altmans_summary)
         self.altmans_confidence.valueChanged.connect(self.update_altmans_summary)
     
+    def queue_altman_insert(self, *row, on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queues a single altman_table insert on the database worker.
+
+        The data view picks the new row up from the change bus once the worker has
+        written it, so the GUI thread never waits on the database.
+
+        Args:
+            *row: The values for insert_into_altman_table, in column order.
+            on_done (Optional[Callable[[], None]]): Called once the row is written; not
+                called when the insert fails, which is reported instead.
+        """
+        self.db_worker.submit(
+            'insert_into_altman_table', *row, failed_if=lambda row_id: row_id is None,
+            on_done=(lambda _row_id: on_done()) if on_done is not None else None,
+            on_error=self.database_error_reporter("Saving the entry failed"))
+    
+    def database_error_reporter(self, title: str, reload: bool = False) -> Callable[[str], None]:
+        """
+        Builds an on_error callback for database worker jobs that logs the failure and shows it.
+
+        Args:
+            title (str): The warning's title, also the start of the log line.
+            reload (bool): Reload the data view too, dropping values it shows optimistically.
+
+        Returns:
+            Callable[[str], None]: The callback, taking the error message.
+        """
+        def on_error(message: str) -> None:
+            logger.error("%s: %s", title, message)
+            if reload and self.altmans_model is not None:
+                self.altmans_model.select()
+            QtWidgets.QMessageBox.warning(self, title, message)
+        return on_error
+    
     def update_altmans_summary(self):
         """
         updates the averages of the sliders in the wellbeing and pain module such that
@@ -287,15 +381,12 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             
             values = [slider.value() for slider in
                       [self.altmans_sleep, self.altmans_speech, self.altmans_activity, self.
-                      altmans_cheer, self.altmans_confidence, ] if
-                      slider.value() > 0]
+                      altmans_cheer, self.altmans_confidence, ]]
             
-            sumabitch = sum(values)
-            
-            self.altmans_summary.setValue(int(sumabitch))
+            self.altmans_summary.setValue(altman_summary(values))
         
         except Exception as e:
-            logger.error(f"{e}", exc_info=True)
+            logger.error("%s", e, exc_info=True)
     
     def delete_group(self):
         """
@@ -311,26 +402,311 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             None
         """
         self.actionDelete_Record.triggered.connect(
-            lambda: delete_selected_rows(
+            lambda: self.altmans_model is not None and delete_selected_rows(
                 self,
                 'altmans_manic_rating_table',
                 'altmans_model'
             )
         )
     
+    def setup_dataview_page(self) -> None:
+        """
+        Opens the GUI connection and builds the data view's model and filter bar.
+
+        Called by build_page the first time the data view is shown. Creating and
+        migrating the tables is the database worker's job, so the GUI connection is a
+        read-only one (the view's writes go through the worker anyway) and is opened
+        only once the worker has opened the file; until then the view is built from
+        the worker's opened signal instead.
+
+        Returns:
+            None
+        """
+        if self.altmans_model is not None:
+            return
+        if not self.db_worker.is_open:
+            self.db_worker.opened.connect(self.setup_dataview_page, Qt.ConnectionType.SingleShotConnection)
+            return
+        self.db_manager = DataManager(read_only=True)
+        self.setup_models()
+        self.setup_filter_bar()
+        self.setup_edit_bar()
+    
     def setup_models(self) -> None:
         """
         Set up the models for the main window.
 
-        This method creates and sets the altmans_model using the altman_table.
+        This method creates and sets the altmans_model using the altman_table. The model
+        pages rows in as the table scrolls instead of loading the whole history.
+        The derived altman_timestamp column is kept out of view, and the table selects
+        whole rows so a selection maps straight onto rows to delete. With
+        tkc.TABLE_EDIT_STRATEGY 'manual', edits wait for Submit and are written in one
+        transaction.
 
         Returns:
             None
         """
-        self.altmans_model = create_and_set_model(
+        from database.database_utility.model_setup import create_and_set_keyset_model
+        self.altmans_model = create_and_set_keyset_model(
             "altman_table",
-            self.altmans_manic_rating_table
+            self.altmans_manic_rating_table,
+            self.db_manager.db,
+            update_method=lambda row_id, column, value: self.db_worker.submit(
+                'update_altman_field', row_id, column, value, failed_if=lambda updated: not updated,
+                on_error=self.database_error_reporter("Saving the edit failed", reload=True)),
+            delete_method=lambda id_ranges: self.db_worker.submit(
+                'delete_altman_id_ranges', id_ranges, on_error=self.database_error_reporter("Delete failed")),
+            submit_method=lambda edits, on_done: self.db_worker.submit(
+                'update_altman_fields', edits, on_done=on_done, on_error=lambda message: on_done(None)),
+            edit_strategy=(QtSql.QSqlTableModel.EditStrategy.OnManualSubmit
+                           if tkc.TABLE_EDIT_STRATEGY == 'manual' else QtSql.QSqlTableModel.EditStrategy.OnFieldChange)
         )
+        self.altmans_manic_rating_table.hideColumn(
+            self.altmans_model.fieldIndex("altman_timestamp"))
+        self.altmans_manic_rating_table.setSelectionBehavior(
+            QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+    
+    def setup_filter_bar(self) -> None:
+        """
+        Adds the filter bar above the data view and routes its conditions to the model.
+
+        Filtering and sorting both run as SQL on altmans_model, so neither walks the
+        whole table client-side.
+
+        Returns:
+            None
+        """
+        from ui.altman_filter_bar import AltmanFilterBar
+        self.altmans_filter_bar = AltmanFilterBar(parent=self.mainpanePage2)
+        self.gridLayout_25.removeWidget(self.altmans_manic_rating_table)
+        self.gridLayout_25.addWidget(self.altmans_filter_bar, 1, 0, 1, 1)
+        self.gridLayout_25.addWidget(self.altmans_manic_rating_table, 2, 0, 1, 1)
+        self.altmans_filter_bar.filter_changed.connect(self.altmans_model.set_filter)
+    
+    def setup_edit_bar(self) -> None:
+        """
+        Adds Submit and Revert buttons below the data view for buffered edits.
+
+        The buttons are enabled while edits are pending. A submit that runs into cells
+        changed elsewhere is rolled back whole; those cells are tinted and a warning
+        says how many there are.
+
+        Returns:
+            None
+        """
+        if self.altmans_model.editStrategy() != QtSql.QSqlTableModel.EditStrategy.OnManualSubmit:
+            return
+        edit_bar = QtWidgets.QWidget(parent=self.mainpanePage2)
+        layout = QtWidgets.QHBoxLayout(edit_bar)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addStretch()
+        self.altmans_revert_button = QtWidgets.QPushButton("Revert edits", parent=edit_bar)
+        self.altmans_submit_button = QtWidgets.QPushButton("Submit edits", parent=edit_bar)
+        self.altmans_submit_button.setShortcut("Ctrl+Return")
+        for button in (self.altmans_revert_button, self.altmans_submit_button):
+            button.setEnabled(False)
+            layout.addWidget(button)
+            self.altmans_model.pending_changed.connect(button.setEnabled)
+        self.altmans_submit_button.clicked.connect(self.altmans_model.submitAll)
+        self.altmans_revert_button.clicked.connect(self.altmans_model.revertAll)
+        self.altmans_model.submit_finished.connect(self.altman_edits_submitted)
+        self.gridLayout_25.addWidget(edit_bar, 3, 0, 1, 1)
+    
+    def altman_edits_submitted(self, conflicts: Optional[List[Tuple[int, str]]]) -> None:
+        """
+        Reports a buffered submit that did not commit.
+
+        Args:
+            conflicts (Optional[List[Tuple[int, str]]]): The cells changed elsewhere, empty
+                when the edits were committed, or None if the submit failed.
+
+        Returns:
+            None
+        """
+        if conflicts is None:
+            QtWidgets.QMessageBox.warning(self, "Submit failed",
+                                          "The edits could not be saved; they are still pending.")
+        elif conflicts:
+            QtWidgets.QMessageBox.warning(
+                self, "Edits not saved",
+                f"{len(conflicts)} edited cell(s) were changed elsewhere since you read them, so nothing "
+                "was saved. They are marked in the table; submit again to overwrite them, or revert.")
+    
+    def setup_chart_page(self) -> None:
+        """
+        Adds the third stack page for the score history chart, with its Views menu action.
+
+        The page starts empty; setup_chart fills it the first time it is shown.
+
+        Returns:
+            None
+        """
+        self.mainpanePage3 = QtWidgets.QWidget(parent=self.stackedWidget)
+        self.mainpanePage3.setObjectName("mainpanePage3")
+        page_layout = QtWidgets.QGridLayout(self.mainpanePage3)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.stackedWidget.addWidget(self.mainpanePage3)
+        self.actionChartview = QAction("Chartview", parent=self)
+        self.actionChartview.setObjectName("actionChartview")
+        self.actionChartview.setShortcut("Ctrl+3")
+        self.menuViews.addAction(self.actionChartview)
+    
+    def setup_chart(self) -> None:
+        """
+        Builds the score history chart into the third stack page.
+
+        The chart reads downsampled ranges through the database worker, so panning
+        and zooming never block on the database.
+
+        Returns:
+            None
+        """
+        from ui.altman_chart import AltmanChartPage
+        self.altman_chart_page = AltmanChartPage(
+            fetch_method=lambda start_ts, end_ts, bucket_count, on_done: self.db_reader.submit(
+                'query_altman_series', start_ts, end_ts, bucket_count,
+                on_done=on_done, on_error=self.altman_chart_page.chart.request_failed),
+            bounds_method=lambda on_done: self.db_reader.submit(
+                'altman_timestamp_bounds', on_done=on_done, on_error=self.altman_chart_page.chart.request_failed),
+            parent=self.mainpanePage3)
+        self.mainpanePage3.layout().addWidget(self.altman_chart_page, 0, 0, 1, 1)
+    
+    def setup_backfill_page(self) -> None:
+        """
+        Adds the fourth stack page for backfilling entries, with its Views menu action.
+
+        The page starts empty; setup_backfill fills it the first time it is shown.
+
+        Returns:
+            None
+        """
+        self.mainpanePage4 = QtWidgets.QWidget(parent=self.stackedWidget)
+        self.mainpanePage4.setObjectName("mainpanePage4")
+        page_layout = QtWidgets.QGridLayout(self.mainpanePage4)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.stackedWidget.addWidget(self.mainpanePage4)
+        self.actionBackfill = QAction("Backfill", parent=self)
+        self.actionBackfill.setObjectName("actionBackfill")
+        self.actionBackfill.setShortcut("Ctrl+4")
+        self.menuViews.addAction(self.actionBackfill)
+    
+    def setup_backfill(self) -> None:
+        """
+        Builds the backfill grid into the fourth stack page.
+
+        Its rows are committed as one insert_many_into_altman_table batch on the
+        database worker, so a few hundred backdated entries cost one transaction
+        and one data view update.
+
+        Returns:
+            None
+        """
+        from ui.altman_backfill import AltmanBackfillPage
+        self.altman_backfill_page = AltmanBackfillPage(
+            insert_method=lambda rows, on_done, on_error: self.db_worker.submit(
+                'insert_many_into_altman_table', rows, on_done=on_done, on_error=on_error),
+            parent=self.mainpanePage4)
+        self.mainpanePage4.layout().addWidget(self.altman_backfill_page, 0, 0, 1, 1)
+    
+    def setup_export(self) -> None:
+        """
+        Adds the File > Export and File > Import actions for streaming altman_table
+        out to and in from files.
+
+        Returns:
+            None
+        """
+        self.actionExport = QAction("Export…", parent=self)
+        self.actionExport.setObjectName("actionExport")
+        self.actionExport.setShortcut("Ctrl+E")
+        self.menuBECK.addAction(self.actionExport)
+        self.actionExport.triggered.connect(self.export_altman_data)
+        self.actionImport = QAction("Import…", parent=self)
+        self.actionImport.setObjectName("actionImport")
+        self.actionImport.setShortcut("Ctrl+I")
+        self.menuBECK.addAction(self.actionImport)
+        self.actionImport.triggered.connect(self.import_altman_data)
+    
+    def export_altman_data(self) -> None:
+        """
+        Asks for a destination and exports altman_table on the database worker.
+
+        The data view's date range, when set, limits the export (once the data view
+        has been opened). A progress dialog
+        follows the worker chunk by chunk; the GUI stays responsive throughout.
+
+        Returns:
+            None
+        """
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export entries", "altman_table.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet);;Arrow (*.arrow)")
+        if not path:
+            return
+        bar = self.altmans_filter_bar
+        date_from = date_to = None
+        if bar is not None:
+            date_from = bar.date_from.date().toString("yyyy-MM-dd") if bar.date_from_enabled.isChecked() else None
+            date_to = bar.date_to.date().toString("yyyy-MM-dd") if bar.date_to_enabled.isChecked() else None
+        
+        dialog = QtWidgets.QProgressDialog("Exporting entries…", None, 0, 0, self)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+        
+        def on_progress(done: int, total: int) -> None:
+            dialog.setMaximum(max(total, 1))
+            dialog.setValue(done)
+        
+        def on_done(written: int) -> None:
+            dialog.close()
+            logger.info("Export finished: %s rows to %s", written, path)
+        
+        def on_error(message: str) -> None:
+            dialog.close()
+            logger.error("Export failed: %s", message)
+            QtWidgets.QMessageBox.warning(self, "Export failed", message)
+        
+        self.db_reader.submit('export_altman_table', path, None, date_from, date_to,
+                              on_done=on_done, on_error=on_error, on_progress=on_progress)
+    
+    def import_altman_data(self) -> None:
+        """
+        Asks for a CSV or JSON Lines file and imports it on the database worker.
+
+        Invalid records are written next to the file as <name>.rejects.jsonl; the rest
+        are imported all or nothing. The data view and chart pick the rows up from
+        the change bus.
+
+        Returns:
+            None
+        """
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Import entries", "", "Ratings (*.csv *.jsonl *.ndjson)")
+        if not path:
+            return
+        dialog = QtWidgets.QProgressDialog("Importing entries…", None, 0, 0, self)
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+        
+        def on_progress(done: int, total: int) -> None:
+            dialog.setMaximum(max(total, 1))
+            dialog.setValue(done)
+        
+        def on_done(result) -> None:
+            dialog.close()
+            imported, rejected = result
+            message = f"Imported {imported} entries."
+            if rejected:
+                message += f"\n{rejected} records were rejected, see {path}.rejects.jsonl"
+            QtWidgets.QMessageBox.information(self, "Import finished", message)
+        
+        def on_error(message: str) -> None:
+            dialog.close()
+            logger.error("Import failed: %s", message)
+            QtWidgets.QMessageBox.warning(self, "Import failed", message)
+        
+        self.db_worker.submit('import_altman_file', path,
+                              on_done=on_done, on_error=on_error, on_progress=on_progress)
     
     def save_state(self):
         """
@@ -349,11 +725,11 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             self.settings.setValue("geometry", self.saveGeometry())
         except Exception as e:
-            logger.error(f"Error saving the minds_module geo{e}", exc_info=True)
+            logger.error("Error saving the minds_module geo%s", e, exc_info=True)
         try:
             self.settings.setValue("windowState", self.saveState())
         except Exception as e:
-            logger.error(f"Error saving the minds_module geo{e}", exc_info=True)
+            logger.error("Error saving the minds_module geo%s", e, exc_info=True)
     
     def restore_state(self) -> None:
         """
@@ -370,19 +746,56 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             # restore window geometry state
             self.restoreGeometry(self.settings.value("geometry", QByteArray()))
         except Exception as e:
-            logger.error(f"Error restoring the minds module : stress state {e}")
+            logger.error("Error restoring the minds module : stress state %s", e)
         
         try:
             self.restoreState(self.settings.value("windowState", QByteArray()))
         except Exception as e:
-            logger.error(f"Error restoring WINDOW STATE {e}", exc_info=True)
+            logger.error("Error restoring WINDOW STATE %s", e, exc_info=True)
+    
+    def submit_pending_edits(self) -> bool:
+        """
+        Submits the data view's pending edits and waits for the database worker's answer.
+
+        The window is disabled meanwhile and a nested event loop keeps it painting. A
+        submit already in flight is waited for first. A conflict or failure has been
+        reported by altman_edits_submitted by the time this returns.
+
+        Returns:
+            bool: True once every edit is saved, False if any are still pending.
+        """
+        model = self.altmans_model
+        if model.submit_method is None:
+            return not model.isDirty()
+        outcomes: List[Optional[List[Tuple[int, str]]]] = []
+        loop = QEventLoop(self)
+
+        def finished(conflicts: Optional[List[Tuple[int, str]]]) -> None:
+            outcomes.append(conflicts)
+            loop.quit()
+
+        model.submit_finished.connect(finished)
+        self.setEnabled(False)
+        try:
+            while model.isDirty():
+                model.submitAll()  # False while one is in flight; that one is awaited instead
+                loop.exec()
+                if outcomes[-1] is None or outcomes[-1]:
+                    return False
+            return True
+        finally:
+            self.setEnabled(True)
+            model.submit_finished.disconnect(finished)
     
     def closeEvent(self,
                    event: QCloseEvent) -> None:
         """
         Event handler for the close event of the window.
 
-        Saves the state before closing the window.
+        Saves the state before closing the window. Pending data view edits are
+        submitted or dropped as the user chooses. A submit is waited for before the
+        workers stop; if it conflicts or fails the window stays open with the edits
+        still pending.
 
         Args:
             event (QCloseEvent): The close event object.
@@ -390,7 +803,23 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         Returns:
             None
         """
+        if self.altmans_model is not None and self.altmans_model.isDirty():
+            choice = QtWidgets.QMessageBox.question(
+                self, "Unsaved edits", "Submit the pending edits before closing?",
+                QtWidgets.QMessageBox.StandardButton.Save | QtWidgets.QMessageBox.StandardButton.Discard
+                | QtWidgets.QMessageBox.StandardButton.Cancel)
+            if choice == QtWidgets.QMessageBox.StandardButton.Cancel:
+                event.ignore()
+                return
+            if choice == QtWidgets.QMessageBox.StandardButton.Save and not self.submit_pending_edits():
+                event.ignore()
+                return
         try:
             self.save_state()
         except Exception as e:
-            logger.error(f"error saving state during closure: {e}", exc_info=True)
+            logger.error("error saving state during closure: %s", e, exc_info=True)
+        try:
+            self.db_reader.stop()
+            self.db_worker.stop()
+        except Exception as e:
+            logger.error("error stopping the database worker during closure: %s", e, exc_info=True)
@@ -0,0 +1,73 @@
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QWidget
+
+import tracker_config as tkc
+from logger_setup import logger, log_directory
+
+
+class StartupTimer(QObject):
+    """
+    Records how long each launch phase takes, up to the main window's first paint.
+
+    Phases are marked in order with mark(); watch_first_paint() closes the last
+    one when the window paints for the first time and appends one JSON record
+    to tkc.STARTUP_TIMING_FILE in the log directory, so time-to-first-paint can
+    be compared across launches and releases.
+
+    Args:
+        started (Optional[float]): The time.perf_counter() value the timings count
+            from; the process should take it before its first heavy import.
+    """
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        super().__init__()
+        self.started: float = time.perf_counter() if started is None else started
+        self.last: float = self.started
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """
+        Closes ``phase``: the time since the previous mark is recorded under its name.
+        """
+        now = time.perf_counter()
+        self.phases[phase] = round((now - self.last) * 1000, 2)
+        self.last = now
+
+    def watch_first_paint(self, window: QWidget) -> None:
+        """
+        Marks 'first_paint' and writes the report once ``window`` first paints.
+        """
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            self.mark('first_paint')
+            self.write_report()
+        return False
+
+    def write_report(self) -> None:
+        """
+        Appends this launch's timings to the startup timing file.
+        """
+        total = round((self.last - self.started) * 1000, 2)
+        record = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(terse=True),
+            'phases_ms': self.phases,
+            'time_to_first_paint_ms': total,
+        }
+        logger.info("Time to first paint: %s ms %s", total, self.phases)
+        try:
+            with open(os.path.join(log_directory, tkc.STARTUP_TIMING_FILE), 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(record) + '\n')
+        except OSError as e:
+            logger.error("Error writing startup timings: %s", e)
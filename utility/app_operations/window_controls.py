@@ -28,7 +28,7 @@ class WindowController:
                 window.showMinimized()
                 self.is_minimized = True
         except Exception as e:
-            logger.error(f"{e}", exc_info=True)
+            logger.error("%s", e, exc_info=True)
     
     def toggle_maximize(self, window: Any) -> None:
         """
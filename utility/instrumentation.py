@@ -0,0 +1,265 @@
+"""
+Hot-path latency histograms and row counters, exported to the log directory.
+
+    @timed('altman_insert_seconds')            # as a decorator
+    with timed('window_resize_seconds'): ...    # or as a context manager
+    count('altman_rows_read_total', len(rows))
+
+Metrics live in one process-wide registry. start_metrics_export() writes a
+snapshot every tkc.METRICS_EXPORT_INTERVAL_S seconds from a daemon thread, and once
+more at exit, as a Prometheus textfile (for node_exporter's textfile collector) or
+a JSON document, to tkc.METRICS_FILE in the PRINGLES log directory. Recording a
+sample costs a lock and a bisect; nothing here touches Qt or the disk on the
+calling thread.
+"""
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Any, Dict, List, Optional, Tuple
+
+import tracker_config as tkc
+from logger_setup import logger, log_directory
+
+# Histogram bucket upper bounds in seconds, Prometheus' defaults extended down to 100 µs.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                                      0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    A cumulative latency histogram with fixed buckets, as Prometheus models one.
+    """
+
+    def __init__(self, name: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name: str = name
+        self.buckets: Tuple[float, ...] = buckets
+        self.bucket_counts: List[int] = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.count: int = 0
+        self.sum: float = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates the q-quantile as the upper bound of the bucket it falls in.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * self.count
+            seen = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), self.bucket_counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return bound
+        return float('inf')
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.bucket_counts)
+            count, total = self.count, self.sum
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[repr(bound)] = running
+        cumulative['+Inf'] = count
+        summary = {'count': count, 'sum': total, 'buckets': cumulative}
+        for label, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            summary[label] = self.quantile(q)
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.sum = 0.0
+
+
+class Counter:
+    """
+    A monotonically increasing count.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.value: int = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
+
+
+class MetricsRegistry:
+    """
+    Holds every histogram and counter by name; metrics are created on first use.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def counter(self, name: str) -> Counter:
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, Counter(name))
+        return counter
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns every metric as plain data, for JSON export or inspection.
+        """
+        return {
+            'timestamp': time.time(),
+            'histograms': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            'counters': {name: counter.value for name, counter in sorted(self.counters.items())},
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        lines: List[str] = []
+        for name, histogram in sorted(self.histograms.items()):
+            data = histogram.snapshot()
+            lines.append(f"# TYPE {name} histogram")
+            for bound, cumulative in data['buckets'].items():
+                lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum {data['sum']:.9f}")
+            lines.append(f"{name}_count {data['count']}")
+        for name, counter in sorted(self.counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {counter.value}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """
+        Zeroes every metric in place; timed() call sites hold their histogram, so none are dropped.
+        """
+        with self._lock:
+            for metric in (*self.histograms.values(), *self.counters.values()):
+                metric.reset()
+
+
+# Shared by every module in the process.
+metrics = MetricsRegistry()
+
+
+class timed(ContextDecorator):
+    """
+    Records how long a block or function call takes into the histogram ``name``.
+
+    Exceptions are timed too and propagate unchanged.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.histogram: Histogram = metrics.histogram(name)
+        self._local = threading.local()
+
+    def __enter__(self) -> 'timed':
+        # per thread, so one decorated function can run on the GUI and worker threads at once
+        self._local.__dict__.setdefault('starts', []).append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.histogram.observe(time.perf_counter() - self._local.starts.pop())
+        return False
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Adds ``amount`` to the counter ``name``.
+    """
+    if amount:
+        metrics.counter(name).inc(amount)
+
+
+def write_metrics(path: Optional[str] = None, metrics_format: Optional[str] = None) -> Optional[str]:
+    """
+    Writes a snapshot of every metric, replacing the previous file atomically.
+
+    Args:
+        path (Optional[str]): The destination; defaults to tkc.METRICS_FILE in the log directory.
+        metrics_format (Optional[str]): 'prometheus' or 'json'; defaults to tkc.METRICS_FORMAT.
+
+    Returns:
+        Optional[str]: The path written, or None if writing failed.
+    """
+    metrics_format = metrics_format or tkc.METRICS_FORMAT
+    path = path or os.path.join(log_directory, tkc.METRICS_FILE)
+    if metrics_format == 'json':
+        content = json.dumps(metrics.snapshot(), indent=1)
+    else:
+        content = metrics.render_prometheus()
+    part_path = f"{path}.part"
+    try:
+        with open(part_path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        os.replace(part_path, path)
+        return path
+    except OSError as e:
+        logger.error("Error writing metrics to %s: %s", path, e)
+        return None
+
+
+_exporter: Optional[threading.Thread] = None
+_exporter_stop = threading.Event()
+
+
+def start_metrics_export(interval: Optional[float] = None) -> None:
+    """
+    Writes the metrics file every ``interval`` seconds on a daemon thread, and at exit.
+
+    Args:
+        interval (Optional[float]): Seconds between snapshots; defaults to
+            tkc.METRICS_EXPORT_INTERVAL_S. Zero or less disables the export.
+    """
+    global _exporter
+    interval = tkc.METRICS_EXPORT_INTERVAL_S if interval is None else interval
+    if interval <= 0 or _exporter is not None:
+        return
+
+    def run() -> None:
+        while not _exporter_stop.wait(interval):
+            write_metrics()
+
+    _exporter = threading.Thread(target=run, name='metrics_export', daemon=True)
+    _exporter.start()
+    atexit.register(stop_metrics_export)
+
+
+def stop_metrics_export() -> None:
+    """
+    Stops the periodic export and writes one final snapshot.
+    """
+    global _exporter
+    if _exporter is None:
+        return
+    _exporter_stop.set()
+    _exporter.join()
+    _exporter = None
+    _exporter_stop.clear()
+    write_metrics()
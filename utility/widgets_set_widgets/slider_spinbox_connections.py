@@ -25,4 +25,4 @@ def connect_slider_spinbox(slider: QSlider, spinbox: QSpinBox) -> None:
                 spinbox.valueChanged.connect(slider.setValue)
                 # Add logger to track the success or failure of the connection process
     except Exception as e:
-        logger.error(f"Error connecting signals and slots: {e}")
+        logger.error("Error connecting signals and slots: %s", e)